@@ -5,5 +5,60 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 SESSION_EXPIRY_HOURS = int(os.getenv("SESSION_EXPIRY_HOURS", "24"))
+SECRET_KEY = os.getenv("SECRET_KEY", "")
 
+# Session token modu - 'db' (her istekte sessions tablosu) veya 'signed' (HMAC imzalı, I/O'suz doğrulama)
+# signed modunda iptal (logout) listesi tablodan periyodik senkronize edilir (saniye)
+SESSION_TOKEN_MODE = os.getenv("SESSION_TOKEN_MODE", "db").lower()
+SESSION_REVOCATION_SYNC_SECONDS = float(os.getenv("SESSION_REVOCATION_SYNC_SECONDS", "30"))
 
+# Süresi dolan oturumların silinmesi - periyot (saniye, 0 = kapalı) ve tek transaction'da silinen satır
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "3600"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "1000"))
+
+# Kimlik doğrulama önbelleği - token başına en uzun geçerlilik (saniye, 0 = kapalı) ve en fazla kayıt
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# Sembol katalog önbelleği - TTL dolunca eski veri dönülür, arka planda yenilenir
+SYMBOL_CACHE_TTL_SECONDS = int(os.getenv("SYMBOL_CACHE_TTL_SECONDS", "300"))
+
+# Market sağlayıcıları - market başına paylaşılan HTTP bağlantı havuzu boyutu
+MARKET_HTTP_POOL_SIZE = int(os.getenv("MARKET_HTTP_POOL_SIZE", "20"))
+
+# Async market HTTP client'ları (httpx) - zaman aşımı ve HTTP/2 kullanımı
+MARKET_HTTP_TIMEOUT_SECONDS = float(os.getenv("MARKET_HTTP_TIMEOUT_SECONDS", "10"))
+MARKET_HTTP2_ENABLED = os.getenv("MARKET_HTTP2_ENABLED", "true").lower() == "true"
+
+# Market rate limit zamanlayıcısı - bütçe aşıldığında bir çağrının sırada bekleyebileceği üst süre
+MARKET_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("MARKET_RATE_LIMIT_MAX_WAIT_SECONDS", "5"))
+
+# Sembol kataloğu veritabanı senkronizasyonu (saniye, 0 = kapalı)
+SYMBOL_SYNC_INTERVAL_SECONDS = int(os.getenv("SYMBOL_SYNC_INTERVAL_SECONDS", "900"))
+
+# Yerel mum deposu - 'memmap' (diskte kolon bazlı, numpy.memmap) veya 'memory'
+CANDLE_STORE_BACKEND = os.getenv("CANDLE_STORE_BACKEND", "memmap").lower()
+CANDLE_STORE_DIR = os.getenv("CANDLE_STORE_DIR", "data/candles")
+# memmap deposunda mmap'leri açık tutulan en fazla seri (her seri kolon başına bir dosya tanıtıcısı tutar)
+CANDLE_STORE_MAX_OPEN_SERIES = int(os.getenv("CANDLE_STORE_MAX_OPEN_SERIES", "1024"))
+
+# Mum backfill - eşzamanlı upstream sayfa sayısı ve depoya tek seferde yazılan sayfa grubu
+CANDLE_BACKFILL_CONCURRENCY = int(os.getenv("CANDLE_BACKFILL_CONCURRENCY", "4"))
+CANDLE_BACKFILL_BATCH_PAGES = int(os.getenv("CANDLE_BACKFILL_BATCH_PAGES", "20"))
+
+# Mum resampling - üst interval'leri depodaki ince interval'lerden türet; sonuçları depoya yaz (cache)
+CANDLE_RESAMPLE_ENABLED = os.getenv("CANDLE_RESAMPLE_ENABLED", "true").lower() == "true"
+CANDLE_RESAMPLE_CACHE = os.getenv("CANDLE_RESAMPLE_CACHE", "true").lower() == "true"
+
+# Mum akışı (/candles/stream) - depodan tek seferde okunup yanıta yazılan en fazla mum sayısı
+CANDLE_STREAM_CHUNK_SIZE = int(os.getenv("CANDLE_STREAM_CHUNK_SIZE", "5000"))
+
+# Upstream mum WebSocket hub'ı - bağlantı başına stream sayısı ve yeniden bağlanma geri çekilme üst sınırı (saniye)
+CANDLE_WS_STREAMS_PER_CONNECTION = int(os.getenv("CANDLE_WS_STREAMS_PER_CONNECTION", "200"))
+CANDLE_WS_RECONNECT_MAX_SECONDS = float(os.getenv("CANDLE_WS_RECONNECT_MAX_SECONDS", "60"))
+# Stream'den gelen kapanmış mumların biriktirilip depoya toplu yazılma periyodu (saniye)
+CANDLE_WS_STORE_FLUSH_SECONDS = float(os.getenv("CANDLE_WS_STORE_FLUSH_SECONDS", "5"))
+
+# /ws/market - bağlantı başına gönderim kuyruğu (dolunca en eski mesaj düşer) ve en fazla abonelik
+MARKET_STREAM_QUEUE_SIZE = int(os.getenv("MARKET_STREAM_QUEUE_SIZE", "256"))
+MARKET_STREAM_MAX_SUBSCRIPTIONS = int(os.getenv("MARKET_STREAM_MAX_SUBSCRIPTIONS", "50"))
@@ -1,15 +1,88 @@
-from sqlalchemy import create_engine
+from sqlalchemy import Table, UniqueConstraint, create_engine, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from core.config import DATABASE_URL
 
+# Senkron sürücüden async karşılığına (URL'de sürücü belirtilmemişse varsayılan sürücü kabul edilir)
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    DATABASE_URL'i async sürücülü karşılığına çevirir (ör: sqlite:// -> sqlite+aiosqlite://)
+    Zaten async sürücü içeren URL'ler aynen döner
+    """
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Senkron engine: tablo oluşturma ve thread içinde çalışan arka plan job'ları (sync, sweeper) için
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine: istek yolundaki tüm sorgular (event loop'u bloklamaz)
+# expire_on_commit=False: commit sonrası alan erişimi beklenmedik (lazy) I/O tetiklemez
+async_engine = create_async_engine(async_database_url(DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+def _table_drifted(inspector, table: Table) -> bool:
+    """Mevcut tablo modelden farklı mı: eksik kolon, eksik adlı unique constraint veya tekilliği değişmiş index"""
+    existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+    if set(table.columns.keys()) - existing_columns:
+        return True
+
+    existing_uniques = {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+    expected_uniques = {
+        constraint.name for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint) and constraint.name
+    }
+    if expected_uniques - existing_uniques:
+        return True
+
+    existing_indexes = {index["name"]: bool(index["unique"]) for index in inspector.get_indexes(table.name)}
+    return any(
+        index.name in existing_indexes and existing_indexes[index.name] != bool(index.unique)
+        for index in table.indexes
+    )
+
+
+def rebuild_drifted_cache_tables():
+    """
+    Şeması modelden farklılaşmış önbellek tablolarını (info={"cache": True}) silip yeniden oluşturur
+    create_all var olan tabloları atladığı için eski şemalı tablolar (ör: market kolonu olmayan
+    'symbols') burada yeniden kurulur. İçerikleri upstream'den yeniden doldurulduğu için veri kaybı olmaz;
+    kalıcı veri tutan tablolar bu yolla değiştirilmez.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not table.info.get("cache") or not inspector.has_table(table.name):
+            continue
+        if _table_drifted(inspector, table):
+            print(f"⚠️ '{table.name}' önbellek tablosunun şeması eski, tablo yeniden oluşturuluyor")
+            table.drop(bind=engine)
+            table.create(bind=engine)
+
+def ensure_indexes():
+    """
+    Modellerde tanımlı ama mevcut tablolarda henüz olmayan index'leri oluşturur
+    create_all var olan tabloları atladığı için sonradan eklenen index'ler burada oluşturulur
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
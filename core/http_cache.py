@@ -0,0 +1,65 @@
+"""
+HTTP önbellek yardımcıları - ETag / If-None-Match, Last-Modified ve Cache-Control
+"""
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+from fastapi import Request, Response
+
+
+def make_etag(parts: Iterable[str]) -> str:
+    """
+    Parçaların içerik hash'inden weak ETag üretir
+    Yanıt gövdesindeki timestamp her istekte değiştiği için ETag weak'tir (W/)
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\n")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def format_http_date(timestamp: float) -> str:
+    """Unix epoch (saniye) zamanını HTTP tarih formatına çevirir"""
+    return formatdate(timestamp, usegmt=True)
+
+
+def cache_headers(etag: str, last_modified: float, max_age: int) -> Dict[str, str]:
+    """Kimlik doğrulamalı (private) yanıtlar için önbellek header'larını döner"""
+    return {
+        "ETag": etag,
+        "Last-Modified": format_http_date(last_modified),
+        "Cache-Control": f"private, max-age={max(0, int(max_age))}",
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[float] = None) -> bool:
+    """
+    İstemcinin elindeki kopyanın hâlâ geçerli olup olmadığını kontrol eder
+    If-None-Match varsa öncelikli (weak karşılaştırma), yoksa If-Modified-Since kullanılır
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag[2:] if etag.startswith("W/") else etag
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == opaque:
+                return True
+        return False
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Gövdesiz 304 Not Modified yanıtı döner"""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,108 @@
+"""
+Önceden serileştirilmiş ve sıkıştırılmış JSON gövdeleri
+
+Sabit gövde (örn. katalog) bir kez JSON'a çevrilip gzip/zstd ile sıkıştırılır; her istekte
+yalnızca küçük bir sonek (örn. '"timestamp":...}') sıkıştırılıp arkasına eklenir:
+
+- gzip: gövde, sync flush ile bitirilmiş (final olmayan) raw deflate akışı olarak saklanır;
+  sonek ayrı bir raw deflate akışı olarak eklenir. CRC32 gövdenin CRC'sinden devam ettirilir,
+  sonuç tek bir geçerli gzip üyesidir.
+- zstd: RFC 8878 ardışık frame'lere izin verir; sonek ayrı bir frame olarak eklenir.
+
+Brotli akışları birleştirilemediği için sunulmaz.
+"""
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Opsiyonel bağımlılık - yoksa zstd sunulmaz
+    zstandard = None
+
+
+# 10 byte gzip header: magic, deflate, flag yok, mtime=0, xfl=0, OS=unknown
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding header'ını encoding -> q değeri sözlüğüne çevirir"""
+    result = {}
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        result[name.strip().lower()] = q
+    return result
+
+
+class PrecompressedJSON:
+    """Sabit JSON gövdesi + encoding başına önceden sıkıştırılmış hali"""
+
+    # Tercih sırası: önce daha iyi sıkıştıran encoding
+    preferred_encodings = ("zstd", "gzip")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._body_crc = zlib.crc32(body)
+
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self._gzip_body = GZIP_HEADER + compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        self._zstd_body: Optional[bytes] = None
+        if zstandard is not None:
+            self._zstd_body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+
+    def available_encodings(self) -> Tuple[str, ...]:
+        return tuple(
+            encoding for encoding in self.preferred_encodings
+            if encoding != "zstd" or self._zstd_body is not None
+        )
+
+    def select_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """İstemcinin kabul ettiği en iyi encoding'i seçer; None = sıkıştırmasız"""
+        if not accept_encoding:
+            return None
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        candidates = [
+            (accepted.get(encoding, wildcard), -i, encoding)
+            for i, encoding in enumerate(self.available_encodings())
+        ]
+        candidates = [c for c in candidates if c[0] > 0]
+        if not candidates:
+            return None
+        return max(candidates)[2]
+
+    def render(self, suffix: bytes, encoding: Optional[str]) -> bytes:
+        """Gövdeye soneki ekleyip istenen encoding'de yanıt byte'larını döner"""
+        if encoding == "gzip":
+            compressor = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+            crc = zlib.crc32(suffix, self._body_crc)
+            size = (len(self.body) + len(suffix)) & 0xFFFFFFFF
+            return (
+                self._gzip_body
+                + compressor.compress(suffix) + compressor.flush()
+                + struct.pack("<II", crc, size)
+            )
+        if encoding == "zstd" and self._zstd_body is not None:
+            return self._zstd_body + zstandard.ZstdCompressor(level=1).compress(suffix)
+        return self.body + suffix
+
+    def sizes(self) -> Dict[str, int]:
+        """Encoding başına saklanan gövde boyutları (byte)"""
+        sizes = {"identity": len(self.body), "gzip": len(self._gzip_body)}
+        if self._zstd_body is not None:
+            sizes["zstd"] = len(self._zstd_body)
+        return sizes
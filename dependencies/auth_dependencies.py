@@ -1,9 +1,9 @@
 from fastapi import Header, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from core.database import get_db
+from core.database import get_db, AsyncSessionLocal
 from services.auth_service import AuthService
-from models.auth_models import UserDB
+from models.auth_models import AuthPrincipal
 
 
 async def get_api_key(
@@ -34,10 +34,10 @@ async def get_session_token(
 
 async def verify_api_key(
     api_key: Optional[str] = Depends(get_api_key),
-    db: Session = Depends(get_db)
-) -> UserDB:
+    db: AsyncSession = Depends(get_db)
+) -> AuthPrincipal:
     """
-    API Key'i doğrular ve kullanıcıyı döner
+    API Key'i doğrular ve kullanıcıyı (AuthPrincipal) döner
     Sadece API key kontrolü yapar
     """
     if not api_key:
@@ -47,7 +47,7 @@ async def verify_api_key(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = AuthService.verify_api_key(db, api_key)
+    user = await AuthService.authenticate_api_key(db, api_key)
     
     if not user:
         raise HTTPException(
@@ -62,8 +62,8 @@ async def verify_api_key(
 async def verify_api_key_and_session(
     api_key: Optional[str] = Depends(get_api_key),
     session_token: Optional[str] = Depends(get_session_token),
-    db: Session = Depends(get_db)
-) -> UserDB:
+    db: AsyncSession = Depends(get_db)
+) -> AuthPrincipal:
     """
     API Key VEYA Session Token doğrular
     İkisinden biri geçerli olsa yeterlidir
@@ -76,16 +76,34 @@ async def verify_api_key_and_session(
         )
     
     # AuthService ile doğrulama yap
-    user = AuthService.verify_api_key_and_session(db, api_key, session_token)
+    user = await AuthService.verify_api_key_and_session(db, api_key, session_token)
     
     return user
 
 
+async def authenticate_stream_client(api_key: Optional[str], session_token: Optional[str]) -> AuthPrincipal:
+    """
+    Uzun ömürlü bağlantılar (WebSocket, SSE) için API key VEYA session token doğrular
+    Önbellekte yoksa kendi kısa ömürlü session'ıyla doğrular; bağlantı boyunca DB bağlantısı tutulmaz.
+
+    Raises:
+        HTTPException: 401 - kimlik bilgisi yok veya geçersiz
+    """
+    if not api_key and not session_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="API Key veya Session Token gerekli",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    async with AsyncSessionLocal() as db:
+        return await AuthService.verify_api_key_and_session(db, api_key, session_token)
+
+
 async def get_current_user_optional(
     api_key: Optional[str] = Depends(get_api_key),
     session_token: Optional[str] = Depends(get_session_token),
-    db: Session = Depends(get_db)
-) -> Optional[UserDB]:
+    db: AsyncSession = Depends(get_db)
+) -> Optional[AuthPrincipal]:
     """
     Opsiyonel kullanıcı doğrulaması
     Başarısız olursa None döner, hata fırlatmaz
@@ -95,7 +113,7 @@ async def get_current_user_optional(
         return None
     
     try:
-        user = AuthService.verify_api_key_and_session(db, api_key, session_token)
+        user = await AuthService.verify_api_key_and_session(db, api_key, session_token)
         return user
     except:
         return None
\ No newline at end of file
@@ -0,0 +1,50 @@
+from fastapi import Request
+from starlette.requests import HTTPConnection
+from services.candle_store.candle_store import CandleStore
+from services.candle_backfill_service import CandleBackfillEngine
+from services.candle_stream_hub import CandleStreamHub
+from services.market_stream_service import MarketStreamBroker
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.market_provider_registry import MarketProviderRegistry
+
+
+async def get_market_registry(request: Request) -> MarketProviderRegistry:
+    """
+    Lifespan'da oluşturulan, uygulama genelinde paylaşılan market provider registry'sini döner
+    """
+    return request.app.state.market_registry
+
+
+async def get_market_manager(request: Request) -> MarketAPIServiceManager:
+    """
+    Uygulama genelinde paylaşılan MarketAPIServiceManager örneğini döner
+    """
+    return request.app.state.market_manager
+
+
+async def get_candle_store(request: Request) -> CandleStore:
+    """
+    Uygulama genelinde paylaşılan yerel mum deposunu döner
+    """
+    return request.app.state.candle_store
+
+
+async def get_candle_backfill(request: Request) -> CandleBackfillEngine:
+    """
+    Uygulama genelinde paylaşılan mum backfill motorunu döner
+    """
+    return request.app.state.candle_backfill
+
+
+async def get_candle_stream_hub(request: Request) -> CandleStreamHub:
+    """
+    Uygulama genelinde paylaşılan upstream mum WebSocket hub'ını döner
+    """
+    return request.app.state.candle_stream_hub
+
+
+async def get_market_stream_broker(connection: HTTPConnection) -> MarketStreamBroker:
+    """
+    Uygulama genelinde paylaşılan /ws/market abonelik aracısını döner (HTTP ve WebSocket)
+    """
+    return connection.app.state.market_stream_broker
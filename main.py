@@ -1,11 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from core.database import engine, Base
-from routes import auth_route, symbols_route, markets_route, candles_route, user_preferences_route
+from core.config import (
+    SYMBOL_SYNC_INTERVAL_SECONDS, SESSION_REVOCATION_SYNC_SECONDS, SECRET_KEY,
+    SESSION_SWEEP_INTERVAL_SECONDS, SESSION_SWEEP_BATCH_SIZE
+)
+from core.database import engine, async_engine, Base, ensure_indexes, rebuild_drifted_cache_tables
+from routes import auth_route, symbols_route, markets_route, candles_route, user_preferences_route, market_stream_route
 from pages import ui_routes
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.market_provider_registry import MarketProviderRegistry
+from services.symbols_sync_service import SymbolCatalogSyncJob
+from services.candle_store import create_candle_store
+from services.candle_backfill_service import CandleBackfillEngine
+from services.candle_stream_hub import CandleStreamHub
+from services.market_stream_service import MarketStreamBroker
+from services.session_tokens import signed_sessions_enabled, session_revocations
+from services.session_sweep_service import SessionSweepJob
 
-# Veritabanı tablolarını oluştur
+# Veritabanı tablolarını oluştur, şeması eskimiş önbellek tablolarını yeniden kur, sonradan eklenen index'leri ekle
 Base.metadata.create_all(bind=engine)
+rebuild_drifted_cache_tables()
+ensure_indexes()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Uygulama ömrü boyunca paylaşılan kaynakları yönetir
+    Market servisleri (HTTP client'ları) istekler arasında paylaşılır, kapanışta kapatılır
+    """
+    if signed_sessions_enabled() and not SECRET_KEY:
+        raise RuntimeError("SESSION_TOKEN_MODE=signed için SECRET_KEY tanımlanmalı")
+
+    market_registry = MarketProviderRegistry()
+    app.state.market_registry = market_registry
+    app.state.market_manager = MarketAPIServiceManager(market_registry)
+    # Kapanmış mumların tutulduğu yerel depo; /candles eksik aralıkları upstream'den tamamlar
+    app.state.candle_store = create_candle_store()
+    app.state.candle_backfill = CandleBackfillEngine(app.state.market_manager, app.state.candle_store)
+    # Upstream mum WebSocket aboneliklerini tüm istemciler arasında paylaştıran hub
+    app.state.candle_stream_hub = CandleStreamHub(app.state.market_manager, app.state.candle_store)
+    # /ws/market ve SSE istemcilerinin aboneliklerini hub'a ve katalog önbelleğine bağlar
+    app.state.market_stream_broker = MarketStreamBroker(app.state.candle_stream_hub, app.state.market_manager)
+
+    # Sembol kataloglarını veritabanına senkronize eden arka plan job'ı (0 ise kapalı)
+    background_tasks = []
+    if SYMBOL_SYNC_INTERVAL_SECONDS > 0:
+        app.state.symbol_sync_job = SymbolCatalogSyncJob(app.state.market_manager, SYMBOL_SYNC_INTERVAL_SECONDS)
+        background_tasks.append(asyncio.create_task(app.state.symbol_sync_job.run()))
+    # İmzalı session modunda logout/iptal listesini sessions tablosundan senkronize eder
+    if signed_sessions_enabled():
+        background_tasks.append(asyncio.create_task(session_revocations.run(SESSION_REVOCATION_SYNC_SECONDS)))
+    # Stream'den gelen kapanmış mumları biriktirip depoya toplu yazan döngü
+    background_tasks.append(asyncio.create_task(app.state.candle_stream_hub.run()))
+    # Süresi dolan oturumları sessions tablosundan gruplar halinde silen sweeper (0 ise kapalı)
+    if SESSION_SWEEP_INTERVAL_SECONDS > 0:
+        app.state.session_sweep_job = SessionSweepJob(SESSION_SWEEP_INTERVAL_SECONDS, SESSION_SWEEP_BATCH_SIZE)
+        background_tasks.append(asyncio.create_task(app.state.session_sweep_job.run()))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await app.state.candle_backfill.shutdown()
+        app.state.market_stream_broker.close()
+        await app.state.candle_stream_hub.close()
+        await market_registry.close()
+        app.state.candle_store.close()
+        await async_engine.dispose()
+
 
 # FastAPI app
 app = FastAPI(
@@ -13,7 +79,8 @@ app = FastAPI(
     description="Modern cryptocurrency tracking API with authentication",
     version="1.0.0",
     docs_url=None,
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -32,8 +99,9 @@ app.include_router(ui_routes.router, tags=["Web UI"])
 app.include_router(auth_route.router)
 app.include_router(user_preferences_route.router)
 app.include_router(symbols_route.router)
-# app.include_router(markets_route.router, prefix="/markets", tags=["Markets"])
-# app.include_router(candles_route.router, prefix="/candles", tags=["Candles"])
+app.include_router(markets_route.router)
+app.include_router(candles_route.router)
+app.include_router(market_stream_route.router)
 
 # Health check endpoint
 @app.get("/health")
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 
@@ -27,6 +27,7 @@ class UserDB(Base):
 class SessionDB(Base):
     """
     Aktif kullanıcı oturumlarını saklayan model
+    Süresi dolan satırlar arka plan sweeper'ı tarafından toplu silinir
     """
     __tablename__ = "sessions"
     
@@ -41,6 +42,34 @@ class SessionDB(Base):
     user_agent = Column(String, nullable=True)
 
 
+# Sweeper: süresi dolan satırların aralık taraması
+Index("ix_sessions_expires_at", SessionDB.expires_at)
+# Kullanıcının açık oturumları (devre dışı bırakma / iptal) - sadece aktif satırlar
+Index(
+    "ix_sessions_user_active", SessionDB.user_id,
+    sqlite_where=SessionDB.is_active == True, postgresql_where=SessionDB.is_active == True
+)
+# İptal listesi senkronizasyonu: sonlandırılmış ama süresi dolmamış oturumlar
+Index(
+    "ix_sessions_inactive_expires_at", SessionDB.expires_at,
+    sqlite_where=SessionDB.is_active == False, postgresql_where=SessionDB.is_active == False
+)
+
+
+class AuthPrincipal(BaseModel):
+    """
+    Doğrulanmış kimliğin hafif özeti (kimlik doğrulama önbelleğinde tutulur)
+    Tam kullanıcı kaydı gereken endpoint'ler id ile veritabanından yükler
+    """
+    id: int
+    username: str
+    is_active: bool
+    session_expires_at: Optional[datetime] = None  # Session token ile doğrulandıysa
+
+    class Config:
+        frozen = True
+
+
 class UserCreate(BaseModel):
     """
     Yeni kullanıcı oluşturma için model
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional, List
+import time
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 
 class Candle(BaseModel):
     open_time: int  # Mumun açılış zamanı, milisaniye cinsinden (Unix epoch)
@@ -18,8 +19,17 @@ class Candle(BaseModel):
     @property
     def is_closed(self) -> bool:
         """Mumun kapanıp kapanmadığını belirtir."""
-        from time import time
-        return self.close_time < int(time() * 1000)
+        return self.close_time < int(time.time() * 1000)
+
+    @staticmethod
+    def closed_flags(candles: List["Candle"], now: Optional[int] = None) -> List[bool]:
+        """
+        Mum listesinin tamamı için kapanma durumunu tek bir saat okumasına göre döner
+        now: Karşılaştırma zamanı (ms), boşsa şu an
+        """
+        if now is None:
+            now = int(time.time() * 1000)
+        return [c.close_time < now for c in candles]
 
     @classmethod
     def from_api(cls, data: dict) -> "Candle":
@@ -45,5 +55,52 @@ class Candles(BaseModel):
     """
     Mum (candle) listesini ve verinin kaynağını (provider) dönen modeldir.
     """
+    timestamp: int                      # Yanıt zamanı, milisaniye cinsinden (Unix epoch)
     candles: List[Candle]              # Mum listesini içerir
-    market_id: str                      # Verinin kaynağı (örn. 'binance', 'coingecko')
\ No newline at end of file
+    market_id: str                      # Verinin kaynağı (örn. 'binance', 'coingecko')
+    symbol: str                         # Sembol (örn. 'BTCUSDT')
+    interval: str                       # Mum aralığı (örn. '1m', '1h')
+    count: int
+    indicators: Optional[Dict[str, List[Optional[float]]]] = None   # Mumlarla hizalı indikatör serileri
+
+class BackfillRequest(BaseModel):
+    """
+    Geçmiş mum backfill isteği
+    """
+    symbol: str = Field(..., max_length=20, description="Sembol (ör: BTCUSDT)")
+    market: Optional[str] = Field(None, max_length=50, description="Market id (boşsa kullanıcı tercihi)")
+    interval: str = Field("1m", description="Mum aralığı (ör: 1m, 1h)")
+    start_time: int = Field(..., ge=0, description="Başlangıç zamanı (ms)")
+    end_time: Optional[int] = Field(None, ge=0, description="Bitiş zamanı (ms, boşsa son kapanmış mum)")
+
+
+class BackfillJobResponse(BaseModel):
+    """
+    Backfill job'ının durumu, ilerlemesi ve hızı
+    """
+    job_id: str
+    market: str
+    symbol: str
+    interval: str
+    start_time: int
+    end_time: int
+    status: str                         # pending, running, completed, failed, cancelled
+    error: Optional[str] = None
+    pages_total: int
+    pages_done: int
+    candles_written: int
+    percent: float
+    elapsed_seconds: float
+    candles_per_second: float
+    pages_per_second: float
+    eta_seconds: Optional[float] = None
+    rate_limit_waits: int
+
+
+class BackfillJobsResponse(BaseModel):
+    """
+    Takip edilen backfill job'larının listesi
+    """
+    timestamp: int
+    jobs: List[BackfillJobResponse]
+    count: int
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+
+
+class IndicatorConfig(BaseModel):
+    """
+    Hesaplanacak tek bir indikatörün ayarı
+    """
+    name: str = Field(..., description="İndikatör adı (ör: sma, ema, rsi, macd)")
+    params: Dict[str, Union[int, float, str]] = Field(default_factory=dict, description="Parametreler (ör: {\"period\": 50})")
+    id: Optional[str] = Field(None, max_length=50, description="Çıktı anahtarı (boşsa ad ve parametrelerden üretilir)")
+
+
+class IndicatorInfo(BaseModel):
+    """
+    Desteklenen bir indikatörün tanımı
+    """
+    name: str
+    description: str
+    params: Dict[str, Union[int, float, str]]   # Varsayılan parametreler
+    outputs: List[str]                           # Çok çıktılı indikatörlerin alt serileri (ör: macd, signal, hist)
+
+
+class IndicatorsResponse(BaseModel):
+    """
+    Desteklenen indikatörlerin listesi
+    """
+    timestamp: int
+    indicators: List[IndicatorInfo]
+    count: int
@@ -1,7 +1,8 @@
 
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-from sqlalchemy import Column, Integer, String
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
 from core.database import Base
 
 
@@ -13,12 +14,22 @@ class Symbol(BaseModel):
 
 
 class SymbolSchema(Base):
+    """
+    Market bazlı kalıcı sembol kataloğu - arka plan sync job'ı tarafından diff ile güncellenir
+    Upstream'den yeniden doldurulabilen önbellek tablosudur: şema değişince başlangıçta yeniden kurulur
+    """
     __tablename__ = "symbols"
+    __table_args__ = (
+        UniqueConstraint("market", "symbol", name="uq_symbols_market_symbol"),
+        {"info": {"cache": True}},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String, unique=True, index=True)      # 'BTCUSDT'
+    market = Column(String(50), index=True, nullable=False)  # 'binance'
+    symbol = Column(String, index=True, nullable=False)      # 'BTCUSDT'
     base_asset = Column(String)                           # 'BTC'
     quote_asset = Column(String)                          # 'USDT'
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
 class SymbolsResponse(BaseModel):
@@ -28,4 +39,23 @@ class SymbolsResponse(BaseModel):
     count: int
 
     class Config:
-        arbitrary_types_allowed = True
\ No newline at end of file
+        arbitrary_types_allowed = True
+
+
+class SymbolSearchResponse(BaseModel):
+    """Sembol arama yanıt modeli - en uygun ilk N sonuç"""
+    timestamp: int  # Yanıt zamanı, milisaniye cinsinden (Unix epoch)
+    market: str
+    query: str
+    results: List[Symbol]
+    count: int
+
+
+class SymbolsPageResponse(BaseModel):
+    """Sayfalı ve alan seçimli (projection) sembol yanıt modeli"""
+    timestamp: int  # Yanıt zamanı, milisaniye cinsinden (Unix epoch)
+    symbols: List[Dict[str, str]]   # Sadece istenen alanları içerir (fields=)
+    count: int                      # Bu sayfadaki sembol sayısı
+    total: int                      # Filtrelere uyan toplam sembol sayısı
+    offset: int
+    next_offset: Optional[int] = None  # Sonraki sayfa için offset (son sayfada None)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Request, Response, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 from models.auth_models import UserCreate
 from services.auth_service import AuthService
@@ -305,12 +305,12 @@ async def register_user(
     username: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı kayıt işlemi"""
     try:
         user_data = UserCreate(username=username, email=email, password=password)
-        user = AuthService.create_user(db, user_data)
+        user = await AuthService.create_user(db, user_data)
         
         # Başarılı kayıt - giriş sayfasına yönlendir
         return RedirectResponse(url="/login?success=registered", status_code=303)
@@ -570,14 +570,14 @@ async def login_user(
     response: Response,
     username: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı giriş işlemi"""
     from models.auth_models import UserLogin
     
     try:
         login_data = UserLogin(username=username, password=password)
-        user = AuthService.authenticate_user(db, login_data)
+        user = await AuthService.authenticate_user(db, login_data)
         
         if not user:
             raise HTTPException(
@@ -586,7 +586,7 @@ async def login_user(
             )
         
         # Session oluştur
-        session = AuthService.create_session(db=db, user=user, expiry_hours=24)
+        session = await AuthService.create_session(db=db, user=user, expiry_hours=24)
         
         # Session token'ı cookie'ye kaydet
         redirect_response = RedirectResponse(url="/dashboard", status_code=303)
@@ -692,7 +692,7 @@ async def login_user(
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+async def dashboard(request: Request, db: AsyncSession = Depends(get_db)):
     """Kullanıcı dashboard - API anahtarı gösterimi"""
     # Cookie'den session token al
     session_token = request.cookies.get("session_token")
@@ -700,10 +700,11 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
     if not session_token:
         return RedirectResponse(url="/login", status_code=303)
     
-    # Session doğrula
-    user, session = AuthService.verify_session(db, session_token)
+    # Session doğrula (signed modunda I/O'suz), sonra tam kullanıcı kaydını yükle
+    principal = await AuthService.authenticate_session(db, session_token)
+    user = await AuthService.get_user(db, principal.id) if principal else None
     
-    if not user:
+    if not user or not user.is_active:
         return RedirectResponse(url="/login", status_code=303)
     
     return f"""
@@ -944,7 +945,7 @@ print(response.json())
 
 
 @router.get("/logout")
-async def logout_get(request: Request, db: Session = Depends(get_db)):
+async def logout_get(request: Request, db: AsyncSession = Depends(get_db)):
     """Çıkış yap"""
     # Cookie'den session token al
     session_token = request.cookies.get("session_token")
@@ -952,7 +953,7 @@ async def logout_get(request: Request, db: Session = Depends(get_db)):
     # Session'ı veritabanında geçersiz kıl
     if session_token:
         try:
-            AuthService.invalidate_session(db, session_token)
+            await AuthService.invalidate_session(db, session_token)
         except:
             pass  # Session zaten geçersiz olabilir
     
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from core.database import get_db
 from models.auth_models import (
     UserCreate, UserLogin, UserResponse, LoginResponse, 
-    APIKeyVerification, UserDB
+    APIKeyVerification, AuthPrincipal
 )
 from services.auth_service import AuthService
 from dependencies.auth_dependencies import (
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Yeni kullanıcı kaydı oluşturur
@@ -32,7 +32,7 @@ async def register(
     Başarılı kayıt sonrası API key otomatik oluşturulur
     """
     try:
-        user = AuthService.create_user(db, user_data)
+        user = await AuthService.create_user(db, user_data)
         return UserResponse.model_validate(user)
     except HTTPException:
         raise
@@ -47,7 +47,7 @@ async def register(
 async def login(
     login_data: UserLogin,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kullanıcı girişi yapar ve session token döner
@@ -60,7 +60,7 @@ async def login(
     - Session token (24 saat geçerli)
     - Kullanıcı bilgileri döner
     """
-    user = AuthService.authenticate_user(db, login_data)
+    user = await AuthService.authenticate_user(db, login_data)
     
     if not user:
         raise HTTPException(
@@ -74,7 +74,7 @@ async def login(
     user_agent = request.headers.get("user-agent")
     
     # Session oluştur
-    session = AuthService.create_session(
+    session = await AuthService.create_session(
         db=db,
         user=user,
         ip_address=ip_address,
@@ -94,7 +94,7 @@ async def login(
 @router.post("/logout")
 async def logout(
     session_token: Optional[str] = Depends(get_session_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kullanıcı oturumunu sonlandırır
@@ -107,7 +107,7 @@ async def logout(
             detail="Session token gerekli"
         )
     
-    success = AuthService.invalidate_session(db, session_token)
+    success = await AuthService.invalidate_session(db, session_token)
     
     if not success:
         raise HTTPException(
@@ -123,7 +123,7 @@ async def logout(
 
 @router.get("/verify", response_model=APIKeyVerification)
 async def verify_credentials(
-    user: UserDB = Depends(verify_api_key_and_session)
+    user: AuthPrincipal = Depends(verify_api_key_and_session)
 ):
     """
     API Key veya Session Token doğrular
@@ -143,46 +143,54 @@ async def verify_credentials(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    user: UserDB = Depends(verify_api_key_and_session)
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Mevcut kullanıcının bilgilerini döner
     
     Authentication gereklidir (API Key veya Session Token)
     """
-    return UserResponse.model_validate(user)
+    db_user = await AuthService.get_user(db, user.id)
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kullanıcı bulunamadı"
+        )
+    
+    return UserResponse.model_validate(db_user)
 
 
 @router.post("/refresh-api-key", response_model=UserResponse)
 async def refresh_api_key(
-    user: UserDB = Depends(verify_api_key_and_session),
-    db: Session = Depends(get_db)
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Yeni API Key oluşturur
     
     ⚠️ Dikkat: Eski API key artık çalışmayacaktır!
     """
-    # Yeni API key oluştur
-    new_api_key = AuthService.generate_api_key()
-    
-    # Kullanıcının API key'ini güncelle
-    user.api_key = new_api_key
-    db.commit()
-    db.refresh(user)
+    # Yeni API key oluştur (eski key kimlik doğrulama önbelleğinden de silinir)
+    db_user = await AuthService.refresh_api_key(db, user.id)
+    if not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kullanıcı bulunamadı"
+        )
     
-    return UserResponse.model_validate(user)
+    return UserResponse.model_validate(db_user)
 
 
 @router.get("/docs", include_in_schema=False)
-async def custom_swagger_ui(request: Request, db: Session = Depends(get_db)):
+async def custom_swagger_ui(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Swagger UI dokümantasyon sayfası (Session gerekli)
     """
     session_token = request.cookies.get("session_token")
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token gerekli")
-    user, session = AuthService.verify_session(db, session_token)
+    user = await AuthService.authenticate_session(db, session_token)
     if not user:
         raise HTTPException(status_code=401, detail="Geçersiz oturum")
     
@@ -190,14 +198,14 @@ async def custom_swagger_ui(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/redoc", include_in_schema=False)
-async def custom_redoc(request: Request, db: Session = Depends(get_db)):
+async def custom_redoc(request: Request, db: AsyncSession = Depends(get_db)):
     """
     ReDoc dokümantasyon sayfası (Session gerekli)
     """
     session_token = request.cookies.get("session_token")
     if not session_token:
         raise HTTPException(status_code=401, detail="Session token gerekli")
-    user, session = AuthService.verify_session(db, session_token)
+    user = await AuthService.authenticate_session(db, session_token)
     if not user:
         raise HTTPException(status_code=401, detail="Geçersiz oturum")
     
@@ -0,0 +1,266 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from pydantic import TypeAdapter
+from models.auth_models import AuthPrincipal
+from models.candle_models import Candles, BackfillRequest, BackfillJobResponse, BackfillJobsResponse
+from models.indicator_models import IndicatorConfig, IndicatorsResponse
+from dependencies.auth_dependencies import verify_api_key_and_session
+from dependencies.market_dependencies import get_market_manager, get_candle_store, get_candle_backfill
+from services.candle_store.candle_store import CandleStore
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.rate_limiter import RateLimitExceeded
+from services.user_preferences_service import UserPreferencesService
+from services.candles_service import CandlesService
+from services.candle_formats import (
+    encode_columnar, encode_csv, encode_binary, stream_csv, stream_ndjson, BINARY_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+)
+from services.candle_store.columns import columns_to_candles, concat_columns
+from services.candle_backfill_service import CandleBackfillEngine
+from services.indicators.indicator_manager import indicator_manager
+from core.database import get_db
+import time
+
+router = APIRouter(prefix="/candles", tags=["Candles"])
+
+_indicator_configs_adapter = TypeAdapter(List[IndicatorConfig])
+
+
+async def _resolve_market_symbol(user: AuthPrincipal, db, symbol: Optional[str], market: Optional[str]):
+    """Boş bırakılan sembol / market'i kullanıcı tercihinden doldurur"""
+    if symbol is None or market is None:
+        preferences = await UserPreferencesService.get_user_preferences(user.id, db)
+        if not preferences:
+            raise ValueError("Kullanıcı tercihi bulunamadı.")
+        symbol = symbol or preferences.symbol
+        market = market or preferences.market
+    return symbol, market
+
+
+def _resolve_indicators(requested_indicators: Optional[str], configs: Optional[str]) -> List[IndicatorConfig]:
+    return indicator_manager.resolve_configs(
+        requested_indicators.split(",") if requested_indicators else None,
+        _indicator_configs_adapter.validate_json(configs) if configs else None
+    )
+
+
+@router.get("/", response_model=Candles)
+async def get_candles(
+    symbol: Optional[str] = Query(None, max_length=20, description="Sembol (boşsa kullanıcı tercihi, ör: BTCUSDT)"),
+    market: Optional[str] = Query(None, description="Market id (boşsa kullanıcı tercihi)"),
+    interval: str = Query("1h", description="Mum aralığı (ör: 1m, 5m, 1h, 1d)"),
+    start_time: Optional[int] = Query(None, ge=0, description="Başlangıç zamanı (ms)"),
+    end_time: Optional[int] = Query(None, ge=0, description="Bitiş zamanı (ms, boşsa şimdi)"),
+    limit: int = Query(500, ge=1, le=5000, description="En fazla mum sayısı"),
+    requested_indicators: Optional[str] = Query(
+        None, description="Varsayılan parametrelerle hesaplanacak indikatörler (ör: sma,rsi,macd)"
+    ),
+    configs: Optional[str] = Query(
+        None, max_length=4000,
+        description='İndikatör ayarları, JSON liste (ör: [{"name":"ema","params":{"period":50}}])'
+    ),
+    output_format: str = Query(
+        "json", alias="format", pattern="^(json|columnar|csv|binary)$",
+        description="Yanıt biçimi: json (mum nesneleri), columnar (alan başına dizi), csv, binary (ham NumPy tamponları)"
+    ),
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db=Depends(get_db),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager),
+    candle_store: CandleStore = Depends(get_candle_store)
+):
+    """
+    Mum verilerini döner
+
+    Kapanmış mumlar yerel mum deposundan sunulur; depoda olmayan aralıklar upstream'den
+    sayfa sayfa çekilip depoya yazılır. Açık mum her istekte upstream'den alınır.
+
+    requested_indicators / configs verilirse mumlarla hizalı indikatör serileri de döner.
+    format=columnar/csv/binary mum başına alan adlarını tekrarlamayan biçimlerde döner;
+    binary yanıt depodaki dizilerden kopyalanmadan yazılır (düzen: services/candle_formats.py).
+    """
+    try:
+        symbol, market = await _resolve_market_symbol(user, db, symbol, market)
+        indicator_configs = _resolve_indicators(requested_indicators, configs)
+
+        service = CandlesService(market_manager, candle_store)
+        parts, indicators = await service.get_candle_parts_with_indicators(
+            market, symbol, interval, start_time, end_time, limit, indicator_configs
+        )
+        meta = {
+            "timestamp": int(time.time() * 1000),
+            "market_id": market,
+            "symbol": symbol.upper(),
+            "interval": interval,
+        }
+
+        if output_format == "columnar":
+            return Response(content=encode_columnar(meta, concat_columns(parts), indicators),
+                            media_type="application/json")
+        if output_format == "csv":
+            return Response(content=encode_csv(parts, indicators), media_type="text/csv")
+        if output_format == "binary":
+            length, chunks = encode_binary(meta, parts, indicators)
+            return StreamingResponse(iter(chunks), media_type=BINARY_MEDIA_TYPE,
+                                     headers={"Content-Length": str(length)})
+
+        candles = columns_to_candles(concat_columns(parts))
+        return Candles(
+            candles=candles,
+            count=len(candles),
+            indicators={key: indicator_manager.to_json_series(values) for key, values in indicators.items()} or None,
+            **meta
+        )
+    except HTTPException:
+        raise
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)}
+        )
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+
+@router.get("/stream")
+async def stream_candles(
+    start_time: int = Query(..., ge=0, description="Başlangıç zamanı (ms)"),
+    symbol: Optional[str] = Query(None, max_length=20, description="Sembol (boşsa kullanıcı tercihi, ör: BTCUSDT)"),
+    market: Optional[str] = Query(None, description="Market id (boşsa kullanıcı tercihi)"),
+    interval: str = Query("1h", description="Mum aralığı (ör: 1m, 5m, 1h, 1d)"),
+    end_time: Optional[int] = Query(None, ge=0, description="Bitiş zamanı (ms, boşsa şimdi)"),
+    requested_indicators: Optional[str] = Query(
+        None, description="Varsayılan parametrelerle hesaplanacak indikatörler (ör: sma,rsi,macd)"
+    ),
+    configs: Optional[str] = Query(
+        None, max_length=4000,
+        description='İndikatör ayarları, JSON liste (ör: [{"name":"ema","params":{"period":50}}])'
+    ),
+    output_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$",
+        description="Akış biçimi: ndjson (mum başına bir JSON satırı) veya csv"
+    ),
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db=Depends(get_db),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager),
+    candle_store: CandleStore = Depends(get_candle_store)
+):
+    """
+    Büyük geçmiş aralıkları (limit olmadan) parça parça akış olarak döner
+
+    Mumlar depodan bloklar halinde okunur, eksik bloklar sırası geldiğinde upstream'den
+    tamamlanır ve her blok kodlanıp hemen yazılır; sunucu belleği ve ilk byte süresi aralık
+    uzunluğuna bağlı değildir. İndikatörler bloktan bloğa durum taşınarak hesaplanır.
+
+    Akış başladıktan sonra oluşan upstream hatalarında yanıt yarıda kesilir.
+    """
+    try:
+        symbol, market = await _resolve_market_symbol(user, db, symbol, market)
+        indicator_configs = _resolve_indicators(requested_indicators, configs)
+
+        service = CandlesService(market_manager, candle_store)
+        chunks = await service.stream_candles(
+            market, symbol, interval, start_time, end_time, indicator_configs
+        )
+        if output_format == "csv":
+            return StreamingResponse(stream_csv(chunks), media_type="text/csv")
+        return StreamingResponse(stream_ndjson(chunks), media_type=NDJSON_MEDIA_TYPE)
+    except HTTPException:
+        raise
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)}
+        )
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+
+@router.get("/indicators", response_model=IndicatorsResponse)
+async def list_indicators(
+    user: AuthPrincipal = Depends(verify_api_key_and_session)
+):
+    """
+    /candles'ta requested_indicators ve configs ile istenebilecek indikatörleri döner
+    """
+    indicators = indicator_manager.list_indicators()
+    return IndicatorsResponse(timestamp=int(time.time() * 1000), indicators=indicators, count=len(indicators))
+
+
+@router.post("/backfill", response_model=BackfillJobResponse, status_code=202)
+async def start_backfill(
+    request_data: BackfillRequest,
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db=Depends(get_db),
+    backfill: CandleBackfillEngine = Depends(get_candle_backfill)
+):
+    """
+    Geçmiş mum aralığını arka planda mum deposuna yükleyen bir backfill job'ı başlatır
+
+    Aynı seri için çalışan bir job varsa yenisi açılmaz, mevcut job döner.
+    Daha önce yüklenmiş aralıklar atlanır (yarıda kalan backfill kaldığı yerden devam eder).
+    """
+    try:
+        market = request_data.market
+        if market is None:
+            preferences = await UserPreferencesService.get_user_preferences(user.id, db)
+            if not preferences:
+                raise ValueError("Kullanıcı tercihi bulunamadı.")
+            market = preferences.market
+
+        job = backfill.start(market, request_data.symbol, request_data.interval,
+                             request_data.start_time, request_data.end_time)
+        return BackfillJobResponse(**job.progress())
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+
+@router.get("/backfill", response_model=BackfillJobsResponse)
+async def list_backfills(
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    backfill: CandleBackfillEngine = Depends(get_candle_backfill)
+):
+    """
+    Takip edilen backfill job'larının ilerleme ve hız bilgilerini döner
+    """
+    jobs = [BackfillJobResponse(**job.progress()) for job in backfill.list_jobs()]
+    return BackfillJobsResponse(timestamp=int(time.time() * 1000), jobs=jobs, count=len(jobs))
+
+
+@router.get("/backfill/{job_id}", response_model=BackfillJobResponse)
+async def get_backfill(
+    job_id: str,
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    backfill: CandleBackfillEngine = Depends(get_candle_backfill)
+):
+    """
+    Backfill job'ının ilerleme (sayfa, mum, yüzde) ve hız (mum/sn, tahmini bitiş) bilgisini döner
+    """
+    job = backfill.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backfill job bulunamadı")
+    return BackfillJobResponse(**job.progress())
+
+
+@router.delete("/backfill/{job_id}", response_model=BackfillJobResponse)
+async def cancel_backfill(
+    job_id: str,
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    backfill: CandleBackfillEngine = Depends(get_candle_backfill)
+):
+    """
+    Çalışan backfill job'ını iptal eder; o ana kadar yazılan mumlar depoda kalır
+    """
+    job = backfill.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backfill job bulunamadı")
+    return BackfillJobResponse(**job.progress())
@@ -0,0 +1,199 @@
+import asyncio
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from core.config import AUTH_CACHE_TTL_SECONDS
+from dependencies.auth_dependencies import get_api_key, get_session_token, authenticate_stream_client
+from dependencies.market_dependencies import get_market_stream_broker
+from services.market_api_manager.rate_limiter import RateLimitExceeded
+from services.market_stream_service import (
+    MarketStreamBroker, StreamClient, StreamClientClosed, StreamMessage, parse_stream_topic
+)
+
+router = APIRouter(prefix="/ws", tags=["Market Stream"])
+
+# Mesaj olmadığında SSE bağlantısını canlı tutan yorum satırı aralığı (saniye)
+SSE_KEEPALIVE_SECONDS = 15
+
+# İstemcinin kopan SSE bağlantısını yeniden denemeden önce beklemesi (ms)
+SSE_RETRY_MS = 3000
+
+# Açık bağlantıların kimliğinin yeniden doğrulanma aralığı (saniye); HTTP isteklerindeki
+# önbellek gecikmesiyle aynıdır: logout / API key yenileme / devre dışı bırakma en geç bu kadar sonra görülür
+AUTH_RECHECK_SECONDS = AUTH_CACHE_TTL_SECONDS or 60
+
+
+async def _watch_credentials(client: StreamClient) -> None:
+    """
+    Bağlantı boyunca istemcinin kimliğini periyodik olarak yeniden doğrular
+    Kimlik geçersizleşince veya oturum süresi dolunca istemciyi kapatır
+    """
+    while True:
+        delay = AUTH_RECHECK_SECONDS
+        expires_at = client.principal.session_expires_at
+        if expires_at is not None:
+            delay = min(delay, max(0.0, (expires_at - datetime.utcnow()).total_seconds()))
+        await asyncio.sleep(delay)
+
+        if expires_at is not None and expires_at <= datetime.utcnow():
+            client.close("Oturum süresi doldu")
+            return
+        try:
+            client.principal = await authenticate_stream_client(client.api_key, client.session_token)
+        except HTTPException as e:
+            client.close(str(e.detail))
+            return
+        except Exception as e:
+            # Geçici hata (ör: veritabanı): bağlantı açık kalır, sonraki turda tekrar denenir
+            print(f"❌ Stream istemcisi yeniden doğrulanamadı: {str(e)}")
+
+
+async def _send_loop(websocket: WebSocket, client: StreamClient) -> None:
+    """
+    İstemci kuyruğundaki mesajları sırayla gönderir (yavaş istemci sadece kendi kuyruğunu doldurur)
+    İstemci kapatılırsa bağlantı 1008 (policy violation) ile kapatılır
+    """
+    try:
+        while True:
+            message = await client.next_message()
+            await websocket.send_text(message.text)
+    except StreamClientClosed as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.reason)
+
+
+async def _receive_loop(websocket: WebSocket, client: StreamClient, broker: MarketStreamBroker) -> None:
+    """İstemci mesajlarını işler; yanıtlar gönderim kuyruğuna konur. İstemci ayrılınca döner."""
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                request = json.loads(text)
+            except ValueError:
+                request = None
+            if not isinstance(request, dict):
+                reply = {"type": "error", "id": None, "detail": "Mesaj bir JSON nesnesi olmalı"}
+            else:
+                reply = await broker.handle(client, request)
+            client.push(StreamMessage(reply))
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/market")
+async def market_websocket(
+    websocket: WebSocket,
+    api_key: Optional[str] = Depends(get_api_key),
+    session_token: Optional[str] = Depends(get_session_token),
+    api_key_query: Optional[str] = Query(None, alias="api_key"),
+    session_token_query: Optional[str] = Query(None, alias="session_token"),
+    broker: MarketStreamBroker = Depends(get_market_stream_broker)
+):
+    """
+    Çoklu stream abonelikli piyasa verisi WebSocket'i
+
+    Kimlik doğrulama /candles ile aynıdır (API key veya session token); tarayıcılar WebSocket'te
+    header gönderemediği için api_key / session_token query parametreleri de kabul edilir.
+
+    İstemci mesajları:
+        {"op": "subscribe", "streams": [{"market": "binance", "symbol": "BTCUSDT", "channel": "kline_1m"}], "id": 1}
+        {"op": "unsubscribe", "streams": ["binance:BTCUSDT:kline_1m"], "id": 2}
+        {"op": "list"} / {"op": "ping"}
+
+    Sunucu mesajları: kline, catalog, subscribed/unsubscribed, subscriptions, pong, error,
+    dropped (yavaş bağlantıda kuyruktan düşen mesaj sayısı).
+
+    Kimlik bağlantı boyunca yeniden doğrulanır; logout, API key yenileme, hesabın devre dışı
+    bırakılması veya oturumun bitmesiyle bağlantı 1008 koduyla kapatılır.
+    """
+    api_key, session_token = api_key or api_key_query, session_token or session_token_query
+    try:
+        user = await authenticate_stream_client(api_key, session_token)
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    client = broker.connect(user, api_key, session_token)
+    receiver = asyncio.create_task(_receive_loop(websocket, client, broker))
+    sender = asyncio.create_task(_send_loop(websocket, client))
+    watcher = asyncio.create_task(_watch_credentials(client))
+    tasks = (receiver, sender, watcher)
+    try:
+        # İstemci ayrılınca (receiver) veya kimlik geçersizleşip bağlantı kapatılınca (sender) biter
+        await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Bağlantı iptalle (sunucu kapanışı vb.) sonlansa bile abonelikler bırakılır
+        await asyncio.shield(broker.disconnect(client))
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.get("/market/sse")
+async def market_sse(
+    streams: str = Query(
+        ..., max_length=4000,
+        description="Virgülle ayrılmış market:symbol:channel listesi (ör: binance:BTCUSDT:kline_1m,binance::catalog)"
+    ),
+    api_key: Optional[str] = Depends(get_api_key),
+    session_token: Optional[str] = Depends(get_session_token),
+    api_key_query: Optional[str] = Query(None, alias="api_key"),
+    session_token_query: Optional[str] = Query(None, alias="session_token"),
+    broker: MarketStreamBroker = Depends(get_market_stream_broker)
+):
+    """
+    /ws/market'in Server-Sent Events karşılığı (WebSocket kullanılamayan istemciler için)
+
+    Abonelikler bağlantı açılırken 'streams' ile verilir; mesajlar WebSocket'tekiyle aynı JSON'dur
+    ('event:' alanı mesaj tipidir). Kimlik doğrulama ve yeniden doğrulama /ws/market ile aynıdır;
+    kimlik geçersizleşince 'closed' olayı gönderilip akış sonlandırılır.
+    """
+    api_key, session_token = api_key or api_key_query, session_token or session_token_query
+    user = await authenticate_stream_client(api_key, session_token)
+    try:
+        topics = [parse_stream_topic(spec) for spec in streams.split(",") if spec.strip()]
+        if not topics:
+            raise ValueError("En az bir stream gerekli")
+        client = broker.connect(user, api_key, session_token)
+        try:
+            for topic in topics:
+                await broker.subscribe(client, topic)
+        except Exception:
+            await broker.disconnect(client)
+            raise
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+    async def events():
+        watcher = asyncio.create_task(_watch_credentials(client))
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+            while True:
+                try:
+                    message = await asyncio.wait_for(client.next_message(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                except StreamClientClosed as e:
+                    yield StreamMessage({"type": "closed", "detail": e.reason}).sse
+                    return
+                yield message.sse
+        finally:
+            watcher.cancel()
+            await asyncio.shield(broker.disconnect(client))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
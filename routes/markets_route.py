@@ -1,20 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
-from models.auth_models import UserDB
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from models.auth_models import AuthPrincipal
 from dependencies.auth_dependencies import verify_api_key_and_session
+from dependencies.market_dependencies import get_market_manager
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
 from models.market_models import MarketsResponse
-from services.markets_service import MarketsService
+from services.markets_service import MarketsService, MARKETS_ETAG, MARKETS_MODIFIED_AT, MARKETS_MAX_AGE_SECONDS
+from core.http_cache import cache_headers, is_not_modified, not_modified_response
 import time
 
 router = APIRouter(prefix="/markets", tags=["Markets"])
 
 @router.get("/", response_model=MarketsResponse)
-async def get_markets(user: UserDB = Depends(verify_api_key_and_session)):
+async def get_markets(
+    request: Request,
+    response: Response,
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager)
+):
     """
     Desteklenen spot marketleri döner (API Key ve aktif session gerektirir)
     Authentication: API Key veya Session Token gereklidir
+    If-None-Match / If-Modified-Since eşleşirse 304 döner
     """
     try:
-        service = MarketsService()
+        headers = cache_headers(MARKETS_ETAG, MARKETS_MODIFIED_AT, MARKETS_MAX_AGE_SECONDS)
+        if is_not_modified(request, MARKETS_ETAG, MARKETS_MODIFIED_AT):
+            return not_modified_response(headers)
+        response.headers.update(headers)
+
+        service = MarketsService(market_manager)
         markets = service.get_markets()
         return MarketsResponse(
             timestamp=int(time.time() * 1000),
@@ -24,4 +38,19 @@ async def get_markets(user: UserDB = Depends(verify_api_key_and_session)):
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
- 
\ No newline at end of file
+
+
+@router.get("/rate-limits")
+async def get_market_rate_limits(
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager)
+):
+    """
+    Market bazlı upstream rate limit bütçe kullanımını döner
+    (kapasite, kalan token, sıradaki/reddedilen çağrılar, upstream'in bildirdiği ağırlık)
+    """
+    service = MarketsService(market_manager)
+    return {
+        "timestamp": int(time.time() * 1000),
+        "markets": service.get_rate_limit_usage()
+    }
@@ -1,40 +1,156 @@
-from fastapi import APIRouter, Depends, HTTPException
-from models.auth_models import UserDB
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Optional, Union
+from models.auth_models import AuthPrincipal
 from dependencies.auth_dependencies import verify_api_key_and_session
+from dependencies.market_dependencies import get_market_manager
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.rate_limiter import RateLimitExceeded
 from services.user_preferences_service import UserPreferencesService
+from core.config import SYMBOL_CACHE_TTL_SECONDS
 from core.database import get_db
+from core.http_cache import cache_headers, is_not_modified, not_modified_response, make_etag
 from services.symbols_service import SymbolsService
-from models.symbol_models import SymbolsResponse
+from models.symbol_models import SymbolsResponse, SymbolSearchResponse, SymbolsPageResponse
 import time
 
 router = APIRouter(prefix="/symbols", tags=["Symbols"])
 
-@router.get("/", response_model=SymbolsResponse)
+
+async def get_preferred_market(user: AuthPrincipal, db) -> str:
+    """Kullanıcı tercihindeki market id'sini döner"""
+    preferences = await UserPreferencesService.get_user_preferences(user.id, db)
+    if not preferences or not preferences.market:
+        raise ValueError("Kullanıcı tercihinde market bulunamadı.")
+    return preferences.market
+
+
+@router.get("/", response_model=Union[SymbolsResponse, SymbolsPageResponse])
 async def get_symbols(
-    user: UserDB = Depends(verify_api_key_and_session),
-    db=Depends(get_db)
+    request: Request,
+    response: Response,
+    offset: int = Query(0, ge=0, description="Sayfa başlangıcı"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Sayfa boyutu (boşsa tümü)"),
+    fields: Optional[str] = Query(None, description="Virgülle ayrılmış alanlar (ör: symbol,base_asset)"),
+    base_asset: Optional[str] = Query(None, max_length=20, description="Base asset filtresi (ör: BTC)"),
+    quote_asset: Optional[str] = Query(None, max_length=20, description="Quote asset filtresi (ör: USDT)"),
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db=Depends(get_db),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager)
 ):
     """
     Kullanıcının tercih ettiği marketten sembol listesini döner
+
+    Katalog versiyonundan türetilen ETag ile If-None-Match eşleşirse 304 döner.
+    Yanıt gövdesi önceden serileştirilmiş/sıkıştırılmış byte'lardan (gzip, zstd) sunulur.
+
+    offset/limit, fields, base_asset veya quote_asset verilirse önbellekteki katalogdan
+    filtrelenmiş, sayfalı ve sadece istenen alanları içeren bir sayfa (SymbolsPageResponse) döner.
     """
     try:
         # Kullanıcı tercihlerini çek
-        preferences = UserPreferencesService.get_user_preferences(user.id, db)
-        if not preferences or not preferences.market:
-            raise ValueError("Kullanıcı tercihinde market bulunamadı.")
-        
-        market_id = preferences.market
+        market_id = await get_preferred_market(user, db)
         
         # Sembolleri çek
-        service = SymbolsService()
-        symbols = service.get_symbols(market_id)
-        
-        return SymbolsResponse(
+        service = SymbolsService(market_manager)
+        catalog = await service.get_catalog(market_id)
+        paged = offset or limit is not None or fields or base_asset or quote_asset
+
+        etag = catalog.etag
+        if paged:
+            etag = make_etag([catalog.etag, str(offset), str(limit), fields or "", base_asset or "", quote_asset or ""])
+        headers = cache_headers(etag, catalog.modified_at, catalog.max_age(SYMBOL_CACHE_TTL_SECONDS))
+        if is_not_modified(request, etag, catalog.modified_at):
+            return not_modified_response(headers)
+
+        if paged:
+            page = await service.get_symbols_page(
+                market_id,
+                offset=offset,
+                limit=limit,
+                fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                catalog=catalog
+            )
+            response.headers.update(headers)
+            return SymbolsPageResponse(timestamp=int(time.time() * 1000), **page)
+
+        # Gövde katalog versiyonu başına bir kez serileştirilip sıkıştırılır;
+        # istek başına sadece güncel timestamp eklenir
+        payload = catalog.encoded_response
+        encoding = payload.select_encoding(request.headers.get("accept-encoding"))
+        headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        content = payload.render(b'"timestamp":%d}' % int(time.time() * 1000), encoding)
+        return Response(content=content, media_type="application/json", headers=headers)
+    except HTTPException:
+        raise
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+
+@router.get("/search", response_model=SymbolSearchResponse)
+async def search_symbols(
+    q: str = Query(..., min_length=1, max_length=30, description="Sembol veya base asset (ör: BTC, ETHU)"),
+    market: Optional[str] = Query(None, description="Market id (boşsa kullanıcı tercihi)"),
+    limit: int = Query(20, ge=1, le=100, description="En fazla sonuç sayısı"),
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    db=Depends(get_db),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager)
+):
+    """
+    Market kataloğunda sıralı sembol araması yapar (autocomplete)
+
+    Sıralama: birebir eşleşme > base asset öneki > sembol öneki > bulanık eşleşme
+    """
+    try:
+        market_id = market or await get_preferred_market(user, db)
+
+        service = SymbolsService(market_manager)
+        results = await service.search_symbols(market_id, q, limit)
+
+        return SymbolSearchResponse(
             timestamp=int(time.time() * 1000),
-            symbols=symbols,
-            count=len(symbols)
+            market=market_id,
+            query=q,
+            results=results,
+            count=len(results)
+        )
+    except HTTPException:
+        raise
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)}
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
+
+
+@router.get("/cache/stats")
+async def get_symbols_cache_stats(
+    user: AuthPrincipal = Depends(verify_api_key_and_session),
+    market_manager: MarketAPIServiceManager = Depends(get_market_manager)
+):
+    """
+    Sembol katalog önbelleğinin market bazlı hit/miss/yenileme yaşı sayaçlarını
+    ve upstream çağrı birleştirme sayaçlarını döner
+    """
+    service = SymbolsService(market_manager)
+    return {
+        "timestamp": int(time.time() * 1000),
+        "markets": service.get_cache_stats(),
+        "single_flight": service.get_single_flight_stats()
+    }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 from services.user_preferences_service import UserPreferencesService
 from services.auth_service import AuthService
@@ -11,13 +11,13 @@ from models.user_preferences_models import (
 router = APIRouter(prefix="/preferences", tags=["User Preferences"])
 
 
-def verify_session_from_cookie(request: Request, db: Session):
+async def verify_session_from_cookie(request: Request, db: AsyncSession):
     """Cookie'den session token'ı doğrula"""
     session_token = request.cookies.get("session_token")
     if not session_token:
         from fastapi import HTTPException
         raise HTTPException(status_code=401, detail="Session token gerekli")
-    user, session = AuthService.verify_session(db, session_token)
+    user = await AuthService.authenticate_session(db, session_token)
     if not user:
         from fastapi import HTTPException
         raise HTTPException(status_code=401, detail="Geçersiz oturum")
@@ -27,7 +27,7 @@ def verify_session_from_cookie(request: Request, db: Session):
 @router.get("/", response_model=UserPreferencesResponse)
 async def get_my_preferences(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kullanıcının tercihlerini getir
@@ -37,10 +37,10 @@ async def get_my_preferences(
     - **theme**: Tema (dark veya light)
     """
     # Session doğrula
-    user = verify_session_from_cookie(request, db)
+    user = await verify_session_from_cookie(request, db)
     
     # Tercihleri getir veya yoksa oluştur
-    preferences = UserPreferencesService.get_or_create_preferences(user.id, db)
+    preferences = await UserPreferencesService.get_or_create_preferences(user.id, db)
     
     return preferences
 
@@ -49,7 +49,7 @@ async def get_my_preferences(
 async def update_my_preferences(
     preferences_data: UserPreferencesUpdate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kullanıcı tercihlerini güncelle
@@ -68,10 +68,10 @@ async def update_my_preferences(
     - **theme**: Tema (dark veya light)
     """
     # Session doğrula
-    user = verify_session_from_cookie(request, db)
+    user = await verify_session_from_cookie(request, db)
     
     # Tercihleri güncelle
-    updated_preferences = UserPreferencesService.update_preferences(
+    updated_preferences = await UserPreferencesService.update_preferences(
         user_id=user.id,
         preferences_data=preferences_data,
         db=db
@@ -83,7 +83,7 @@ async def update_my_preferences(
 @router.post("/reset", response_model=UserPreferencesResponse, status_code=status.HTTP_200_OK)
 async def reset_preferences(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Tercihleri varsayılanlara sıfırla
@@ -94,13 +94,13 @@ async def reset_preferences(
     - **theme**: dark
     """
     # Session doğrula
-    user = verify_session_from_cookie(request, db)
+    user = await verify_session_from_cookie(request, db)
     
     # Mevcut tercihleri sil
-    UserPreferencesService.delete_preferences(user.id, db)
+    await UserPreferencesService.delete_preferences(user.id, db)
     
     # Yeni varsayılan tercihler oluştur
-    new_preferences = UserPreferencesService.create_default_preferences(user.id, db)
+    new_preferences = await UserPreferencesService.create_default_preferences(user.id, db)
     
     return new_preferences
 
@@ -108,7 +108,7 @@ async def reset_preferences(
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_my_preferences(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kullanıcı tercihlerini sil
@@ -116,10 +116,10 @@ async def delete_my_preferences(
     ⚠️ Dikkat: Tercihler tamamen silinecektir!
     """
     # Session doğrula
-    user = verify_session_from_cookie(request, db)
+    user = await verify_session_from_cookie(request, db)
     
     # Tercihleri sil
-    success = UserPreferencesService.delete_preferences(user.id, db)
+    success = await UserPreferencesService.delete_preferences(user.id, db)
     
     if not success:
         from fastapi import HTTPException
@@ -0,0 +1,149 @@
+"""
+Auth Cache - API key / session token -> AuthPrincipal süreç içi önbelleği
+
+Tekrarlayan istemcilerde kimlik doğrulama veritabanına gitmez. Önbellek LRU ile sınırlıdır;
+kayıtlar TTL sonunda (session kayıtlarında en geç oturum bitişinde) düşer. API key yenileme,
+logout / invalidate_session ve kullanıcı devre dışı bırakma kaydı açıkça siler. Önbellek süreç
+içidir: başka bir worker'daki değişiklik bu süreçte en geç TTL kadar gecikmeyle görülür.
+
+Silme ile eşzamanlı doğrulama yarışı generation sayacıyla önlenir: çağıran veritabanı
+sorgusundan önce generation() alır ve put()'a verir; arada aynı token veya kullanıcı için
+silme yapıldıysa eski veriyle üretilmiş kimlik önbelleğe yazılmaz.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+from core.config import AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_ENTRIES
+from models.auth_models import AuthPrincipal
+
+API_KEY = "api_key"
+SESSION_TOKEN = "session"
+
+CacheKey = Tuple[str, str]  # (API_KEY | SESSION_TOKEN, token)
+
+
+class AuthCache:
+    """Token -> AuthPrincipal LRU/TTL önbelleği (thread-safe)"""
+
+    def __init__(self, ttl_seconds: float = AUTH_CACHE_TTL_SECONDS,
+                 max_entries: int = AUTH_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[AuthPrincipal, float]]" = OrderedDict()
+        # Kullanıcı devre dışı bırakıldığında tüm token'larını silebilmek için
+        self._by_user: Dict[int, Set[CacheKey]] = {}
+        # Her silmede artan sayaç ve son silinen token / kullanıcıların silindikleri generation
+        self._generation = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        # Budanan silme kayıtlarının en yenisi; bundan eski generation'la gelen put'lar atlanır
+        self._horizon = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, kind: str, token: str) -> Optional[AuthPrincipal]:
+        """Geçerli kaydı döner; yoksa, süresi dolmuşsa veya oturum bitmişse None"""
+        key = (kind, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic() or (
+                principal.session_expires_at is not None and principal.session_expires_at < datetime.utcnow()
+            ):
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def generation(self) -> int:
+        """Veritabanı doğrulamasından önce alınıp put()'a verilecek silme sayacı"""
+        return self._generation
+
+    def put(self, kind: str, token: str, principal: AuthPrincipal,
+            generation: Optional[int] = None) -> AuthPrincipal:
+        """
+        Doğrulanmış kimliği önbelleğe yazar; doluysa en az kullanılan kayıt düşer
+        generation verilirse ve o andan beri token veya kullanıcı silindiyse yazılmaz
+        """
+        if not self.enabled:
+            return principal
+        key = (kind, token)
+        ttl = self.ttl_seconds
+        if principal.session_expires_at is not None:
+            ttl = min(ttl, (principal.session_expires_at - datetime.utcnow()).total_seconds())
+            if ttl <= 0:
+                return principal
+        with self._lock:
+            if generation is not None and self._is_stale(key, principal.id, generation):
+                return principal
+            self._remove(key)
+            self._entries[key] = (principal, time.monotonic() + ttl)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return principal
+
+    def invalidate(self, kind: str, token: str) -> None:
+        with self._lock:
+            self._mark_invalidated((kind, token))
+            self._remove((kind, token))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Kullanıcının önbellekteki tüm API key ve session kayıtlarını siler"""
+        with self._lock:
+            self._mark_invalidated(("user", user_id))
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._horizon = self._generation
+            self._invalidated.clear()
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _mark_invalidated(self, target: Hashable) -> None:
+        """Silmeyi kaydeder; kayıtlar max_entries ile sınırlıdır, budananlar horizon'u ilerletir"""
+        self._generation += 1
+        self._invalidated[target] = self._generation
+        self._invalidated.move_to_end(target)
+        while len(self._invalidated) > max(self.max_entries, 1):
+            _, pruned = self._invalidated.popitem(last=False)
+            self._horizon = pruned
+
+    def _is_stale(self, key: CacheKey, user_id: int, generation: int) -> bool:
+        return (
+            generation < self._horizon
+            or self._invalidated.get(key, 0) > generation
+            or self._invalidated.get(("user", user_id), 0) > generation
+        )
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._by_user.get(entry[0].id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._by_user[entry[0].id]
+
+
+# Süreç genelinde paylaşılan önbellek (AuthService statik metodları tarafından kullanılır)
+auth_cache = AuthCache()
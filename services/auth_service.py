@@ -2,9 +2,15 @@ import secrets
 import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-from models.auth_models import UserDB, SessionDB, UserCreate, UserLogin
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.auth_models import UserDB, SessionDB, UserCreate, UserLogin, AuthPrincipal
 from fastapi import HTTPException, status
+from services.auth_cache import auth_cache, API_KEY, SESSION_TOKEN
+from services.session_tokens import (
+    SessionClaims, signed_sessions_enabled, is_signed_token, sign_session_token,
+    decode_session_token, verify_session_token, session_revocations, to_epoch
+)
 
 
 class AuthService:
@@ -41,15 +47,17 @@ class AuthService:
         return AuthService.hash_password(plain_password) == hashed_password
     
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> UserDB:
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> UserDB:
         """
         Yeni kullanıcı oluşturur ve varsayılan tercihleri ayarlar
         """
         # Kullanıcı adı kontrolü
-        existing_user = db.query(UserDB).filter(
-            (UserDB.username == user_data.username) | 
-            (UserDB.email == user_data.email)
-        ).first()
+        existing_user = (await db.execute(
+            select(UserDB).where(
+                (UserDB.username == user_data.username) | 
+                (UserDB.email == user_data.email)
+            )
+        )).scalars().first()
         
         if existing_user:
             if existing_user.username == user_data.username:
@@ -73,21 +81,23 @@ class AuthService:
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         
         # Varsayılan kullanıcı tercihlerini oluştur
         from services.user_preferences_service import UserPreferencesService
-        UserPreferencesService.create_default_preferences(new_user.id, db)
+        await UserPreferencesService.create_default_preferences(new_user.id, db)
         
         return new_user
     
     @staticmethod
-    def authenticate_user(db: Session, login_data: UserLogin) -> Optional[UserDB]:
+    async def authenticate_user(db: AsyncSession, login_data: UserLogin) -> Optional[UserDB]:
         """
         Kullanıcı kimlik doğrulaması yapar
         """
-        user = db.query(UserDB).filter(UserDB.username == login_data.username).first()
+        user = (await db.execute(
+            select(UserDB).where(UserDB.username == login_data.username)
+        )).scalars().first()
         
         if not user:
             return None
@@ -103,13 +113,13 @@ class AuthService:
         
         # Son giriş zamanını güncelle
         user.last_login = datetime.utcnow()
-        db.commit()
+        await db.commit()
         
         return user
     
     @staticmethod
-    def create_session(
-        db: Session, 
+    async def create_session(
+        db: AsyncSession, 
         user: UserDB, 
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
@@ -117,6 +127,7 @@ class AuthService:
     ) -> SessionDB:
         """
         Kullanıcı için yeni oturum oluşturur
+        signed modunda token, session id'si alındıktan sonra aynı transaction içinde imzalanır
         """
         session = SessionDB(
             user_id=user.id,
@@ -129,32 +140,44 @@ class AuthService:
         )
         
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        if signed_sessions_enabled():
+            await db.flush()
+            session.session_token = sign_session_token(SessionClaims(
+                session_id=session.id,
+                user_id=user.id,
+                username=user.username,
+                expires_at=to_epoch(session.expires_at)
+            ))
+        await db.commit()
+        await db.refresh(session)
         
         return session
     
     @staticmethod
-    def verify_api_key(db: Session, api_key: str) -> Optional[UserDB]:
+    async def verify_api_key(db: AsyncSession, api_key: str) -> Optional[UserDB]:
         """
         API key'i doğrular ve kullanıcıyı döner
         """
-        user = db.query(UserDB).filter(
-            UserDB.api_key == api_key,
-            UserDB.is_active == True
-        ).first()
+        user = (await db.execute(
+            select(UserDB).where(
+                UserDB.api_key == api_key,
+                UserDB.is_active == True
+            )
+        )).scalars().first()
         
         return user
     
     @staticmethod
-    def verify_session(db: Session, session_token: str) -> Tuple[Optional[UserDB], Optional[SessionDB]]:
+    async def verify_session(db: AsyncSession, session_token: str) -> Tuple[Optional[UserDB], Optional[SessionDB]]:
         """
         Session token'ı doğrular
         """
-        session = db.query(SessionDB).filter(
-            SessionDB.session_token == session_token,
-            SessionDB.is_active == True
-        ).first()
+        session = (await db.execute(
+            select(SessionDB).where(
+                SessionDB.session_token == session_token,
+                SessionDB.is_active == True
+            )
+        )).scalars().first()
         
         if not session:
             return None, None
@@ -162,11 +185,11 @@ class AuthService:
         # Session süresi dolmuş mu kontrol et
         if session.expires_at < datetime.utcnow():
             session.is_active = False
-            db.commit()
+            await db.commit()
             return None, None
         
         # Kullanıcıyı getir
-        user = db.query(UserDB).filter(UserDB.id == session.user_id).first()
+        user = await db.get(UserDB, session.user_id)
         
         if not user or not user.is_active:
             return None, None
@@ -174,26 +197,83 @@ class AuthService:
         return user, session
     
     @staticmethod
-    def verify_api_key_and_session(
-        db: Session, 
+    def principal_from_user(user: UserDB, session: Optional[SessionDB] = None) -> AuthPrincipal:
+        """
+        Kullanıcı kaydından önbelleğe alınabilir hafif kimlik özeti üretir
+        """
+        return AuthPrincipal(
+            id=user.id,
+            username=user.username,
+            is_active=user.is_active,
+            session_expires_at=session.expires_at if session else None
+        )
+    
+    @staticmethod
+    async def authenticate_api_key(db: AsyncSession, api_key: str) -> Optional[AuthPrincipal]:
+        """
+        API key'i önce önbellekte, yoksa veritabanında doğrular
+        """
+        principal = auth_cache.get(API_KEY, api_key)
+        if principal:
+            return principal
+        
+        # Sorgu sürerken key yenilenir / kullanıcı devre dışı bırakılırsa eski kimlik önbelleğe yazılmaz
+        generation = auth_cache.generation()
+        user = await AuthService.verify_api_key(db, api_key)
+        if not user:
+            return None
+        return auth_cache.put(API_KEY, api_key, AuthService.principal_from_user(user), generation)
+    
+    @staticmethod
+    async def authenticate_session(db: AsyncSession, session_token: str) -> Optional[AuthPrincipal]:
+        """
+        Session token'ı doğrular
+        signed modunda imzalı token I/O'suz doğrulanır; aksi halde önce önbellek, sonra veritabanı
+        """
+        if signed_sessions_enabled() and is_signed_token(session_token):
+            claims = verify_session_token(session_token)
+            if not claims:
+                return None
+            return AuthPrincipal(
+                id=claims.user_id,
+                username=claims.username,
+                is_active=True,
+                session_expires_at=claims.expires_at_datetime
+            )
+        
+        principal = auth_cache.get(SESSION_TOKEN, session_token)
+        if principal:
+            return principal
+        
+        generation = auth_cache.generation()
+        user, session = await AuthService.verify_session(db, session_token)
+        if not user:
+            return None
+        return auth_cache.put(
+            SESSION_TOKEN, session_token, AuthService.principal_from_user(user, session), generation
+        )
+    
+    @staticmethod
+    async def verify_api_key_and_session(
+        db: AsyncSession, 
         api_key: Optional[str] = None,
         session_token: Optional[str] = None
-    ) -> UserDB:
+    ) -> AuthPrincipal:
         """
         API key VE session token'ı birlikte doğrular
         En az birinin geçerli olması yeterlidir
         """
         # Önce API key kontrolü
         if api_key:
-            user = AuthService.verify_api_key(db, api_key)
-            if user:
-                return user
+            principal = await AuthService.authenticate_api_key(db, api_key)
+            if principal:
+                return principal
         
         # Sonra session token kontrolü
         if session_token:
-            user, session = AuthService.verify_session(db, session_token)
-            if user:
-                return user
+            principal = await AuthService.authenticate_session(db, session_token)
+            if principal:
+                return principal
         
         # Her ikisi de geçersiz
         raise HTTPException(
@@ -203,24 +283,89 @@ class AuthService:
         )
     
     @staticmethod
-    def invalidate_session(db: Session, session_token: str) -> bool:
+    async def invalidate_session(db: AsyncSession, session_token: str) -> bool:
         """
         Oturumu sonlandırır (logout)
         """
-        session = db.query(SessionDB).filter(
-            SessionDB.session_token == session_token
-        ).first()
+        session = (await db.execute(
+            select(SessionDB).where(SessionDB.session_token == session_token)
+        )).scalars().first()
         
         if session:
             session.is_active = False
-            db.commit()
+            await db.commit()
+            # Commit'ten sonra: arada eski satırı okuyan doğrulamalar önbelleğe yazamaz
+            auth_cache.invalidate(SESSION_TOKEN, session_token)
+            if is_signed_token(session_token):
+                session_revocations.revoke(session.id, to_epoch(session.expires_at))
             return True
         
+        auth_cache.invalidate(SESSION_TOKEN, session_token)
+        # Tabloda olmayan ama imzası geçerli token (ör: silinmiş satır) yine de iptal edilir
+        claims = decode_session_token(session_token) if is_signed_token(session_token) else None
+        if claims:
+            session_revocations.revoke(claims.session_id, claims.expires_at)
+        
         return False
     
     @staticmethod
-    def get_user_by_api_key(db: Session, api_key: str) -> Optional[UserDB]:
+    async def get_user(db: AsyncSession, user_id: int) -> Optional[UserDB]:
+        """
+        Kullanıcının tam kaydını id ile getirir
+        """
+        return await db.get(UserDB, user_id)
+    
+    @staticmethod
+    async def refresh_api_key(db: AsyncSession, user_id: int) -> Optional[UserDB]:
+        """
+        Kullanıcıya yeni API key oluşturur; eski key önbellekten de silinir
+        """
+        user = await AuthService.get_user(db, user_id)
+        if not user:
+            return None
+        
+        old_api_key = user.api_key
+        user.api_key = AuthService.generate_api_key()
+        await db.commit()
+        await db.refresh(user)
+        
+        auth_cache.invalidate(API_KEY, old_api_key)
+        return user
+    
+    @staticmethod
+    async def set_user_active(db: AsyncSession, user_id: int, is_active: bool) -> Optional[UserDB]:
+        """
+        Kullanıcı hesabını etkinleştirir / devre dışı bırakır
+        Önbellekteki tüm API key ve session kayıtları silinir; signed modunda imzalı token'lar
+        kullanıcı durumunu taşımadığı için açık oturumlar sonlandırılıp iptal listesine eklenir
+        """
+        user = await AuthService.get_user(db, user_id)
+        if not user:
+            return None
+        
+        user.is_active = is_active
+        revoked = []
+        if not is_active and signed_sessions_enabled():
+            revoked = (await db.execute(
+                select(SessionDB).where(
+                    SessionDB.user_id == user_id,
+                    SessionDB.is_active == True
+                )
+            )).scalars().all()
+            for session in revoked:
+                session.is_active = False
+        await db.commit()
+        session_revocations.revoke_many(revoked)
+        await db.refresh(user)
+        
+        auth_cache.invalidate_user(user_id)
+        return user
+    
+    @staticmethod
+    async def get_user_by_api_key(db: AsyncSession, api_key: str) -> Optional[UserDB]:
         """
         API key ile kullanıcıyı getirir
         """
-        return db.query(UserDB).filter(UserDB.api_key == api_key).first()
\ No newline at end of file
+        return (await db.execute(
+            select(UserDB).where(UserDB.api_key == api_key)
+        )).scalars().first()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Candle Backfill Service - Uzun geçmiş aralıklarını eşzamanlı sayfalarla mum deposuna yükler
+
+İstenen aralığın depoda olmayan kısımları upstream sayfa boyutunda (Binance: 1000 mum)
+parçalara bölünür. Sayfalar, market rate limit bütçesi altında sınırlı eşzamanlılıkla çekilir
+ve sırayla, büyük gruplar halinde depoya yazılır. Her grup yazıldıktan sonra coverage
+ilerletilir; çöken veya iptal edilen bir backfill tekrar başlatıldığında kaldığı yerden devam eder.
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from core.config import CANDLE_BACKFILL_CONCURRENCY, CANDLE_BACKFILL_BATCH_PAGES
+from services.candle_store.candle_store import CandleStore, CandleKey, TimeRange, merge_ranges
+from services.candle_store.columns import (
+    CandleColumns, closed_mask, column_count, concat_columns, filter_columns
+)
+from services.candle_store.intervals import interval_to_ms, align_open_time
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.rate_limiter import RateLimitExceeded
+
+# Upstream'den sayfa başına çekilecek mum sayısı (Binance üst sınırı)
+BACKFILL_PAGE_LIMIT = 1000
+
+# Rate limit dışındaki hatalarda sayfa başına en fazla deneme
+BACKFILL_MAX_ATTEMPTS = 3
+
+# Bellekte tutulan en fazla job kaydı (bitenler en eskiden silinir)
+MAX_TRACKED_JOBS = 100
+
+
+class BackfillJob:
+    """Tek bir backfill işinin durumu ve ilerlemesi"""
+
+    def __init__(self, key: CandleKey, start_time: int, end_time: int):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.start_time = start_time
+        self.end_time = end_time
+        self.status = "pending"          # pending, running, completed, failed, cancelled
+        self.error: Optional[str] = None
+        self.pages_total = 0
+        self.pages_done = 0
+        self.candles_written = 0
+        self.rate_limit_waits = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def progress(self) -> dict:
+        """İlerleme ve hız bilgisini döner"""
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        pages_per_second = self.pages_done / elapsed if elapsed > 0 else 0.0
+        remaining = self.pages_total - self.pages_done
+        return {
+            "job_id": self.id,
+            "market": self.key.market,
+            "symbol": self.key.symbol,
+            "interval": self.key.interval,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "status": self.status,
+            "error": self.error,
+            "pages_total": self.pages_total,
+            "pages_done": self.pages_done,
+            "candles_written": self.candles_written,
+            "percent": round(100.0 * self.pages_done / self.pages_total, 2) if self.pages_total else 100.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "candles_per_second": round(self.candles_written / elapsed, 1) if elapsed > 0 else 0.0,
+            "pages_per_second": round(pages_per_second, 2),
+            "eta_seconds": round(remaining / pages_per_second, 1) if pages_per_second > 0 and self.is_active else None,
+            "rate_limit_waits": self.rate_limit_waits,
+        }
+
+
+def split_pages(ranges: List[TimeRange], step: int, page_limit: int) -> List[TimeRange]:
+    """Eksik aralıkları, her biri en fazla page_limit mum içeren sayfalara böler"""
+    span = step * page_limit
+    pages = []
+    for start, end in ranges:
+        cursor = start
+        while cursor <= end:
+            pages.append((cursor, min(end, cursor + span - 1)))
+            cursor += span
+    return pages
+
+
+class CandleBackfillEngine:
+    """Backfill job'larını başlatan, takip eden ve iptal eden motor"""
+
+    def __init__(
+        self,
+        market_manager: MarketAPIServiceManager,
+        candle_store: CandleStore,
+        concurrency: int = CANDLE_BACKFILL_CONCURRENCY,
+        batch_pages: int = CANDLE_BACKFILL_BATCH_PAGES
+    ):
+        self.market_manager = market_manager
+        self.candle_store = candle_store
+        self.concurrency = max(1, concurrency)
+        self.batch_pages = max(1, batch_pages)
+        self._jobs: "OrderedDict[str, BackfillJob]" = OrderedDict()
+
+    def start(self, market_id: str, symbol: str, interval: str, start_time: int,
+              end_time: Optional[int] = None) -> BackfillJob:
+        """
+        Backfill job'ı başlatır; aynı seri için çalışan bir job varsa onu döner
+
+        Raises:
+            ValueError: Geçersiz interval veya aralık
+        """
+        step = interval_to_ms(interval)
+        now = int(time.time() * 1000)
+        # Açık mum depolanmaz; aralık son kapanmış mumda biter
+        last_closed = align_open_time(now, interval) - 1
+        end = last_closed if end_time is None else min(end_time, last_closed)
+        if start_time > end:
+            raise ValueError("start_time, end_time'dan (veya son kapanmış mumdan) büyük olamaz")
+
+        key = CandleKey(market_id, symbol.upper().strip(), interval)
+        for job in self._jobs.values():
+            if job.key == key and job.is_active:
+                return job
+
+        job = BackfillJob(key, align_open_time(start_time, interval), end)
+        self._track(job)
+        job.task = asyncio.create_task(self._run(job, step))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[BackfillJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[BackfillJob]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[BackfillJob]:
+        """Çalışan job'ı iptal eder; yazılmış gruplar depoda kalır"""
+        job = self._jobs.get(job_id)
+        if job is not None and job.task is not None and not job.task.done():
+            job.task.cancel()
+        return job
+
+    async def shutdown(self) -> None:
+        """Çalışan tüm job'ları iptal edip bitmelerini bekler"""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _track(self, job: BackfillJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_TRACKED_JOBS:
+            oldest = next((job_id for job_id, j in self._jobs.items() if not j.is_active), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    async def _run(self, job: BackfillJob, step: int) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            # Daha önce yazılmış (coverage) aralıklar atlanır - kaldığı yerden devam
+            missing = self.candle_store.missing_ranges(job.key, job.start_time, job.end_time)
+            pages = split_pages(missing, step, BACKFILL_PAGE_LIMIT)
+            job.pages_total = len(pages)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            for i in range(0, len(pages), self.batch_pages):
+                batch = pages[i:i + self.batch_pages]
+                results = await self._fetch_batch(job, batch, semaphore)
+                # Depo yazımı event loop'u bloklamamak için thread'de yapılır
+                job.candles_written += await asyncio.to_thread(self._write_batch, job, batch, results)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+
+    async def _fetch_batch(self, job: BackfillJob, batch: List[TimeRange],
+                           semaphore: asyncio.Semaphore) -> List[CandleColumns]:
+        """Gruptaki sayfaları eşzamanlı çeker; bir sayfa başarısız olursa kalan sayfalar iptal edilir"""
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(self._fetch_page(job, page, semaphore)) for page in batch]
+        except BaseExceptionGroup as errors:
+            # Job hatası olarak ilk sayfa hatası raporlanır
+            raise errors.exceptions[0]
+        return [task.result() for task in tasks]
+
+    async def _fetch_page(self, job: BackfillJob, page: TimeRange, semaphore: asyncio.Semaphore) -> CandleColumns:
+        """Tek sayfayı çeker; rate limit reddinde bütçe açılana kadar bekleyip tekrar dener"""
+        attempts = 0
+        async with semaphore:
+            while True:
+                try:
+                    columns = await self.market_manager.get_historical_candle_columns(
+                        job.key.market, job.key.symbol, job.key.interval, page[0], page[1], BACKFILL_PAGE_LIMIT
+                    )
+                    job.pages_done += 1
+                    return columns
+                except RateLimitExceeded as e:
+                    job.rate_limit_waits += 1
+                    await asyncio.sleep(e.retry_after)
+                except ValueError:
+                    raise
+                except Exception:
+                    attempts += 1
+                    if attempts >= BACKFILL_MAX_ATTEMPTS:
+                        raise
+                    await asyncio.sleep(2 ** attempts)
+
+    def _write_batch(self, job: BackfillJob, batch: List[TimeRange], results: List[CandleColumns]) -> int:
+        """Sıralı sayfaları tek yazmada depoya ekler, coverage'ı ilerletir ve yazılan mum sayısını döner"""
+        now = int(time.time() * 1000)
+        columns = concat_columns([
+            filter_columns(page_columns, closed_mask(page_columns, now) & (page_columns["open_time"] <= page[1]))
+            for page, page_columns in zip(batch, results)
+        ])
+        if column_count(columns):
+            self.candle_store.write_columns(job.key, columns)
+        self.candle_store.add_coverage_many(job.key, merge_ranges(batch))
+        return column_count(columns)
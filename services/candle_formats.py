@@ -0,0 +1,201 @@
+"""
+Candle Formats - Mum yanıtlarının alternatif çıktı biçimleri
+
+- columnar: Alan başına tek JSON dizisi ({"columns": {"open_time": [...], "close": [...]}})
+- csv:      Başlık satırı + mum başına bir satır (indikatörler ek kolonlar)
+- binary:   Küçük bir başlık + alan başına ham little-endian NumPy tamponları
+
+Binary düzeni:
+
+    0   4 byte   b"CNDL"
+    4   1 byte   versiyon (1)
+    5   3 byte   ayrılmış (0)
+    8   4 byte   başlık uzunluğu (uint32, little-endian)
+    12  N byte   UTF-8 JSON başlık: meta + count + columns/indicators [{name, dtype, offset, nbytes}]
+        ...      8 byte hizasına dolgu
+        ...      veri bölümü; offset'ler veri bölümünün başına göredir, her kolon 8 byte hizalı
+
+İstemci: data_start = align8(12 + N); np.frombuffer(body, dtype, count, data_start + offset)
+Kolon tamponları depodaki dizilerden (memmap görünümleri) kopyalanmadan yanıta yazılır.
+
+Akış biçimleri (/candles/stream) mum bloklarını geldikçe kodlar:
+
+- ndjson: Mum başına bir JSON nesnesi + '\n' (indikatörler aynı nesnede ek alanlar)
+- csv:    İlk blokta başlık, ardından her blok için satırlar
+"""
+import csv
+import io
+import json
+import struct
+from typing import AsyncIterator, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+import pydantic_core
+
+from services.candle_store.columns import CANDLE_COLUMNS, CandleColumns, MISSING_TRADES, parts_count
+
+CANDLE_FORMATS = ("json", "columnar", "csv", "binary")
+STREAM_FORMATS = ("ndjson", "csv")
+
+BINARY_MAGIC = b"CNDL"
+BINARY_VERSION = 1
+BINARY_MEDIA_TYPE = "application/octet-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# CSV satırları bu büyüklükte gruplar halinde üretilir
+CSV_CHUNK_ROWS = 5000
+
+Chunk = Union[bytes, memoryview]
+CandleChunks = AsyncIterator[Tuple[CandleColumns, Dict[str, np.ndarray]]]
+
+_COLUMN_NAMES = [name for name, _ in CANDLE_COLUMNS]
+
+
+def _column_list(name: str, column: np.ndarray) -> list:
+    values = column.tolist()
+    if name == "number_of_trades":
+        return [None if v == MISSING_TRADES else v for v in values]
+    return values
+
+
+def encode_columnar(meta: dict, columns: CandleColumns, indicators: Dict[str, np.ndarray]) -> bytes:
+    """Kolon bazlı JSON gövdesi (alan adları mum başına değil, bir kez yazılır)"""
+    body = dict(meta)
+    body["count"] = len(columns["open_time"])
+    body["columns"] = {name: _column_list(name, columns[name]) for name, _ in CANDLE_COLUMNS}
+    if indicators:
+        body["indicators"] = {key: values.tolist() for key, values in indicators.items()}
+    return pydantic_core.to_json(body, inf_nan_mode="null")
+
+
+class _CSVEncoder:
+    """Satırları yeniden kullanılan bir tampon üzerinden CSV byte'larına çevirir"""
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+
+    def _flush(self) -> bytes:
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def header(self, indicator_keys: List[str]) -> bytes:
+        self.writer.writerow(_COLUMN_NAMES + indicator_keys)
+        return self._flush()
+
+    def rows(self, columns: CandleColumns, indicators: List[np.ndarray]) -> bytes:
+        """Mum kolonları ve aynı uzunluktaki indikatör dizilerinden satırlar (NaN boş hücre)"""
+        fields = [_column_list(name, columns[name]) for name in _COLUMN_NAMES]
+        fields += [["" if v != v else v for v in values.tolist()] for values in indicators]
+        self.writer.writerows(zip(*fields))
+        return self._flush()
+
+
+def iter_csv(parts: List[CandleColumns], indicators: Dict[str, np.ndarray],
+             chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[bytes]:
+    """CSV gövdesini başlık ve satır grupları halinde üretir (indikatörler ek kolonlar, NaN boş)"""
+    encoder = _CSVEncoder()
+    yield encoder.header(list(indicators))
+
+    offset = 0
+    for part in parts:
+        count = len(part["open_time"])
+        for lo in range(0, count, chunk_rows):
+            hi = min(count, lo + chunk_rows)
+            yield encoder.rows(
+                {name: part[name][lo:hi] for name in _COLUMN_NAMES},
+                [values[offset + lo:offset + hi] for values in indicators.values()]
+            )
+        offset += count
+
+
+def encode_csv(parts: List[CandleColumns], indicators: Dict[str, np.ndarray]) -> bytes:
+    return b"".join(iter_csv(parts, indicators))
+
+
+async def stream_csv(chunks: CandleChunks, chunk_rows: int = CSV_CHUNK_ROWS) -> AsyncIterator[bytes]:
+    """
+    Mum bloklarını geldikçe CSV'ye çevirir; başlık ilk bloğun indikatör anahtarlarıyla yazılır
+    (blok yoksa sadece mum kolonlarının başlığı)
+    """
+    encoder = _CSVEncoder()
+    header_sent = False
+    async for columns, indicators in chunks:
+        if not header_sent:
+            yield encoder.header(list(indicators))
+            header_sent = True
+        count = len(columns["open_time"])
+        for lo in range(0, count, chunk_rows):
+            hi = min(count, lo + chunk_rows)
+            yield encoder.rows(
+                {name: columns[name][lo:hi] for name in _COLUMN_NAMES},
+                [values[lo:hi] for values in indicators.values()]
+            )
+    if not header_sent:
+        yield encoder.header([])
+
+
+async def stream_ndjson(chunks: CandleChunks, chunk_rows: int = CSV_CHUNK_ROWS) -> AsyncIterator[bytes]:
+    """Mum bloklarını geldikçe NDJSON'a çevirir (mum başına bir satır, NaN -> null)"""
+    async for columns, indicators in chunks:
+        names = _COLUMN_NAMES + list(indicators)
+        count = len(columns["open_time"])
+        for lo in range(0, count, chunk_rows):
+            hi = min(count, lo + chunk_rows)
+            fields = [_column_list(name, columns[name][lo:hi]) for name in _COLUMN_NAMES]
+            fields += [values[lo:hi].tolist() for values in indicators.values()]
+            yield b"".join(
+                pydantic_core.to_json(dict(zip(names, row)), inf_nan_mode="null") + b"\n"
+                for row in zip(*fields)
+            )
+
+
+def _little_endian(array: np.ndarray) -> np.ndarray:
+    """Diziyi little-endian ve bitişik hale getirir (zaten öyleyse kopyalamaz)"""
+    return np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+def encode_binary(meta: dict, parts: List[CandleColumns],
+                  indicators: Dict[str, np.ndarray]) -> Tuple[int, List[Chunk]]:
+    """
+    Binary gövdeyi (toplam uzunluk, parça listesi) olarak döner
+    Kolon tamponları parça parça (kopyasız memoryview) eklenir; StreamingResponse ile yazılır
+    """
+    count = parts_count(parts)
+    data: List[Chunk] = []
+    offset = 0
+
+    def add(name: str, dtype: np.dtype, buffers: List[np.ndarray]) -> dict:
+        nonlocal offset
+        nbytes = count * dtype.itemsize
+        entry = {"name": name, "dtype": dtype.str, "offset": offset, "nbytes": nbytes}
+        data.extend(memoryview(buffer).cast("B") for buffer in buffers if len(buffer))
+        pad = _padding(nbytes)
+        if pad:
+            data.append(b"\0" * pad)
+        offset += nbytes + pad
+        return entry
+
+    columns = []
+    for name, dtype in CANDLE_COLUMNS:
+        le_dtype = np.dtype(dtype).newbyteorder("<")
+        columns.append(add(name, le_dtype, [_little_endian(part[name]) for part in parts]))
+    indicator_layout = [
+        add(key, np.dtype("<f8"), [_little_endian(values.astype(np.float64, copy=False))])
+        for key, values in indicators.items()
+    ]
+
+    header = dict(meta)
+    header.update({"count": count, "columns": columns, "indicators": indicator_layout})
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    prefix = (
+        BINARY_MAGIC + struct.pack("<B3xI", BINARY_VERSION, len(header_bytes))
+        + header_bytes + b"\0" * _padding(12 + len(header_bytes))
+    )
+    return len(prefix) + offset, [prefix] + data
@@ -0,0 +1,16 @@
+"""
+Candle Store module - yerel mum deposu ve interval yardımcıları
+"""
+
+from .candle_store import CandleStore, CandleKey
+from .memory_store import MemoryCandleStore
+from .memmap_store import MemmapCandleStore
+from .factory import create_candle_store
+
+__all__ = [
+    'CandleStore',
+    'CandleKey',
+    'MemoryCandleStore',
+    'MemmapCandleStore',
+    'create_candle_store'
+]
@@ -0,0 +1,102 @@
+"""
+Candle Store - (market, symbol, interval) anahtarlı yerel mum deposu arayüzü
+
+Depo, kapanmış mumları ve hangi zaman aralıklarının upstream'den tamamen çekildiğini
+(coverage) tutar. Böylece bir istek sadece eksik aralıkları upstream'den çeker.
+Aralıklar mumların open_time'ı üzerinde, milisaniye cinsinden ve iki uçta kapalıdır.
+"""
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Tuple
+
+from models.candle_models import Candle
+from .columns import CandleColumns, candles_to_columns, columns_to_candles
+
+
+TimeRange = Tuple[int, int]
+
+
+class CandleKey(NamedTuple):
+    """Mum serisinin anahtarı"""
+    market: str     # 'binance'
+    symbol: str     # 'BTCUSDT'
+    interval: str   # '1m'
+
+
+def merge_ranges(ranges: List[TimeRange]) -> List[TimeRange]:
+    """Çakışan veya bitişik aralıkları birleştirip sıralı döner"""
+    merged: List[TimeRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: int, end: int, covered: List[TimeRange]) -> List[TimeRange]:
+    """[start, end] aralığından kapsanan kısımları çıkarıp eksik aralıkları döner"""
+    missing: List[TimeRange] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start - 1))
+        cursor = max(cursor, c_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+class CandleStore(ABC):
+    """Yerel mum deposu arayüzü"""
+
+    @abstractmethod
+    def read(self, key: CandleKey, start_time: int, end_time: int) -> List[Candle]:
+        """open_time'ı [start_time, end_time] içindeki mumları sıralı döner"""
+        pass
+
+    def read_columns(self, key: CandleKey, start_time: int, end_time: int) -> CandleColumns:
+        """
+        open_time'ı [start_time, end_time] içindeki mumları kolon dizileri olarak döner
+        Kolon bazlı depolar kopyasız görünüm (view) döner; varsayılan uygulama read()'den dönüştürür
+        """
+        return candles_to_columns(self.read(key, start_time, end_time))
+
+    @abstractmethod
+    def write(self, key: CandleKey, candles: List[Candle]) -> None:
+        """Mumları open_time'a göre ekler (aynı open_time varsa üzerine yazar)"""
+        pass
+
+    def write_columns(self, key: CandleKey, columns: CandleColumns) -> None:
+        """Kolon dizilerini yazar; varsayılan uygulama Candle listesine çevirip write()'a verir"""
+        self.write(key, columns_to_candles(columns))
+
+    @abstractmethod
+    def get_coverage(self, key: CandleKey) -> List[TimeRange]:
+        """Upstream'den tamamen çekilmiş aralıkları sıralı döner"""
+        pass
+
+    @abstractmethod
+    def add_coverage(self, key: CandleKey, start_time: int, end_time: int) -> None:
+        """[start_time, end_time] aralığını tamamen çekilmiş olarak işaretler"""
+        pass
+
+    def add_coverage_many(self, key: CandleKey, ranges: List[TimeRange]) -> None:
+        """Birden fazla aralığı işaretler; depolar tek güncellemede yapacak şekilde override edebilir"""
+        for start_time, end_time in ranges:
+            self.add_coverage(key, start_time, end_time)
+
+    def missing_ranges(self, key: CandleKey, start_time: int, end_time: int) -> List[TimeRange]:
+        """[start_time, end_time] içinde henüz upstream'den çekilmemiş aralıkları döner"""
+        if start_time > end_time:
+            return []
+        return subtract_ranges(start_time, end_time, self.get_coverage(key))
+
+    def close(self) -> None:
+        """Depo kaynaklarını serbest bırakır"""
+        pass
@@ -0,0 +1,110 @@
+"""
+Candle kolonları - Mum alanlarının kolon (dizi) bazlı temsili
+
+Her Candle alanı için tek bir bitişik NumPy dizisi tutulur. 'number_of_trades'
+boş olabildiği için -1 ile saklanır; 'ignore' alanı depolanmaz.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from pydantic import TypeAdapter
+
+from models.candle_models import Candle
+
+
+# Alan adı -> kolon tipi (disk üzerindeki sıra ve tip)
+CANDLE_COLUMNS = (
+    ("open_time", np.int64),
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+    ("close_time", np.int64),
+    ("quote_asset_volume", np.float64),
+    ("taker_buy_base_asset_volume", np.float64),
+    ("taker_buy_quote_asset_volume", np.float64),
+    ("number_of_trades", np.int32),
+)
+
+# number_of_trades boşsa kullanılan değer
+MISSING_TRADES = -1
+
+CandleColumns = Dict[str, np.ndarray]
+
+_candle_list_adapter = TypeAdapter(List[Candle])
+
+
+def empty_columns() -> CandleColumns:
+    """Boş kolon kümesi döner"""
+    return {name: np.empty(0, dtype=dtype) for name, dtype in CANDLE_COLUMNS}
+
+
+def candles_to_columns(candles: List[Candle]) -> CandleColumns:
+    """Candle listesini kolon dizilerine çevirir"""
+    count = len(candles)
+    columns = {}
+    for name, dtype in CANDLE_COLUMNS:
+        if name == "number_of_trades":
+            values = (MISSING_TRADES if c.number_of_trades is None else c.number_of_trades for c in candles)
+        else:
+            values = (getattr(c, name) for c in candles)
+        columns[name] = np.fromiter(values, dtype=dtype, count=count)
+    return columns
+
+
+def columns_to_candles(columns: CandleColumns) -> List[Candle]:
+    """Kolon dizilerini Candle listesine çevirir (tek toplu doğrulama çağrısıyla)"""
+    names = [name for name, _ in CANDLE_COLUMNS]
+    rows = [dict(zip(names, row)) for row in zip(*(columns[name].tolist() for name in names))]
+    for row in rows:
+        if row["number_of_trades"] == MISSING_TRADES:
+            row["number_of_trades"] = None
+    return _candle_list_adapter.validate_python(rows)
+
+
+def column_count(columns: CandleColumns) -> int:
+    """Kolon kümesindeki satır (mum) sayısı"""
+    return len(columns["open_time"])
+
+
+def concat_columns(parts: List[CandleColumns]) -> CandleColumns:
+    """Kolon kümelerini sırayla birleştirir"""
+    if not parts:
+        return empty_columns()
+    return {name: np.concatenate([part[name] for part in parts]) for name, _ in CANDLE_COLUMNS}
+
+
+def filter_columns(columns: CandleColumns, mask: np.ndarray) -> CandleColumns:
+    """Maskede True olan satırları döner"""
+    return {name: column[mask] for name, column in columns.items()}
+
+
+def closed_mask(columns: CandleColumns, now_ms: int) -> np.ndarray:
+    """
+    Tüm satırlar için tek bir saat okumasına (now_ms) göre mumun kapanıp kapanmadığını döner
+    (Candle.is_closed ile aynı kural: close_time < now)
+    """
+    return columns["close_time"] < now_ms
+
+
+def parts_count(parts: List[CandleColumns]) -> int:
+    """Parça listesindeki toplam satır sayısı"""
+    return sum(column_count(part) for part in parts)
+
+
+def slice_parts(parts: List[CandleColumns], start: int, stop: int) -> List[CandleColumns]:
+    """
+    Ardışık parçalardan oluşan seriyi [start, stop) satır aralığına kırpar
+    Parçalar kopyalanmaz, dilim (view) döner; boş parçalar atlanır
+    """
+    result = []
+    offset = 0
+    for part in parts:
+        count = column_count(part)
+        lo, hi = max(start - offset, 0), min(stop - offset, count)
+        if lo < hi:
+            result.append(part if (lo, hi) == (0, count) else {name: column[lo:hi] for name, column in part.items()})
+        offset += count
+    return result
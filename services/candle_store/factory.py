@@ -0,0 +1,24 @@
+"""
+Candle store fabrikası - Ayarlara göre mum deposu backend'ini oluşturur
+"""
+from core.config import CANDLE_STORE_BACKEND, CANDLE_STORE_DIR, CANDLE_STORE_MAX_OPEN_SERIES
+from .candle_store import CandleStore
+from .memory_store import MemoryCandleStore
+from .memmap_store import MemmapCandleStore
+
+
+def create_candle_store(backend: str = CANDLE_STORE_BACKEND, root_dir: str = CANDLE_STORE_DIR,
+                        max_open_series: int = CANDLE_STORE_MAX_OPEN_SERIES) -> CandleStore:
+    """
+    Mum deposunu oluşturur
+
+    Args:
+        backend: 'memmap' (diskte kolon bazlı) veya 'memory' (süreç belleği)
+        root_dir: memmap deposunun kök dizini
+        max_open_series: memmap deposunda mmap'leri açık tutulan en fazla seri
+    """
+    if backend == "memmap":
+        return MemmapCandleStore(root_dir, max_open_series)
+    if backend == "memory":
+        return MemoryCandleStore()
+    raise ValueError(f"Desteklenmeyen candle store backend: {backend}")
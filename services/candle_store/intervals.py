@@ -0,0 +1,54 @@
+"""
+Mum aralıkları (interval) - Binance kline interval kodları ve milisaniye karşılıkları
+"""
+from typing import Dict
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+WEEK_MS = 7 * DAY_MS
+
+# Sabit uzunluklu interval'ler; '1M' (takvim ayı) değişken uzunlukta olduğu için yerel
+# depoda tutulmaz, her istekte upstream'den çekilir
+INTERVAL_MS: Dict[str, int] = {
+    "1m": MINUTE_MS,
+    "3m": 3 * MINUTE_MS,
+    "5m": 5 * MINUTE_MS,
+    "15m": 15 * MINUTE_MS,
+    "30m": 30 * MINUTE_MS,
+    "1h": HOUR_MS,
+    "2h": 2 * HOUR_MS,
+    "4h": 4 * HOUR_MS,
+    "6h": 6 * HOUR_MS,
+    "8h": 8 * HOUR_MS,
+    "12h": 12 * HOUR_MS,
+    "1d": DAY_MS,
+    "3d": 3 * DAY_MS,
+    "1w": WEEK_MS,
+}
+
+SUPPORTED_INTERVALS = tuple(INTERVAL_MS.keys()) + ("1M",)
+
+# Unix epoch (1970-01-01) Perşembe'dir; Binance haftalık mumları Pazartesi açılır
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+
+def interval_to_ms(interval: str) -> int:
+    """Interval kodunu milisaniyeye çevirir"""
+    if interval not in INTERVAL_MS:
+        raise ValueError(
+            f"Desteklenmeyen interval: {interval}. Desteklenen: {', '.join(SUPPORTED_INTERVALS)}"
+        )
+    return INTERVAL_MS[interval]
+
+
+def is_storable_interval(interval: str) -> bool:
+    """Interval yerel mum deposunda tutulabilir mi (sabit uzunluklu mu)?"""
+    return interval in INTERVAL_MS
+
+
+def align_open_time(timestamp: int, interval: str) -> int:
+    """Verilen zamanı içeren mumun açılış zamanını döner"""
+    step = interval_to_ms(interval)
+    offset = WEEK_OFFSET_MS if interval == "1w" else 0
+    return timestamp - (timestamp - offset) % step
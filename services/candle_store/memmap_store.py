@@ -0,0 +1,411 @@
+"""
+Memmap Candle Store - Diskte kolon bazlı, numpy.memmap ile açılan mum deposu
+
+Her (market, symbol, interval) serisi kendi dizinindedir ve bir veya daha fazla 'run'dan oluşur:
+
+    <root>/<market>/<symbol>/<interval>/
+        runs/<id>/open_time.bin, open.bin, ... number_of_trades.bin   # Run başına alan dizileri
+        meta.json                                                     # Run listesi, coverage
+
+Run, open_time'a göre sıralı ve tekil satırlardır. Bir run'ın yazılmış satırları [0, count)
+bir daha yerinde değiştirilmez: sona ekleme sadece count'tan sonrasına yazar, sıra dışı veya
+çakışan yazmalar yeni bir run olarak eklenir. Böylece okumaların döndüğü kopyasız dilimler
+(view) sonraki yazmalardan etkilenmez.
+
+Run'lar boyut kademeli (size-tiered) birleştirilir: en yeni run kendinden en fazla
+MERGE_RATIO kat büyük öncekiyle yeni dosyalara birleştirilir (copy-on-write) ve liste tek
+adımda değiştirilir; eski mmap'ler onları tutan okuyucular bırakana kadar geçerli kalır.
+Eski seriye yeni veri eklemek (backfill) böylece satır başına amortize O(log n) yazma yapar.
+
+Aynı open_time birden fazla run'da varsa en yeni run kazanır. meta.json veriler diske
+yazıldıktan sonra güncellenir; yarıda kalan bir yazma meta'da görünmez, artık run dizinleri
+seri açılırken silinir.
+
+Okumalar güncel run listesinin mmap'lerini seri başına kısa bir kilit altında alır; liste
+değiştikten sonra silinen run dosyaları sadece diskten kaldırılır (unlink), açık mmap'ler ve
+onlardan alınmış dilimler geçerli kalır.
+"""
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models.candle_models import Candle
+from .candle_store import CandleStore, CandleKey, TimeRange, merge_ranges
+from .columns import (
+    CANDLE_COLUMNS, CandleColumns, candles_to_columns, columns_to_candles, column_count, empty_columns
+)
+
+
+# Sona ekleme yapılan run'ların başlangıç kapasitesi (satır)
+INITIAL_CAPACITY = 1024
+
+# Bellekte (ve mmap'leri açık) tutulan en fazla seri (varsayılan); her kolon bir dosya tanıtıcısı tutar
+MAX_OPEN_SERIES = 256
+
+# En yeni run, kendinden en fazla bu kat büyük önceki run ile birleştirilir
+MERGE_RATIO = 2
+
+# Dizin adı olarak kullanılacak anahtar parçaları
+_SAFE_PART = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+_RUNS_DIR = "runs"
+
+
+def _slice_columns(count: int, columns: Dict[str, np.memmap], start_time: int, end_time: int) -> CandleColumns:
+    """İlk 'count' satırdan open_time'ı [start_time, end_time] içinde olanların kopyasız dilimleri"""
+    open_times = columns["open_time"][:count]
+    lo = int(np.searchsorted(open_times, start_time, side="left"))
+    hi = int(np.searchsorted(open_times, end_time, side="right"))
+    return {name: column[lo:hi] for name, column in columns.items()}
+
+
+def _merge_parts(parts: List[CandleColumns]) -> CandleColumns:
+    """Eskiden yeniye sıralı parçaları open_time'a göre birleştirir; aynı open_time'da sonraki kazanır"""
+    merged = {name: np.concatenate([part[name] for part in parts]) for name, _ in CANDLE_COLUMNS}
+    order = np.argsort(merged["open_time"], kind="stable")
+    times = merged["open_time"][order]
+    keep = np.append(times[1:] != times[:-1], True)
+    return {name: column[order][keep] for name, column in merged.items()}
+
+
+class _Run:
+    """Sıralı, tekil open_time'lı satırların kolon dosyaları"""
+
+    def __init__(self, path: str, run_id: Optional[int], count: int = 0, capacity: int = 0):
+        self.path = path
+        self.run_id = run_id    # None: eski (tek dosya kümeli) düzen, dosyalar seri dizinindedir
+        self.count = count
+        self.capacity = capacity
+        self._columns: Optional[Dict[str, np.memmap]] = None
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    @property
+    def columns(self) -> Dict[str, np.memmap]:
+        """Kolon mmap'leri (serbest bırakıldıysa yeniden açılır)"""
+        columns = self._columns
+        if columns is None:
+            columns = {
+                name: np.memmap(self._column_path(name), dtype=dtype, mode="r+", shape=(self.capacity,))
+                for name, dtype in CANDLE_COLUMNS
+            }
+            self._columns = columns
+        return columns
+
+    @property
+    def last_time(self) -> int:
+        return int(self.columns["open_time"][self.count - 1])
+
+    def snapshot(self) -> Tuple[int, Dict[str, np.memmap]]:
+        """Okunabilir satır sayısı ve kolon mmap'leri"""
+        # count, kolonlardan önce okunur: büyüme sırasında eski mmap'ler eski kapasiteyi gösterir
+        count = self.count
+        return count, self.columns
+
+    def slice(self, start_time: int, end_time: int) -> CandleColumns:
+        """open_time'ı [start_time, end_time] içindeki satırların kopyasız dilimleri"""
+        count, columns = self.snapshot()
+        return _slice_columns(count, columns, start_time, end_time)
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Kolon dosyalarını en az 'required' satır alacak şekilde büyütür"""
+        if required <= self.capacity:
+            return
+        capacity = max(self.capacity, INITIAL_CAPACITY)
+        while capacity < required:
+            capacity *= 2
+
+        os.makedirs(self.path, exist_ok=True)
+        self.flush()
+        for name, dtype in CANDLE_COLUMNS:
+            with open(self._column_path(name), "ab") as f:
+                f.truncate(capacity * np.dtype(dtype).itemsize)
+        self.capacity = capacity
+        # Eski mmap'ler, onlara dilim tutan okuyucular bırakana kadar geçerli kalır
+        self._columns = None
+
+    def append(self, columns: CandleColumns, exact: bool = False) -> None:
+        """
+        Sıralı, run'ın son satırından sonra başlayan satırları sona ekler
+        exact=True: dosyalar tam satır sayısı kadar ayrılır (birleştirme / sıra dışı yazma run'ları)
+        """
+        n = column_count(columns)
+        if exact and self.capacity == 0:
+            os.makedirs(self.path, exist_ok=True)
+            for name, dtype in CANDLE_COLUMNS:
+                with open(self._column_path(name), "wb") as f:
+                    f.truncate(n * np.dtype(dtype).itemsize)
+            self.capacity = n
+        else:
+            self._ensure_capacity(self.count + n)
+        target = self.columns
+        for name, column in target.items():
+            column[self.count:self.count + n] = columns[name]
+        for column in target.values():
+            column.flush()
+        # Satırlar diske yazıldıktan sonra okuyuculara görünür olur
+        self.count += n
+
+    def flush(self) -> None:
+        if self._columns is not None:
+            for column in self._columns.values():
+                column.flush()
+
+    def release(self) -> None:
+        """mmap'leri bırakır (dilim tutan okuyucular etkilenmez, sonraki erişimde yeniden açılır)"""
+        self.flush()
+        self._columns = None
+
+    def remove(self) -> bool:
+        """
+        Run dosyalarını diskten siler; açık mmap'ler (ve onlardan alınmış dilimler) geçerli kalır
+        Açık mmap'li dosyanın silinemediği platformlarda (Windows) False döner, sonra tekrar denenir
+        """
+        try:
+            for name, _ in CANDLE_COLUMNS:
+                path = self._column_path(name)
+                if os.path.exists(path):
+                    os.remove(path)
+            if self.run_id is not None:
+                os.rmdir(self.path)
+        except OSError:
+            return False
+        return True
+
+    def to_meta(self) -> dict:
+        return {"id": self.run_id, "count": self.count, "capacity": self.capacity}
+
+
+class _ColumnarSeries:
+    """Tek bir serinin run'ları ve meta bilgisi"""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Eskiden yeniye; aynı open_time'da sonraki run kazanır. Liste yerinde değiştirilmez, yenisiyle değiştirilir.
+        self.runs: List[_Run] = []
+        self.coverage: List[TimeRange] = []
+        self.next_run_id = 0
+        # Yazma, birleştirme ve coverage güncellemeleri seriyi kilitler
+        self.write_lock = threading.Lock()
+        # Okumaların run listesinden mmap alması ile listenin değişmesi arasındaki kısa kilit
+        self._runs_lock = threading.Lock()
+        # Seriyi kullanan (okuma / yazma) çağrı sayısı; 0 iken seri bellekten düşürülebilir
+        self.users = 0
+        # Silinemeyen (okuyucusu olan) eski run'lar, sonraki birleştirmede tekrar denenir
+        self._garbage: List[_Run] = []
+
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.coverage = [tuple(r) for r in meta["coverage"]]
+            if "runs" in meta:
+                self.next_run_id = meta["next_run"]
+                self.runs = [
+                    _Run(self._run_path(r["id"]), r["id"], r["count"], r["capacity"]) for r in meta["runs"]
+                ]
+            elif meta["count"] > 0:
+                # Eski düzen: kolon dosyaları doğrudan seri dizininde
+                self.runs = [_Run(path, None, meta["count"], meta["capacity"])]
+        self._remove_orphan_runs()
+
+    def _run_path(self, run_id: int) -> str:
+        return os.path.join(self.path, _RUNS_DIR, str(run_id))
+
+    def _remove_orphan_runs(self) -> None:
+        """meta.json'da olmayan (yarıda kalmış yazma / birleştirme) run dizinlerini siler"""
+        runs_dir = os.path.join(self.path, _RUNS_DIR)
+        if not os.path.isdir(runs_dir):
+            return
+        live = {str(run.run_id) for run in self.runs if run.run_id is not None}
+        for name in os.listdir(runs_dir):
+            if name not in live:
+                shutil.rmtree(os.path.join(runs_dir, name), ignore_errors=True)
+
+    def _new_run(self, columns: CandleColumns) -> _Run:
+        run = _Run(self._run_path(self.next_run_id), self.next_run_id)
+        self.next_run_id += 1
+        run.append(columns, exact=True)
+        return run
+
+    def view(self, start_time: int, end_time: int) -> CandleColumns:
+        """
+        open_time'ı [start_time, end_time] içindeki satırlar
+        Aralık tek bir run'daysa kopyasız dilim, birden fazla run'a yayılıyorsa birleştirilmiş kopya döner
+        """
+        # mmap'ler güncel listeden kilit altında alınır: liste değişip eski run'lar silinse de
+        # alınan mmap'ler geçerli kalır (silinmiş dosya yeniden açılmaya çalışılmaz)
+        with self._runs_lock:
+            snapshots = [run.snapshot() for run in self.runs]
+        parts = [_slice_columns(count, columns, start_time, end_time) for count, columns in snapshots]
+        parts = [part for part in parts if column_count(part)]
+        if not parts:
+            return empty_columns()
+        if len(parts) == 1:
+            return parts[0]
+        return _merge_parts(parts)
+
+    def write(self, columns: CandleColumns) -> None:
+        """Sıralı, tekil satırları yazar (write_lock altında çağrılır)"""
+        runs = self.runs
+        if runs:
+            last_times = [run.last_time for run in runs]
+            newest = max(range(len(runs)), key=lambda i: (last_times[i], i))
+            if columns["open_time"][0] > last_times[newest]:
+                # Hızlı yol: tüm serinin sonuna ekleme, son mumu tutan run'a yazılır
+                runs[newest].append(columns)
+                self.save_meta()
+                return
+
+        runs = runs + [self._new_run(columns)]
+        runs = self._compact(runs)
+        with self._runs_lock:
+            self.runs = runs
+        self.save_meta()
+        self._collect_garbage()
+
+    def _compact(self, runs: List[_Run]) -> List[_Run]:
+        """En yeni run'ı, kendinden en fazla MERGE_RATIO kat büyük önceki run'larla birleştirir"""
+        merged_away = []
+        while len(runs) >= 2 and runs[-2].count <= MERGE_RATIO * runs[-1].count:
+            older, newer = runs[-2], runs[-1]
+            merged = self._new_run(_merge_parts([
+                older.slice(np.iinfo(np.int64).min, np.iinfo(np.int64).max),
+                newer.slice(np.iinfo(np.int64).min, np.iinfo(np.int64).max),
+            ]))
+            merged_away += [older, newer]
+            runs = runs[:-2] + [merged]
+        # Bu çağrıda oluşturulup tekrar birleştirilen ara run'lar da silinir
+        self._garbage += merged_away
+        return runs
+
+    def _collect_garbage(self) -> None:
+        live = {id(run) for run in self.runs}
+        self._garbage = [run for run in self._garbage if id(run) not in live and not run.remove()]
+
+    def release(self) -> None:
+        with self._runs_lock:
+            for run in self.runs:
+                run.release()
+
+    def save_meta(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, "meta.json")
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "runs": [run.to_meta() for run in self.runs],
+                "next_run": self.next_run_id,
+                "coverage": self.coverage,
+            }, f)
+        os.replace(tmp_path, meta_path)
+
+
+class MemmapCandleStore(CandleStore):
+    """
+    Diskte kolon bazlı mum deposu (numpy.memmap)
+
+    Dönen diziler sonraki yazmalardan etkilenmez (değişmez anlık görüntü). Yazmalar seri başına
+    kilitlenir; farklı thread'lerden (asyncio.to_thread) güvenle çağrılabilir.
+    """
+
+    def __init__(self, root_dir: str, max_open_series: int = MAX_OPEN_SERIES):
+        self.root_dir = root_dir
+        self.max_open_series = max_open_series
+        # Bellekteki serilerin LRU sırası; taşınca kullanılmayan en eski seri düşer (meta.json'dan yeniden yüklenir)
+        self._series: "OrderedDict[CandleKey, _ColumnarSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _series_path(self, key: CandleKey) -> str:
+        for part in key:
+            if not _SAFE_PART.match(part):
+                raise ValueError(f"Geçersiz mum serisi anahtarı: {part}")
+        return os.path.join(self.root_dir, key.market, key.symbol.upper(), key.interval)
+
+    @contextmanager
+    def _use_series(self, key: CandleKey) -> Iterator[_ColumnarSeries]:
+        """
+        Seriyi kullanım süresince bellekte tutar
+        Sadece kullanılmayan seriler düşürülür: aynı seri için hiçbir zaman iki nesne oluşmaz ve
+        düşen serinin tüm yazmaları meta.json'a işlenmiştir
+        """
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = _ColumnarSeries(self._series_path(key))
+                self._series[key] = series
+            else:
+                self._series.move_to_end(key)
+            series.users += 1
+            evicted = self._evict_idle()
+        for other in evicted:
+            other.release()
+        try:
+            yield series
+        finally:
+            with self._lock:
+                series.users -= 1
+
+    def _evict_idle(self) -> List[_ColumnarSeries]:
+        """Sınır aşıldıysa kullanılmayan en eski serileri düşürür (self._lock altında çağrılır)"""
+        evicted = []
+        if len(self._series) <= self.max_open_series:
+            return evicted
+        for key in list(self._series):
+            if len(self._series) <= self.max_open_series:
+                break
+            series = self._series[key]
+            if series.users == 0:
+                del self._series[key]
+                evicted.append(series)
+        return evicted
+
+    def read(self, key: CandleKey, start_time: int, end_time: int) -> List[Candle]:
+        return columns_to_candles(self.read_columns(key, start_time, end_time))
+
+    def read_columns(self, key: CandleKey, start_time: int, end_time: int) -> CandleColumns:
+        with self._use_series(key) as series:
+            return series.view(start_time, end_time)
+
+    def write(self, key: CandleKey, candles: List[Candle]) -> None:
+        if candles:
+            self.write_columns(key, candles_to_columns(candles))
+
+    def write_columns(self, key: CandleKey, columns: CandleColumns) -> None:
+        """Kolon dizilerini seriye yazar (aynı open_time varsa yeni değer kazanır)"""
+        if column_count(columns) == 0:
+            return
+        # Aynı batch içindeki tekrarlarda sonraki satır kazanır
+        columns = _merge_parts([columns])
+        with self._use_series(key) as series, series.write_lock:
+            series.write(columns)
+
+    def get_coverage(self, key: CandleKey) -> List[TimeRange]:
+        with self._use_series(key) as series:
+            return list(series.coverage)
+
+    def add_coverage(self, key: CandleKey, start_time: int, end_time: int) -> None:
+        self.add_coverage_many(key, [(start_time, end_time)])
+
+    def add_coverage_many(self, key: CandleKey, ranges: List[TimeRange]) -> None:
+        """Aralıkları tek meta.json yazımıyla işaretler"""
+        if not ranges:
+            return
+        with self._use_series(key) as series, series.write_lock:
+            series.coverage = merge_ranges(series.coverage + list(ranges))
+            series.save_meta()
+
+    def close(self) -> None:
+        with self._lock:
+            series_list = list(self._series.values())
+            self._series.clear()
+        for series in series_list:
+            series.release()
@@ -0,0 +1,62 @@
+"""
+Memory Candle Store - Süreç belleğinde tutulan mum deposu
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List
+
+from models.candle_models import Candle
+from .candle_store import CandleStore, CandleKey, TimeRange, merge_ranges
+
+
+class _CandleSeries:
+    """Tek bir (market, symbol, interval) serisi - open_time'a göre sıralı"""
+
+    def __init__(self):
+        self.open_times: List[int] = []
+        self.candles: List[Candle] = []
+        self.coverage: List[TimeRange] = []
+
+
+class MemoryCandleStore(CandleStore):
+    """Bellek içi mum deposu"""
+
+    def __init__(self):
+        self._series: Dict[CandleKey, _CandleSeries] = {}
+
+    def _get_series(self, key: CandleKey) -> _CandleSeries:
+        if key not in self._series:
+            self._series[key] = _CandleSeries()
+        return self._series[key]
+
+    def read(self, key: CandleKey, start_time: int, end_time: int) -> List[Candle]:
+        series = self._series.get(key)
+        if series is None:
+            return []
+        lo = bisect_left(series.open_times, start_time)
+        hi = bisect_right(series.open_times, end_time)
+        return series.candles[lo:hi]
+
+    def write(self, key: CandleKey, candles: List[Candle]) -> None:
+        if not candles:
+            return
+        series = self._get_series(key)
+
+        # Hızlı yol: yeni mumlar serinin sonuna ekleniyor
+        if not series.open_times or min(c.open_time for c in candles) > series.open_times[-1]:
+            ordered = sorted(candles, key=lambda c: c.open_time)
+            series.open_times.extend(c.open_time for c in ordered)
+            series.candles.extend(ordered)
+            return
+
+        merged = {c.open_time: c for c in series.candles}
+        merged.update((c.open_time, c) for c in candles)
+        series.open_times = sorted(merged)
+        series.candles = [merged[t] for t in series.open_times]
+
+    def get_coverage(self, key: CandleKey) -> List[TimeRange]:
+        series = self._series.get(key)
+        return list(series.coverage) if series else []
+
+    def add_coverage(self, key: CandleKey, start_time: int, end_time: int) -> None:
+        series = self._get_series(key)
+        series.coverage = merge_ranges(series.coverage + [(start_time, end_time)])
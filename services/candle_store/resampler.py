@@ -0,0 +1,99 @@
+"""
+Candle Resampler - Depodaki ince interval'lerden (ör: 1m) üst interval mumlarını türetir
+
+Kaynak mumlar hedef interval'in açılış zamanına (bucket) göre gruplanır ve reduceat ile
+vektörize toplanır: ilk open, en yüksek high, en düşük low, son close, toplam hacimler ve
+işlem sayıları. Binance üst interval klines'ları aynı kuralla oluşturduğundan sonuç birebirdir.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from .candle_store import CandleStore, CandleKey
+from .columns import CandleColumns, MISSING_TRADES, column_count, empty_columns
+from .intervals import INTERVAL_MS, WEEK_OFFSET_MS, align_open_time, interval_to_ms
+
+# Toplanarak birleştirilen kolonlar
+_SUMMED_COLUMNS = ("volume", "quote_asset_volume", "taker_buy_base_asset_volume", "taker_buy_quote_asset_volume")
+
+
+def align_open_times(open_times: np.ndarray, interval: str) -> np.ndarray:
+    """align_open_time'ın dizi üzerinde vektörize hali"""
+    step = interval_to_ms(interval)
+    offset = WEEK_OFFSET_MS if interval == "1w" else 0
+    return open_times - (open_times - offset) % step
+
+
+def source_intervals(target_interval: str) -> List[str]:
+    """
+    Hedef interval'e birebir toplanabilen daha ince interval'ler (kabadan inceye)
+    Kaynak bucket'ları hedef bucket'larını tam bölmeli ve aynı hizada olmalıdır
+    """
+    target_ms = interval_to_ms(target_interval)
+    target_offset = WEEK_OFFSET_MS if target_interval == "1w" else 0
+    candidates = [
+        interval for interval, ms in INTERVAL_MS.items()
+        if ms < target_ms and target_ms % ms == 0 and target_offset % ms == 0
+    ]
+    return sorted(candidates, key=lambda interval: INTERVAL_MS[interval], reverse=True)
+
+
+def resample_columns(columns: CandleColumns, target_interval: str) -> CandleColumns:
+    """
+    open_time'a göre sıralı kaynak kolonları hedef interval'e toplar
+    Kaynakta hiç mum olmayan bucket'lar çıktıda yer almaz (upstream davranışıyla aynı)
+    """
+    n = column_count(columns)
+    if n == 0:
+        return empty_columns()
+
+    buckets = align_open_times(columns["open_time"], target_interval)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.append(starts[1:], n) - 1
+
+    trades = columns["number_of_trades"].astype(np.int64)
+    trades = np.add.reduceat(np.where(trades == MISSING_TRADES, 0, trades), starts)
+
+    open_times = buckets[starts]
+    result = {
+        "open_time": open_times,
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": columns["close"][ends],
+        "close_time": open_times + interval_to_ms(target_interval) - 1,
+        "number_of_trades": np.minimum(trades, np.iinfo(np.int32).max).astype(np.int32),
+    }
+    for name in _SUMMED_COLUMNS:
+        result[name] = np.add.reduceat(columns[name], starts)
+    return result
+
+
+class CandleResampler:
+    """Eksik üst interval aralıklarını depoda tamamen bulunan ince interval'lerden türetir"""
+
+    def __init__(self, candle_store: CandleStore):
+        self.candle_store = candle_store
+
+    def derive(self, key: CandleKey, start_time: int, end_time: int) -> Optional[CandleColumns]:
+        """
+        open_time'ı [start_time, end_time] içindeki (kapanmış) hedef mumlarını türetir
+
+        Bu aralığı eksiksiz kapsayan (coverage) bir kaynak interval yoksa None döner.
+        Sonuç birebir olduğundan kapsayan kaynaklar arasında en kaba olanı (en az satır) seçilir.
+        """
+        if key.interval not in INTERVAL_MS:
+            return None
+        source_start = align_open_time(start_time, key.interval)
+        source_end = align_open_time(end_time, key.interval) + interval_to_ms(key.interval) - 1
+
+        for interval in source_intervals(key.interval):
+            source_key = CandleKey(key.market, key.symbol, interval)
+            if self.candle_store.missing_ranges(source_key, source_start, source_end):
+                continue
+            columns = resample_columns(
+                self.candle_store.read_columns(source_key, source_start, source_end), key.interval
+            )
+            mask = (columns["open_time"] >= start_time) & (columns["open_time"] <= end_time)
+            return {name: column[mask] for name, column in columns.items()}
+        return None
@@ -0,0 +1,338 @@
+"""
+Candle Stream Hub - Upstream mum WebSocket aboneliklerini tüm dinleyiciler arasında paylaştırır
+
+Her (market, symbol, interval) serisi için upstream'de tek bir abonelik tutulur; seriyi izleyen
+tüm dinleyiciler (listener) aynı olayları alır. 10.000 istemcinin izlediği BTCUSDT 1m tek bir
+upstream stream'idir. Market başına stream'ler, bağlantı başına en fazla
+CANDLE_WS_STREAMS_PER_CONNECTION stream taşıyan upstream bağlantılarına (shard) dağıtılır.
+
+- Abonelik değişiklikleri kısa bir süre biriktirilip açık bağlantıya tek SUBSCRIBE/UNSUBSCRIBE
+  mesajıyla gönderilir; bağlantı yeniden kurulmaz.
+- Bağlantı koparsa üstel geri çekilme (jitter'lı) ile yeniden bağlanılır; kopukluk süresince
+  kaçırılan kapanmış mumlar REST'ten çekilip dinleyicilere sırayla iletilir (resync).
+- Kapanmış mumlar seri başına biriktirilir ve run() tarafından CANDLE_WS_STORE_FLUSH_SECONDS'ta
+  bir, event loop dışında (thread) tek yazma + tek coverage güncellemesiyle depoya yazılır;
+  /candles aynı aralığı upstream'e gitmeden sunar. Dakika başlarında tüm stream'lerin aynı anda
+  kapanan mumları event loop'u disk I/O'su ile bloklamaz.
+
+Dinleyiciler event loop içinde senkron çağrılır ve bloklamamalıdır (ör: sınırlı kuyruğa koyma).
+"""
+import asyncio
+import random
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from core.config import (
+    CANDLE_WS_STREAMS_PER_CONNECTION, CANDLE_WS_RECONNECT_MAX_SECONDS, CANDLE_WS_STORE_FLUSH_SECONDS
+)
+from services.candle_store.candle_store import CandleStore, CandleKey
+from services.candle_store.columns import (
+    CandleColumns, candles_to_columns, closed_mask, column_count, columns_to_candles, concat_columns,
+    filter_columns
+)
+from services.candle_store.intervals import interval_to_ms, is_storable_interval, SUPPORTED_INTERVALS
+from services.market_api_manager.market_api_interface import (
+    AsyncMarketAPIServiceInterface, CandleEvent, CandleStream, CandleStreamConnection
+)
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+
+CandleListener = Callable[[CandleKey, CandleEvent], None]
+
+# Yeniden bağlanma beklemesinin başlangıç değeri (saniye); her başarısız denemede iki katına çıkar
+RECONNECT_MIN_SECONDS = 1.0
+
+# Abonelik değişikliklerinin tek mesajda toplanması için bekleme (Binance: saniyede en fazla 5 mesaj)
+SUBSCRIPTION_FLUSH_SECONDS = 0.5
+
+# Resync'te stream başına REST'ten çekilecek en fazla mum (tek sayfa)
+RESYNC_LIMIT = 1000
+
+
+class _Topic:
+    """Tek bir serinin dinleyicileri ve son durumu"""
+
+    def __init__(self, key: CandleKey, shard: "_UpstreamShard"):
+        self.key = key
+        self.shard = shard
+        self.listeners: Set[CandleListener] = set()
+        self.last_event: Optional[CandleEvent] = None
+        self.last_closed_open_time: Optional[int] = None
+        self.events = 0
+
+
+class _UpstreamShard:
+    """Bir marketin stream kümesini taşıyan tek upstream bağlantısı ve yeniden bağlanma döngüsü"""
+
+    def __init__(self, hub: "CandleStreamHub", market_id: str, service: AsyncMarketAPIServiceInterface,
+                 capacity: int):
+        self.hub = hub
+        self.market_id = market_id
+        self.service = service
+        self.capacity = capacity
+        self.streams: Set[CandleStream] = set()
+        self.connected = False
+        self.connects = 0
+        self.last_error: Optional[str] = None
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def has_capacity(self) -> bool:
+        return len(self.streams) < self.capacity
+
+    def add(self, stream: CandleStream) -> None:
+        self.streams.add(stream)
+        self._changed.set()
+
+    def remove(self, stream: CandleStream) -> None:
+        self.streams.discard(stream)
+        self._changed.set()
+
+    async def close(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        backoff = RECONNECT_MIN_SECONDS
+        while True:
+            connection: Optional[CandleStreamConnection] = None
+            sync_task: Optional[asyncio.Task] = None
+            try:
+                subscribed = set(self.streams)
+                connection = await self.service.ws_candle_stream(sorted(subscribed))
+                self.connected = True
+                self.connects += 1
+                # Kopukluk süresince kaçırılan kapanmış mumlar, yeni olaylardan önce iletilir
+                # (bu sırada gelen olaylar bağlantının alım kuyruğunda bekler)
+                await self.hub._resync(self.market_id, subscribed)
+                backoff = RECONNECT_MIN_SECONDS
+                sync_task = asyncio.create_task(self._sync_subscriptions(connection, subscribed))
+                async for event in connection.events():
+                    self.hub._dispatch(self.market_id, event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ {self.market_id} mum stream bağlantısı koptu: {str(e)}")
+            finally:
+                self.connected = False
+                if sync_task is not None:
+                    sync_task.cancel()
+                if connection is not None:
+                    try:
+                        await connection.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, CANDLE_WS_RECONNECT_MAX_SECONDS)
+
+    async def _sync_subscriptions(self, connection: CandleStreamConnection, subscribed: Set[CandleStream]) -> None:
+        """Açık bağlantının stream kümesini self.streams ile eşitler"""
+        try:
+            while True:
+                await self._changed.wait()
+                await asyncio.sleep(SUBSCRIPTION_FLUSH_SECONDS)
+                self._changed.clear()
+                added = self.streams - subscribed
+                removed = subscribed - self.streams
+                await connection.subscribe(sorted(added))
+                await connection.unsubscribe(sorted(removed))
+                subscribed |= added
+                subscribed -= removed
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Mesaj gönderilemiyorsa bağlantı kapatılır; olay döngüsü yeniden bağlanır
+            self.last_error = str(e)
+            await connection.close()
+
+
+class CandleStreamHub:
+    """(market, symbol, interval) -> paylaşılan upstream mum aboneliği ve dinleyicileri"""
+
+    def __init__(self, market_manager: MarketAPIServiceManager, candle_store: CandleStore,
+                 streams_per_connection: int = CANDLE_WS_STREAMS_PER_CONNECTION,
+                 store_flush_seconds: float = CANDLE_WS_STORE_FLUSH_SECONDS):
+        self.market_manager = market_manager
+        self.candle_store = candle_store
+        self.streams_per_connection = streams_per_connection
+        self.store_flush_seconds = store_flush_seconds
+        self._topics: Dict[CandleKey, _Topic] = {}
+        self._shards: Dict[str, List[_UpstreamShard]] = {}
+        # Depoya henüz yazılmamış kapanmış mum blokları (seri -> geliş sırasıyla bloklar)
+        self._pending_store: Dict[CandleKey, List[CandleColumns]] = {}
+        self._store_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def subscribe(self, market_id: str, symbol: str, interval: str, listener: CandleListener) -> CandleKey:
+        """
+        Dinleyiciyi serinin olaylarına abone eder; seri için upstream aboneliği yoksa açılır
+        Serinin bilinen son olayı varsa dinleyiciye hemen iletilir.
+
+        Raises:
+            ValueError: Geçersiz market veya interval
+            NotImplementedError: Market mum stream'i desteklemiyor
+        """
+        if self._closed:
+            raise RuntimeError("Candle stream hub kapatıldı")
+        if interval not in SUPPORTED_INTERVALS:
+            raise ValueError(f"Desteklenmeyen interval: {interval}. Desteklenen: {', '.join(SUPPORTED_INTERVALS)}")
+        key = CandleKey(market_id, symbol.upper().strip(), interval)
+
+        topic = self._topics.get(key)
+        if topic is None:
+            service = await self.market_manager.get_service(market_id)
+            if not service.supports_candle_ws():
+                raise NotImplementedError(f"{service.get_market().name} mum stream'i desteklemiyor")
+            # get_service beklenirken aynı seri başka bir abonelikle açılmış olabilir
+            topic = self._topics.get(key)
+            if topic is None:
+                topic = _Topic(key, self._shard_for(market_id, service))
+                self._topics[key] = topic
+                topic.shard.add((key.symbol, key.interval))
+
+        topic.listeners.add(listener)
+        if topic.last_event is not None:
+            listener(key, topic.last_event)
+        return key
+
+    async def unsubscribe(self, key: CandleKey, listener: CandleListener) -> None:
+        """Dinleyiciyi çıkarır; serinin son dinleyicisiyse upstream aboneliği de kapanır"""
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+        topic.listeners.discard(listener)
+        if topic.listeners:
+            return
+
+        del self._topics[key]
+        shard = topic.shard
+        shard.remove((key.symbol, key.interval))
+        if not shard.streams:
+            self._shards[key.market].remove(shard)
+            await shard.close()
+
+    def _shard_for(self, market_id: str, service: AsyncMarketAPIServiceInterface) -> _UpstreamShard:
+        """Marketin yer olan ilk bağlantısını döner, yoksa yenisini açar"""
+        shards = self._shards.setdefault(market_id, [])
+        for shard in shards:
+            if shard.has_capacity:
+                return shard
+        capacity = min(self.streams_per_connection, service.max_streams_per_connection)
+        shard = _UpstreamShard(self, market_id, service, capacity)
+        shards.append(shard)
+        return shard
+
+    def _dispatch(self, market_id: str, event: CandleEvent, store: bool = True) -> None:
+        """Olayı serinin dinleyicilerine iletir; kapanmış mumu depoya yazar"""
+        key = CandleKey(market_id, event.symbol, event.interval)
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+        if event.is_closed:
+            if store:
+                self._store_closed(key, candles_to_columns([event.candle]))
+            topic.last_closed_open_time = event.candle.open_time
+        topic.last_event = event
+        topic.events += 1
+
+        for listener in list(topic.listeners):
+            try:
+                listener(key, event)
+            except Exception as e:
+                print(f"❌ Mum stream dinleyicisi hatası ({key.symbol} {key.interval}): {str(e)}")
+
+    def _store_closed(self, key: CandleKey, columns: CandleColumns) -> None:
+        """Kapanmış mumları depoya yazılmak üzere biriktirir (I/O yapmaz)"""
+        if not is_storable_interval(key.interval) or column_count(columns) == 0:
+            return
+        self._pending_store.setdefault(key, []).append(columns)
+
+    def _write_pending(self, pending: Dict[CandleKey, List[CandleColumns]]) -> None:
+        """
+        Biriken blokları seri başına tek yazma ve tek coverage güncellemesiyle depoya yazar
+        Thread içinde çağrılır; her blok ardışık mumlardır ve kendi aralığını coverage'a ekler
+        """
+        for key, chunks in pending.items():
+            step = interval_to_ms(key.interval)
+            try:
+                self.candle_store.write_columns(key, concat_columns(chunks))
+                self.candle_store.add_coverage_many(key, [
+                    (int(chunk["open_time"][0]), int(chunk["open_time"][-1]) + step - 1) for chunk in chunks
+                ])
+            except Exception as e:
+                print(f"❌ Stream mumları depoya yazılamadı ({key.symbol} {key.interval}): {str(e)}")
+
+    async def flush_store(self) -> None:
+        """Biriken kapanmış mumları event loop dışında depoya yazar"""
+        # Önceki yazma bitmeden yenisi başlamaz: aynı seride sonraki blok kazanmalı
+        if self._store_task is not None and not self._store_task.done():
+            await asyncio.shield(self._store_task)
+        if not self._pending_store:
+            return
+        pending, self._pending_store = self._pending_store, {}
+        # shield: run() iptal edilse de başlamış yazma tamamlanır (close() onu bekler)
+        self._store_task = asyncio.create_task(asyncio.to_thread(self._write_pending, pending))
+        await asyncio.shield(self._store_task)
+
+    async def run(self) -> None:
+        """Uygulama kapanana kadar biriken kapanmış mumları periyodik olarak depoya yazar"""
+        while True:
+            await asyncio.sleep(self.store_flush_seconds)
+            try:
+                await self.flush_store()
+            except Exception as e:
+                print(f"❌ Stream mumları depoya yazılamadı: {str(e)}")
+
+    async def _resync(self, market_id: str, streams: Set[CandleStream]) -> None:
+        """
+        Yeniden bağlanınca, son görülen kapanmış mumdan sonra kaçırılan kapanmış mumları REST'ten
+        çekip depoya yazar ve dinleyicilere sırayla iletir
+        """
+        now = int(time.time() * 1000)
+        for symbol, interval in sorted(streams):
+            topic = self._topics.get(CandleKey(market_id, symbol, interval))
+            if topic is None or topic.last_closed_open_time is None or not is_storable_interval(interval):
+                continue
+            start = topic.last_closed_open_time + interval_to_ms(interval)
+            try:
+                columns = await self.market_manager.get_historical_candle_columns(
+                    market_id, symbol, interval, start, None, RESYNC_LIMIT
+                )
+            except Exception as e:
+                print(f"❌ {market_id} {symbol} {interval} resync başarısız: {str(e)}")
+                continue
+
+            columns = filter_columns(columns, closed_mask(columns, now) & (columns["open_time"] >= start))
+            self._store_closed(topic.key, columns)
+            for candle in columns_to_candles(columns):
+                self._dispatch(market_id, CandleEvent(symbol, interval, candle, True), store=False)
+
+    def stats(self) -> dict:
+        """Seri, dinleyici ve upstream bağlantı sayaçlarını döner"""
+        return {
+            "topics": len(self._topics),
+            "listeners": sum(len(topic.listeners) for topic in self._topics.values()),
+            "pending_store_series": len(self._pending_store),
+            "connections": [
+                {
+                    "market_id": market_id,
+                    "streams": len(shard.streams),
+                    "connected": shard.connected,
+                    "connects": shard.connects,
+                    "last_error": shard.last_error,
+                }
+                for market_id, shards in self._shards.items()
+                for shard in shards
+            ],
+        }
+
+    async def close(self) -> None:
+        """Tüm upstream bağlantılarını kapatır ve biriken kapanmış mumları depoya yazar"""
+        self._closed = True
+        shards = [shard for shards in self._shards.values() for shard in shards]
+        self._shards.clear()
+        self._topics.clear()
+        for shard in shards:
+            await shard.close()
+        await self.flush_store()
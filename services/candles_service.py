@@ -1 +1,303 @@
-# Candle service örneği
+"""
+Candles Service - Mum verilerini yerel depodan sunar, eksik aralıkları upstream'den tamamlar
+
+Eksik bir üst interval aralığı (ör: 1h) depoda tamamen bulunan daha ince bir interval'den
+(ör: 1m) türetilebiliyorsa upstream'e gidilmez; sonuç CANDLE_RESAMPLE_CACHE açıksa depoya yazılır.
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import CANDLE_RESAMPLE_ENABLED, CANDLE_RESAMPLE_CACHE, CANDLE_STREAM_CHUNK_SIZE
+from models.candle_models import Candle
+from models.indicator_models import IndicatorConfig
+from services.candle_store.candle_store import CandleStore, CandleKey
+from services.candle_store.columns import (
+    CandleColumns, column_count, closed_mask, filter_columns, columns_to_candles, concat_columns,
+    parts_count, slice_parts
+)
+from services.candle_store.resampler import CandleResampler
+from services.indicators.indicator_manager import StreamingIndicatorSet, indicator_manager
+from services.candle_store.intervals import interval_to_ms, align_open_time, is_storable_interval, SUPPORTED_INTERVALS
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+
+# Upstream'den sayfa başına çekilecek mum sayısı (Binance üst sınırı)
+CANDLES_PAGE_LIMIT = 1000
+
+
+class CandlesService:
+    """Mum servisleri - (market, symbol, interval) anahtarlı yerel depo + gap-fill"""
+
+    def __init__(self, market_manager: MarketAPIServiceManager, candle_store: CandleStore):
+        self.market_manager = market_manager
+        self.candle_store = candle_store
+        self.resampler = CandleResampler(candle_store) if CANDLE_RESAMPLE_ENABLED else None
+
+    async def get_candle_parts(
+        self,
+        market_id: str,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500
+    ) -> List[CandleColumns]:
+        """
+        Mum verilerini open_time sırasında ardışık kolon parçaları olarak döner
+
+        start_time verilirse o andan itibaren ilk 'limit' mum, verilmezse end_time'a (varsayılan: şimdi)
+        kadar olan son 'limit' mum döner. Kapanmış mumlar yerel depodan okunur; depoda olmayan
+        aralıklar upstream'den çekilip depoya yazılır. Açık (henüz kapanmamış) mum her istekte
+        upstream'den alınır ve depolanmaz.
+
+        Depo parçası kolon bazlı depolarda kopyasız görünümdür (memmap); açık mum ayrı bir parçadır.
+        """
+        if interval not in SUPPORTED_INTERVALS:
+            raise ValueError(f"Desteklenmeyen interval: {interval}. Desteklenen: {', '.join(SUPPORTED_INTERVALS)}")
+        symbol = symbol.upper().strip()
+
+        # Değişken uzunluklu interval'ler ('1M') depolanmaz, doğrudan upstream'den çekilir
+        if not is_storable_interval(interval):
+            return [await self.market_manager.get_historical_candle_columns(
+                market_id, symbol, interval, start_time, end_time, limit
+            )]
+
+        step = interval_to_ms(interval)
+        now = int(time.time() * 1000)
+        current_open = align_open_time(now, interval)
+
+        end = now if end_time is None else min(end_time, now)
+        if start_time is None:
+            start = align_open_time(end, interval) - (limit - 1) * step
+        else:
+            start = start_time
+            end = min(end, align_open_time(start, interval) + (limit - 1) * step + step - 1)
+        if start > end:
+            raise ValueError("start_time, end_time'dan büyük olamaz")
+
+        key = CandleKey(market_id, symbol, interval)
+        closed_end = min(end, current_open - 1)
+        parts = []
+        if start <= closed_end:
+            parts.append(await self._read_closed(key, start, closed_end))
+        if end >= current_open:
+            parts.append(await self._read_live(key, current_open, end))
+
+        total = parts_count(parts)
+        if start_time is None:
+            return slice_parts(parts, max(0, total - limit), total)
+        return slice_parts(parts, 0, limit)
+
+    async def get_candle_columns(self, market_id: str, symbol: str, interval: str,
+                                 start_time: Optional[int] = None, end_time: Optional[int] = None,
+                                 limit: int = 500) -> CandleColumns:
+        """Mum verilerini tek bir kolon kümesi olarak döner"""
+        return concat_columns(await self.get_candle_parts(market_id, symbol, interval, start_time, end_time, limit))
+
+    async def get_candles(self, market_id: str, symbol: str, interval: str,
+                          start_time: Optional[int] = None, end_time: Optional[int] = None,
+                          limit: int = 500) -> List[Candle]:
+        """Mum verilerini Candle listesi olarak döner (bkz. get_candle_parts)"""
+        return columns_to_candles(
+            await self.get_candle_columns(market_id, symbol, interval, start_time, end_time, limit)
+        )
+
+    async def get_candle_parts_with_indicators(
+        self,
+        market_id: str,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500,
+        configs: Optional[List[IndicatorConfig]] = None
+    ) -> Tuple[List[CandleColumns], Dict[str, np.ndarray]]:
+        """
+        Mum kolon parçalarını ve mumlarla hizalı indikatör dizilerini döner
+
+        İndikatörlerin ilk döndürülen mumda oturması için istenen aralıktan önceki
+        ısınma (lookback) mumları da çekilir; hesaplamadan sonra kırpılır.
+        """
+        if not configs:
+            return await self.get_candle_parts(market_id, symbol, interval, start_time, end_time, limit), {}
+
+        lookback = indicator_manager.get_lookback(configs)
+        if start_time is None:
+            parts = await self.get_candle_parts(market_id, symbol, interval, None, end_time, limit + lookback)
+            first = max(0, parts_count(parts) - limit)
+        elif not is_storable_interval(interval):
+            # '1M' gibi değişken uzunluklu interval'lerde ısınma geçmişi çekilmez
+            parts = await self.get_candle_parts(market_id, symbol, interval, start_time, end_time, limit)
+            first = 0
+        else:
+            step = interval_to_ms(interval)
+            parts = await self.get_candle_parts(
+                market_id, symbol, interval, max(0, start_time - lookback * step), end_time, limit + lookback
+            )
+            open_times = concat_columns(parts)["open_time"]
+            first = int(np.searchsorted(open_times, align_open_time(start_time, interval)))
+
+        series = indicator_manager.calculate(concat_columns(parts), configs)
+        indicators = {key: values[first:first + limit] for key, values in series.items()}
+        return slice_parts(parts, first, first + limit), indicators
+
+    async def get_candles_with_indicators(
+        self,
+        market_id: str,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500,
+        configs: Optional[List[IndicatorConfig]] = None
+    ) -> Tuple[List[Candle], Dict[str, List[Optional[float]]]]:
+        """Mum verilerini ve mumlarla hizalı (JSON'a uygun) indikatör serilerini döner"""
+        parts, series = await self.get_candle_parts_with_indicators(
+            market_id, symbol, interval, start_time, end_time, limit, configs
+        )
+        indicators = {key: indicator_manager.to_json_series(values) for key, values in series.items()}
+        return columns_to_candles(concat_columns(parts)), indicators
+
+    async def stream_candles(
+        self,
+        market_id: str,
+        symbol: str,
+        interval: str,
+        start_time: int,
+        end_time: Optional[int] = None,
+        configs: Optional[List[IndicatorConfig]] = None,
+        chunk_size: int = CANDLE_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Tuple[CandleColumns, Dict[str, np.ndarray]]]:
+        """
+        [start_time, end_time] aralığındaki mumları en fazla chunk_size mumluk bloklar halinde
+        (mumlarla hizalı indikatör dizileriyle birlikte) üreten async iterator döner
+
+        Her blok sırası geldiğinde gap-fill edilip depodan okunur; önceki bloklar tüketildikten
+        sonra bırakılır. Bellek kullanımı ve ilk bloğun gecikmesi aralık uzunluğuna bağlı değildir.
+        İndikatörler StreamingIndicatorSet ile bloktan bloğa durum taşınarak hesaplanır; sonuçlar
+        aralığın tek seferde hesaplanmasıyla aynıdır.
+
+        Doğrulama ve ısınma (lookback) geçmişinin çekilmesi bu çağrıda yapılır; hatalar ilk
+        byte gönderilmeden önce yükselir.
+
+        Raises:
+            ValueError: Geçersiz interval veya aralık
+        """
+        if interval not in SUPPORTED_INTERVALS:
+            raise ValueError(f"Desteklenmeyen interval: {interval}. Desteklenen: {', '.join(SUPPORTED_INTERVALS)}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size en az 1 olmalı")
+        symbol = symbol.upper().strip()
+        now = int(time.time() * 1000)
+        end = now if end_time is None else min(end_time, now)
+        if start_time > end:
+            raise ValueError("start_time, end_time'dan büyük olamaz")
+
+        # Değişken uzunluklu interval'ler ('1M') depolanmaz; aralık tek blokta döner
+        if not is_storable_interval(interval):
+            parts, indicators = await self.get_candle_parts_with_indicators(
+                market_id, symbol, interval, start_time, end, CANDLES_PAGE_LIMIT, configs
+            )
+            return self._single_chunk(concat_columns(parts), indicators)
+
+        key = CandleKey(market_id, symbol, interval)
+        start = align_open_time(start_time, interval)
+        streaming = None
+        if configs:
+            history = await self.get_candle_columns(
+                market_id, symbol, interval, None, start - 1, indicator_manager.get_lookback(configs)
+            ) if start > 0 else None
+            streaming = indicator_manager.create_streaming(configs, history)
+        return self._iter_chunks(key, start, end, streaming, chunk_size)
+
+    @staticmethod
+    async def _single_chunk(columns: CandleColumns, indicators: Dict[str, np.ndarray]):
+        yield columns, indicators
+
+    async def _iter_chunks(self, key: CandleKey, start: int, end: int,
+                           streaming: Optional[StreamingIndicatorSet], chunk_size: int):
+        step = interval_to_ms(key.interval)
+        current_open = align_open_time(int(time.time() * 1000), key.interval)
+        closed_end = min(end, current_open - 1)
+
+        cursor = start
+        while cursor <= closed_end:
+            chunk_end = min(closed_end, cursor + chunk_size * step - 1)
+            columns = await self._read_closed(key, cursor, chunk_end)
+            cursor = chunk_end + 1
+            if column_count(columns) == 0:
+                continue
+            yield columns, streaming.update_many(columns) if streaming else {}
+
+        if end >= current_open:
+            live = await self._read_live(key, current_open, end)
+            if column_count(live) == 0:
+                return
+            indicators = {}
+            if streaming:
+                # Açık mum geçici (tentative) değer üretir; streaming durumu değişmez
+                values = streaming.update(columns_to_candles(live)[0], is_closed=False)
+                indicators = {
+                    name: np.array([np.nan if value is None else value]) for name, value in values.items()
+                }
+            yield live, indicators
+
+    async def _read_closed(self, key: CandleKey, start: int, end: int) -> CandleColumns:
+        """
+        [start, end] aralığındaki kapanmış mumları döner; depoda olmayan kısımlar önce daha ince
+        bir interval'den türetilir, türetilemeyenler upstream'den çekilip depoya yazılır
+        """
+        derived = []
+        for gap_start, gap_end in self.candle_store.missing_ranges(key, start, end):
+            columns = self.resampler.derive(key, gap_start, gap_end) if self.resampler else None
+            if columns is None:
+                await self._fill_range(key, gap_start, gap_end)
+            elif CANDLE_RESAMPLE_CACHE:
+                await asyncio.to_thread(self._store_range, key, columns, gap_start, gap_end)
+            else:
+                derived.append(columns)
+
+        stored = self.candle_store.read_columns(key, start, end)
+        if derived:
+            # Depolanmayan türetilmiş aralıklar depodaki mumlarla open_time sırasında birleştirilir
+            stored = concat_columns([stored] + derived)
+            order = np.argsort(stored["open_time"], kind="stable")
+            stored = {name: column[order] for name, column in stored.items()}
+        return stored
+
+    async def _read_live(self, key: CandleKey, current_open: int, end: int) -> CandleColumns:
+        """Açık (henüz kapanmamış) mumu upstream'den alır; depolanmaz"""
+        live = await self.market_manager.get_historical_candle_columns(
+            key.market, key.symbol, key.interval, current_open, end, 1
+        )
+        return filter_columns(live, live["open_time"] >= current_open)
+
+    async def _fill_range(self, key: CandleKey, start: int, end: int) -> None:
+        """
+        [start, end] aralığındaki kapanmış mumları sayfa sayfa upstream'den çekip depoya yazar
+        Her sayfadan sonra coverage ilerletilir; yarıda kesilen doldurma bir sonraki istekte devam eder.
+        Depo yazımları event loop'u bloklamamak için thread'de yapılır
+        """
+        step = interval_to_ms(key.interval)
+        now = int(time.time() * 1000)
+        cursor = start
+        while cursor <= end:
+            page = await self.market_manager.get_historical_candle_columns(
+                key.market, key.symbol, key.interval, cursor, end, CANDLES_PAGE_LIMIT
+            )
+            # Sadece kapanmış mumlar depolanır (tüm sayfa tek saat okumasına göre)
+            mask = closed_mask(page, now) & (page["open_time"] <= end)
+            closed = filter_columns(page, mask)
+            if column_count(page) < CANDLES_PAGE_LIMIT:
+                await asyncio.to_thread(self._store_range, key, closed, start, end)
+                return
+            cursor = int(page["open_time"][-1]) + step
+            await asyncio.to_thread(self._store_range, key, closed, start, cursor - 1)
+        await asyncio.to_thread(self.candle_store.add_coverage, key, start, end)
+
+    def _store_range(self, key: CandleKey, columns: CandleColumns, start: int, end: int) -> None:
+        """Mumları depoya yazıp [start, end] aralığını coverage'a ekler (asyncio.to_thread ile çağrılır)"""
+        self.candle_store.write_columns(key, columns)
+        self.candle_store.add_coverage(key, start, end)
@@ -0,0 +1,12 @@
+"""
+Indicators module - mum kolonları üzerinde vektörize teknik indikatörler
+"""
+
+from .indicator_manager import IndicatorManager, StreamingIndicatorSet, indicator_manager, INDICATORS
+
+__all__ = [
+    'IndicatorManager',
+    'StreamingIndicatorSet',
+    'indicator_manager',
+    'INDICATORS'
+]
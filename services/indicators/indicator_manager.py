@@ -0,0 +1,272 @@
+"""
+Indicator Manager - İndikatör ayarlarını doğrular ve kernel'leri mum kolonları üzerinde çalıştırır
+
+Çıktılar mumlarla hizalı dizilerdir; anahtar config.id veya ad + parametrelerden üretilir
+(ör: 'sma_50', 'macd_12_26_9.signal'). Isınma dönemindeki değerler None döner.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.candle_models import Candle
+from models.indicator_models import IndicatorConfig, IndicatorInfo
+from services.candle_store.columns import CandleColumns, candles_to_columns
+from . import kernels
+from .streaming import STREAMING_INDICATORS, StreamingIndicator
+
+
+# Tek istekte hesaplanabilecek en fazla indikatör
+MAX_INDICATORS = 20
+
+# Bir indikatör için izin verilen en büyük periyot
+MAX_PERIOD = 1000
+
+
+class IndicatorSpec:
+    """Bir indikatörün kernel'i, varsayılan parametreleri ve ısınma uzunluğu"""
+
+    def __init__(self, name: str, description: str, defaults: Dict[str, object],
+                 compute: Callable[[CandleColumns, Dict[str, object]], object],
+                 lookback: Callable[[Dict[str, object]], int], outputs: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.defaults = defaults
+        self.compute = compute
+        self.lookback = lookback
+        self.outputs = outputs
+
+
+def _close(columns: CandleColumns) -> np.ndarray:
+    return columns["close"]
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {spec.name: spec for spec in (
+    IndicatorSpec(
+        "sma", "Basit hareketli ortalama", {"period": 20},
+        lambda c, p: kernels.sma(_close(c), p["period"]),
+        lambda p: p["period"] - 1,
+    ),
+    IndicatorSpec(
+        "ema", "Üstel hareketli ortalama", {"period": 20},
+        lambda c, p: kernels.ema(_close(c), p["period"]),
+        # EMA tohumdan sonra da önceki mumlara bağlıdır; birkaç periyot ek geçmiş yakınsamayı sağlar
+        lambda p: 4 * p["period"],
+    ),
+    IndicatorSpec(
+        "wma", "Ağırlıklı hareketli ortalama", {"period": 20},
+        lambda c, p: kernels.wma(_close(c), p["period"]),
+        lambda p: p["period"] - 1,
+    ),
+    IndicatorSpec(
+        "rsi", "Göreceli güç endeksi (Wilder)", {"period": 14},
+        lambda c, p: kernels.rsi(_close(c), p["period"]),
+        lambda p: 4 * p["period"],
+    ),
+    IndicatorSpec(
+        "macd", "MACD (hızlı EMA - yavaş EMA, sinyal, histogram)", {"fast": 12, "slow": 26, "signal": 9},
+        lambda c, p: kernels.macd(_close(c), p["fast"], p["slow"], p["signal"]),
+        lambda p: 4 * p["slow"] + 4 * p["signal"],
+        ("macd", "signal", "hist"),
+    ),
+    IndicatorSpec(
+        "bollinger", "Bollinger bantları", {"period": 20, "stddev": 2.0},
+        lambda c, p: kernels.bollinger(_close(c), p["period"], p["stddev"]),
+        lambda p: p["period"] - 1,
+        ("upper", "middle", "lower"),
+    ),
+    IndicatorSpec(
+        "atr", "Ortalama gerçek aralık (Wilder)", {"period": 14},
+        lambda c, p: kernels.atr(c["high"], c["low"], c["close"], p["period"]),
+        lambda p: 4 * p["period"],
+    ),
+    IndicatorSpec(
+        "stochastic", "Stokastik osilatör (%K, %D)", {"k_period": 14, "d_period": 3},
+        lambda c, p: kernels.stochastic(c["high"], c["low"], c["close"], p["k_period"], p["d_period"]),
+        lambda p: p["k_period"] + p["d_period"] - 2,
+        ("k", "d"),
+    ),
+    IndicatorSpec(
+        "obv", "Denge hacmi (On-Balance Volume)", {},
+        lambda c, p: kernels.obv(c["close"], c["volume"]),
+        lambda p: 0,
+    ),
+    IndicatorSpec(
+        "vwap", "Hacim ağırlıklı ortalama fiyat", {"anchor": "day"},
+        lambda c, p: kernels.vwap(c["high"], c["low"], c["close"], c["volume"], c["open_time"], p["anchor"]),
+        lambda p: 0,
+    ),
+)}
+
+VWAP_ANCHORS = ("day", "none")
+
+
+class StreamingIndicatorSet:
+    """Bir mum serisi için çözülmüş ayarlardan oluşturulan streaming indikatörler"""
+
+    def __init__(self, configs: List[IndicatorConfig]):
+        self.indicators: Dict[str, StreamingIndicator] = {
+            IndicatorManager.output_key(config): STREAMING_INDICATORS[config.name](config.params)
+            for config in configs
+        }
+
+    def seed(self, columns: CandleColumns) -> None:
+        """Tüm indikatörlerin durumunu kapanmış mumların kolonlarından kurar"""
+        for indicator in self.indicators.values():
+            indicator.seed(columns)
+
+    def update_many(self, columns: CandleColumns) -> Dict[str, np.ndarray]:
+        """
+        Kapanmış mum bloğunu tüm indikatörlere işler; IndicatorManager.calculate ile aynı
+        anahtarlarla blok uzunluğunda diziler döner. Ardışık bloklar tek seferde hesaplanmış
+        gibi aynı sonucu verir (durum bloktan bloğa taşınır).
+        """
+        result: Dict[str, np.ndarray] = {}
+        for key, indicator in self.indicators.items():
+            values = indicator.update_many(columns)
+            if isinstance(values, dict):
+                for output, output_values in values.items():
+                    result[f"{key}.{output}"] = output_values
+            else:
+                result[key] = values
+        return result
+
+    def update(self, candle: Candle, is_closed: bool) -> Dict[str, Optional[float]]:
+        """
+        Mum olayını tüm indikatörlere işler; batch çıktısıyla aynı düz anahtarlarla değerleri döner
+        (ör: 'rsi_14', 'macd_12_26_9.signal')
+        """
+        result: Dict[str, Optional[float]] = {}
+        for key, indicator in self.indicators.items():
+            value = indicator.update(candle, is_closed)
+            if isinstance(value, dict):
+                for output, output_value in value.items():
+                    result[f"{key}.{output}"] = output_value
+            else:
+                result[key] = value
+        return result
+
+
+class IndicatorManager:
+    """İndikatör ayarlarını çözen ve hesaplayan servis"""
+
+    @staticmethod
+    def list_indicators() -> List[IndicatorInfo]:
+        """Desteklenen indikatörleri ve varsayılan parametrelerini döner"""
+        return [
+            IndicatorInfo(name=spec.name, description=spec.description, params=spec.defaults, outputs=list(spec.outputs))
+            for spec in INDICATORS.values()
+        ]
+
+    @staticmethod
+    def resolve_configs(requested_indicators: Optional[List[str]] = None,
+                        configs: Optional[List[IndicatorConfig]] = None) -> List[IndicatorConfig]:
+        """
+        İstenen indikatör adlarını ve ayarları tek bir listede birleştirir
+
+        configs'teki her ayar olduğu gibi hesaplanır; requested_indicators'ta olup configs'te
+        bulunmayan adlar varsayılan parametrelerle eklenir.
+
+        Raises:
+            ValueError: Bilinmeyen indikatör/parametre veya geçersiz değer
+        """
+        resolved = [IndicatorManager._validate(config) for config in (configs or [])]
+        configured = {config.name for config in resolved}
+        for name in requested_indicators or []:
+            name = name.strip().lower()
+            if name and name not in configured:
+                resolved.append(IndicatorManager._validate(IndicatorConfig(name=name)))
+                configured.add(name)
+
+        if len(resolved) > MAX_INDICATORS:
+            raise ValueError(f"En fazla {MAX_INDICATORS} indikatör istenebilir")
+        keys = [IndicatorManager.output_key(config) for config in resolved]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Aynı çıktı anahtarına sahip birden fazla indikatör ayarı var")
+        return resolved
+
+    @staticmethod
+    def _validate(config: IndicatorConfig) -> IndicatorConfig:
+        name = config.name.strip().lower()
+        spec = INDICATORS.get(name)
+        if spec is None:
+            raise ValueError(f"Desteklenmeyen indikatör: {config.name}. Desteklenen: {', '.join(INDICATORS)}")
+
+        unknown = set(config.params) - set(spec.defaults)
+        if unknown:
+            raise ValueError(f"{name} için bilinmeyen parametre(ler): {', '.join(sorted(unknown))}")
+
+        params = dict(spec.defaults)
+        for key, value in config.params.items():
+            default = spec.defaults[key]
+            if isinstance(default, str):
+                params[key] = str(value)
+            elif isinstance(default, int):
+                if not isinstance(value, (int, float)) or int(value) != value or not 1 <= value <= MAX_PERIOD:
+                    raise ValueError(f"{name}.{key} 1 ile {MAX_PERIOD} arasında bir tam sayı olmalı")
+                params[key] = int(value)
+            else:
+                if not isinstance(value, (int, float)) or value <= 0:
+                    raise ValueError(f"{name}.{key} pozitif bir sayı olmalı")
+                params[key] = float(value)
+
+        if name == "vwap" and params["anchor"] not in VWAP_ANCHORS:
+            raise ValueError(f"vwap.anchor şunlardan biri olmalı: {', '.join(VWAP_ANCHORS)}")
+        if name == "macd" and params["fast"] >= params["slow"]:
+            raise ValueError("macd.fast, macd.slow'dan küçük olmalı")
+        return IndicatorConfig(name=name, params=params, id=config.id)
+
+    @staticmethod
+    def output_key(config: IndicatorConfig) -> str:
+        """Çıktı anahtarı: config.id veya ad + parametre değerleri (ör: 'bollinger_20_2')"""
+        if config.id:
+            return config.id
+        values = [str(v).rstrip("0").rstrip(".") if isinstance(v, float) else str(v) for v in config.params.values()]
+        return "_".join([config.name] + values)
+
+    @staticmethod
+    def get_lookback(configs: List[IndicatorConfig]) -> int:
+        """İlk döndürülen mumda değerlerin oturması için gereken ek geçmiş mum sayısı"""
+        return max((INDICATORS[config.name].lookback(config.params) for config in configs), default=0)
+
+    @staticmethod
+    def calculate(columns: CandleColumns, configs: List[IndicatorConfig]) -> Dict[str, np.ndarray]:
+        """
+        Çözülmüş ayarları kolonlar üzerinde hesaplar
+        Çok çıktılı indikatörler '<anahtar>.<çıktı>' olarak düzleştirilir
+        """
+        result: Dict[str, np.ndarray] = {}
+        for config in configs:
+            key = IndicatorManager.output_key(config)
+            values = INDICATORS[config.name].compute(columns, config.params)
+            if isinstance(values, dict):
+                for output, series in values.items():
+                    result[f"{key}.{output}"] = series
+            else:
+                result[key] = values
+        return result
+
+    @staticmethod
+    def to_json_series(values: np.ndarray) -> List[Optional[float]]:
+        """NaN değerleri None'a çevirerek JSON'a uygun listeye dönüştürür"""
+        return [None if v != v else v for v in values.tolist()]
+
+    @staticmethod
+    def create_streaming(configs: List[IndicatorConfig],
+                         history: Optional[CandleColumns] = None) -> StreamingIndicatorSet:
+        """
+        Canlı akış için O(1) güncellenen indikatör seti oluşturur
+        history verilirse (kapanmış mumlar) durum batch kernel'leriyle tohumlanır
+        """
+        streaming = StreamingIndicatorSet(configs)
+        if history is not None:
+            streaming.seed(history)
+        return streaming
+
+    def calculate_indicators_for_candles(self, candles: List[Candle],
+                                         configs: List[IndicatorConfig]) -> Dict[str, List[Optional[float]]]:
+        """Candle listesi için indikatörleri hesaplayıp mumlarla hizalı JSON serileri döner"""
+        series = self.calculate(candles_to_columns(candles), configs)
+        return {key: self.to_json_series(values) for key, values in series.items()}
+
+
+indicator_manager = IndicatorManager()
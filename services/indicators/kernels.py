@@ -0,0 +1,245 @@
+"""
+Indicator kernels - Mum kolonları üzerinde NumPy ile vektörize teknik indikatörler
+
+Her kernel giriş dizisiyle aynı uzunlukta float64 dizi(ler) döner; ısınma (warm-up)
+dönemindeki değerler NaN'dır. Özyinelemeli ortalamalar (EMA, Wilder) blok bazlı kapalı
+formla hesaplanır: Python döngüsü mum başına değil, birkaç bin mumluk blok başına döner.
+"""
+from typing import Dict
+
+import numpy as np
+
+
+DAY_MS = 86_400_000
+
+# Blok kapalı formunda izin verilen en büyük ölçek (w^-L); float64 taşmadan güvenle kalır
+_MAX_BLOCK_SCALE_LOG = 500.0
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def ewm_continue(x: np.ndarray, alpha: float, carry: float) -> np.ndarray:
+    """
+    y[i] = alpha * x[i] + (1 - alpha) * y[i-1], y[-1] = carry özyinelemesini vektörize hesaplar
+
+    Blok içinde y[j] = w^(j+1) * (carry + alpha * Σ x[k] * w^-(k+1)) kapalı formu kullanılır
+    (w = 1 - alpha); blok uzunluğu w^-L taşmayacak şekilde seçilir, carry bloktan bloğa aktarılır.
+    """
+    n = len(x)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    w = 1.0 - alpha
+    if w <= 0.0:
+        out[:] = x
+        return out
+
+    block = max(1, min(n, int(_MAX_BLOCK_SCALE_LOG / -np.log(w))))
+    inv_scale = w ** -np.arange(1, block + 1, dtype=np.float64)
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        scale = inv_scale[:len(chunk)]
+        out[start:start + len(chunk)] = (carry + alpha * np.cumsum(chunk * scale)) / scale
+        carry = out[start + len(chunk) - 1]
+    return out
+
+
+def seeded_ewm(x: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """İlk 'period' değerin ortalamasıyla tohumlanan üstel ortalama (TA-Lib kuralı)"""
+    n = len(x)
+    out = _nan(n)
+    if n < period:
+        return out
+    out[period - 1] = x[:period].mean()
+    out[period:] = ewm_continue(x[period:], alpha, out[period - 1])
+    return out
+
+
+# Kayan standart sapmada yerel merkezleme bloğu (çıktı satırı)
+_STD_BLOCK = 4096
+
+
+def rolling_max(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Uzunluğu 'period' olan pencerelerin maksimumu (len(x) - period + 1 değer)
+    van Herk/Gil-Werman: blok içi önek ve sonek maksimumları ile O(n)
+    """
+    n = len(x)
+    blocks = -(-n // period)
+    padded = np.full(blocks * period, -np.inf)
+    padded[:n] = x
+    grid = padded.reshape(blocks, period)
+    prefix = np.maximum.accumulate(grid, axis=1).ravel()
+    suffix = np.maximum.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.maximum(suffix[:n - period + 1], prefix[period - 1:n])
+
+
+def rolling_min(x: np.ndarray, period: int) -> np.ndarray:
+    return -rolling_max(-x, period)
+
+
+def rolling_std(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Uzunluğu 'period' olan pencerelerin popülasyon standart sapması (len(x) - period + 1 değer)
+    Kümülatif toplamlarla hesaplanır; iptal (cancellation) hatasını sınırlamak için değerler
+    blok bazında yerel ortalamaya göre merkezlenir.
+    """
+    n = len(x)
+    if period == 1:
+        return np.zeros(n)
+    out = np.empty(n - period + 1)
+    block = max(_STD_BLOCK, 4 * period)
+    for start in range(0, len(out), block):
+        stop = min(len(out), start + block)
+        segment = x[start:stop + period - 1]
+        centered = segment - segment.mean()
+        s1 = np.cumsum(np.concatenate(([0.0], centered)))
+        s2 = np.cumsum(np.concatenate(([0.0], centered * centered)))
+        mean = (s1[period:] - s1[:-period]) / period
+        variance = (s2[period:] - s2[:-period]) / period - mean * mean
+        out[start:stop] = np.sqrt(np.maximum(variance, 0.0))
+    return out
+
+
+def wilder(x: np.ndarray, period: int) -> np.ndarray:
+    """Wilder ortalaması (alpha = 1 / period, SMA tohumlu) - RSI ve ATR'nin temel ortalaması"""
+    return seeded_ewm(x, period, 1.0 / period)
+
+
+def gains_losses(close: np.ndarray):
+    """Ardışık kapanış farklarından kazanç ve kayıp dizileri (len(close) - 1 değer)"""
+    delta = np.diff(close)
+    return np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Gerçek aralık; ilk mumda high - low"""
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[0] = high[0] - low[0]
+    return tr
+
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """Ortalama kazanç/kayıptan RSI; kayıp yoksa 100 (hiç hareket yoksa 50)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + np.divide(avg_gain, avg_loss))
+    return np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), value)
+
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    """Basit hareketli ortalama"""
+    n = len(x)
+    out = _nan(n)
+    if n < period:
+        return out
+    csum = np.cumsum(np.concatenate(([0.0], x)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    """Üstel hareketli ortalama (alpha = 2 / (period + 1), SMA tohumlu)"""
+    return seeded_ewm(x, period, 2.0 / (period + 1))
+
+
+def wma(x: np.ndarray, period: int) -> np.ndarray:
+    """Doğrusal ağırlıklı hareketli ortalama (en yeni muma en büyük ağırlık)"""
+    n = len(x)
+    out = _nan(n)
+    if n < period:
+        return out
+    weights = np.arange(1, period + 1, dtype=np.float64)
+    out[period - 1:] = np.convolve(x, weights[::-1], mode="valid") / weights.sum()
+    return out
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """Göreceli güç endeksi (Wilder ortalamasıyla)"""
+    n = len(close)
+    out = _nan(n)
+    if n <= period:
+        return out
+    gains, losses = gains_losses(close)
+    avg_gain = wilder(gains, period)
+    avg_loss = wilder(losses, period)
+    out[1:] = np.where(np.isnan(avg_gain), np.nan, rsi_from_averages(avg_gain, avg_loss))
+    return out
+
+
+def macd(close: np.ndarray, fast: int, slow: int, signal: int) -> Dict[str, np.ndarray]:
+    """MACD çizgisi, sinyal çizgisi ve histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = _nan(len(close))
+    first = slow - 1
+    if len(close) > first:
+        signal_line[first:] = ema(line[first:], signal)
+    return {"macd": line, "signal": signal_line, "hist": line - signal_line}
+
+
+def bollinger(close: np.ndarray, period: int, stddev: float) -> Dict[str, np.ndarray]:
+    """Bollinger bantları (orta: SMA, bant: popülasyon standart sapması * stddev)"""
+    n = len(close)
+    middle = sma(close, period)
+    deviation = _nan(n)
+    if n >= period:
+        deviation[period - 1:] = rolling_std(close, period)
+    return {"upper": middle + stddev * deviation, "middle": middle, "lower": middle - stddev * deviation}
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """Ortalama gerçek aralık (Wilder ortalamasıyla)"""
+    if len(close) == 0:
+        return _nan(0)
+    return wilder(true_range(high, low, close), period)
+
+
+def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               k_period: int, d_period: int) -> Dict[str, np.ndarray]:
+    """Stokastik osilatör (%K ve %K'nın SMA'sı olan %D)"""
+    n = len(close)
+    k = _nan(n)
+    if n >= k_period:
+        highest = rolling_max(high, k_period)
+        lowest = rolling_min(low, k_period)
+        span = highest - lowest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k[k_period - 1:] = np.where(span > 0, 100.0 * (close[k_period - 1:] - lowest) / span, 50.0)
+    d = _nan(n)
+    if n >= k_period:
+        d[k_period - 1:] = sma(k[k_period - 1:], d_period)
+    return {"k": k, "d": d}
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Denge hacmi (On-Balance Volume), ilk mumda 0"""
+    if len(close) == 0:
+        return _nan(0)
+    signed = np.sign(np.diff(close)) * volume[1:]
+    return np.concatenate(([0.0], np.cumsum(signed)))
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         open_time: np.ndarray, anchor: str) -> np.ndarray:
+    """
+    Hacim ağırlıklı ortalama fiyat (tipik fiyat: (H + L + C) / 3)
+    anchor='day': her UTC gününde sıfırlanır, 'none': pencere boyunca kümülatif
+    """
+    n = len(close)
+    if n == 0:
+        return _nan(0)
+    pv = np.cumsum((high + low + close) / 3.0 * volume)
+    vol = np.cumsum(volume)
+    if anchor == "day":
+        day = open_time // DAY_MS
+        starts = np.concatenate(([True], day[1:] != day[:-1]))
+        # Her satır için kendi gününün başlangıcından önceki kümülatif toplam
+        start_index = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+        pv_before = np.concatenate(([0.0], pv))[start_index]
+        vol_before = np.concatenate(([0.0], vol))[start_index]
+        pv = pv - pv_before
+        vol = vol - vol_before
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(vol > 0, pv / vol, np.nan)
@@ -0,0 +1,754 @@
+"""
+Streaming indicators - Canlı mum akışı için O(1) güncellenen, durum tutan indikatörler
+
+Her indikatör son kapanmış muma kadar olan durumu (commit) tutar:
+- Kapanmış mum (is_closed=True) durumu ilerletir.
+- Açık mum (is_closed=False) sadece geçici (tentative) değer üretir; durum değişmez. Aynı mumun
+  her revizyonu aynı commit durumundan hesaplandığı için revizyonlar birikip sapma yaratmaz.
+- Kapanış olayı kaçırılırsa, daha yeni open_time'lı ilk mum geldiğinde bekleyen mum commit edilir.
+
+Soğuk başlangıçta durum, batch kernel'lerinin (kernels.py) geçmiş kolonlar üzerindeki
+çıktısından tohumlanır (seed); geçmiş baştan tek tek oynatılmaz. Büyük aralıkların parça parça
+işlenmesi için update_many, kapanmış mum bloklarını aynı durumdan devam ederek vektörize işler.
+"""
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from models.candle_models import Candle
+from services.candle_store.columns import CandleColumns
+from . import kernels
+
+
+IndicatorValue = Union[Optional[float], Dict[str, Optional[float]]]
+IndicatorValues = Union[np.ndarray, Dict[str, np.ndarray]]
+
+# Kayan toplamlar bu kadar commit'te bir pencereden yeniden hesaplanır (float birikim hatasına karşı)
+RECOMPUTE_EVERY = 1024
+
+
+def _finite(value) -> Optional[float]:
+    """NaN/None değerleri None'a, diğerlerini float'a çevirir"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _last_valid(values: np.ndarray) -> Optional[float]:
+    return _finite(values[-1]) if len(values) else None
+
+
+def _rsi_value(avg_gain: Optional[float], avg_loss: Optional[float]) -> Optional[float]:
+    if avg_gain is None or avg_loss is None:
+        return None
+    if avg_loss == 0.0:
+        return 50.0 if avg_gain == 0.0 else 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class _SeededEWM:
+    """İlk 'period' değerin ortalamasıyla tohumlanan üstel ortalama durumu"""
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.value: Optional[float] = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+
+    def next_value(self, x: float) -> Optional[float]:
+        """x eklenirse oluşacak değer (durumu değiştirmez)"""
+        if self.value is not None:
+            return self.alpha * x + (1.0 - self.alpha) * self.value
+        if self._seed_count + 1 == self.period:
+            return (self._seed_sum + x) / self.period
+        return None
+
+    def push(self, x: float) -> Optional[float]:
+        value = self.next_value(x)
+        if self.value is None:
+            self._seed_sum += x
+            self._seed_count += 1
+        self.value = value
+        return value
+
+    def push_many(self, x: np.ndarray) -> np.ndarray:
+        """x değerlerini sırayla ekler; her eleman için oluşan değeri (tohum öncesi NaN) döner"""
+        out = np.full(len(x), np.nan)
+        start = 0
+        if self.value is None:
+            needed = self.period - self._seed_count
+            if len(x) < needed:
+                self._seed_sum += float(x.sum())
+                self._seed_count += len(x)
+                return out
+            self._seed_sum += float(x[:needed].sum())
+            self._seed_count += needed
+            self.value = self._seed_sum / self.period
+            out[needed - 1] = self.value
+            start = needed
+        if start < len(x):
+            out[start:] = kernels.ewm_continue(x[start:], self.alpha, self.value)
+            self.value = float(out[-1])
+        return out
+
+    def seed(self, x: np.ndarray) -> None:
+        """Durumu batch kernel çıktısından kurar"""
+        batch = kernels.seeded_ewm(x, self.period, self.alpha)
+        self.value = _last_valid(batch)
+        if self.value is None:
+            self._seed_sum = float(x.sum())
+            self._seed_count = len(x)
+
+
+class _RollingWindow:
+    """Sabit uzunluklu pencere; toplam ve (merkezlenmiş) kareler toplamı O(1) güncellenir"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values: Deque[float] = deque(maxlen=period)
+        self.ref = 0.0          # Kareler toplamında iptal hatasını sınırlayan merkez
+        self.total = 0.0        # Σ (x - ref)
+        self.total_sq = 0.0     # Σ (x - ref)^2
+        self._pushes = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.period
+
+    def sums_with(self, x: float) -> Tuple[int, float, float]:
+        """x eklenirse pencerenin (eleman sayısı, toplam, kareler toplamı) değerleri"""
+        d = x - self.ref
+        total, total_sq, count = self.total + d, self.total_sq + d * d, len(self.values) + 1
+        if self.full:
+            old = self.values[0] - self.ref
+            total, total_sq, count = total - old, total_sq - old * old, count - 1
+        return count, total, total_sq
+
+    def push(self, x: float) -> None:
+        _, self.total, self.total_sq = self.sums_with(x)
+        self.values.append(x)
+        self._pushes += 1
+        if self._pushes % RECOMPUTE_EVERY == 0:
+            self.recompute()
+
+    def recompute(self) -> None:
+        values = np.fromiter(self.values, dtype=np.float64, count=len(self.values))
+        self.ref = float(values.mean()) if len(values) else 0.0
+        centered = values - self.ref
+        self.total = float(centered.sum())
+        self.total_sq = float((centered * centered).sum())
+
+    def push_many(self, x: np.ndarray, with_std: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """x değerlerini ekler; her eleman için pencere ortalamasını (ve istenirse std) döner"""
+        carried = len(self.values)
+        window = np.concatenate((np.fromiter(self.values, dtype=np.float64, count=carried), x))
+        mean = kernels.sma(window, self.period)[carried:]
+        std = None
+        if with_std:
+            std = np.full(len(window), np.nan)
+            if len(window) >= self.period:
+                std[self.period - 1:] = kernels.rolling_std(window, self.period)
+            std = std[carried:]
+        self.values.extend(x[-self.period:].tolist())
+        self._pushes += len(x)
+        self.recompute()
+        return mean, std
+
+    def seed(self, x: np.ndarray) -> None:
+        self.values.clear()
+        self.values.extend(x[-self.period:].tolist())
+        self.recompute()
+
+    def mean_with(self, x: float) -> Optional[float]:
+        count, total, _ = self.sums_with(x)
+        return self.ref + total / count if count == self.period else None
+
+    def std_with(self, x: float) -> Optional[float]:
+        count, total, total_sq = self.sums_with(x)
+        if count != self.period:
+            return None
+        mean = total / count
+        return math.sqrt(max(total_sq / count - mean * mean, 0.0))
+
+
+class StreamingIndicator(ABC):
+    """Commit / tentative ayrımıyla mum mum güncellenen indikatör"""
+
+    # Çok çıktılı indikatörlerin çıktı adları (tek çıktılılarda boş)
+    OUTPUTS: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.last_open_time: Optional[int] = None     # Son commit edilen mumun open_time'ı
+        self.value: IndicatorValue = None              # Son commit edilen mumdaki değer
+        self._pending: Optional[Candle] = None         # Kapanışı henüz görülmemiş mum
+
+    def update(self, candle: Candle, is_closed: bool) -> IndicatorValue:
+        """
+        Mum olayını işler ve bu mumdaki indikatör değerini döner
+
+        Args:
+            candle: Mum (aynı open_time ile birden fazla revizyon gelebilir)
+            is_closed: Mum kapandı mı (Binance kline olayında 'x')
+        """
+        if self.last_open_time is not None and candle.open_time <= self.last_open_time:
+            return self.value
+        if self._pending is not None and candle.open_time > self._pending.open_time:
+            self._commit_candle(self._pending)
+        self._pending = None
+
+        if is_closed:
+            return self._commit_candle(candle)
+        self._pending = candle
+        return self._peek(candle)
+
+    def _commit_candle(self, candle: Candle) -> IndicatorValue:
+        self.value = self._commit(candle)
+        self.last_open_time = candle.open_time
+        return self.value
+
+    def update_many(self, columns: CandleColumns) -> IndicatorValues:
+        """
+        Kapanmış mumları toplu işler ve her mum için değer dizisi döner (değeri olmayan mumlar NaN)
+
+        Durum ve değerler, aynı mumlar update(..., is_closed=True) ile tek tek işlenseydi
+        oluşacaklarla aynıdır. Son commit edilen mumdan eski mumlar atlanır (NaN).
+        """
+        open_times = columns["open_time"]
+        skip = 0
+        if self.last_open_time is not None:
+            skip = int(np.searchsorted(open_times, self.last_open_time, side="right"))
+        if self._pending is not None and skip < len(open_times) and open_times[skip] > self._pending.open_time:
+            self._commit_candle(self._pending)
+            skip = int(np.searchsorted(open_times, self.last_open_time, side="right"))
+        self._pending = None
+
+        if skip == len(open_times):
+            if self.OUTPUTS:
+                return {name: np.full(skip, np.nan) for name in self.OUTPUTS}
+            return np.full(skip, np.nan)
+
+        values = self._commit_many({name: column[skip:] for name, column in columns.items()})
+        self.last_open_time = int(open_times[-1])
+        if isinstance(values, dict):
+            self.value = {name: _last_valid(output) for name, output in values.items()}
+            return {name: self._pad(output, skip) for name, output in values.items()}
+        self.value = _last_valid(values)
+        return self._pad(values, skip)
+
+    @staticmethod
+    def _pad(values: np.ndarray, skip: int) -> np.ndarray:
+        return np.concatenate((np.full(skip, np.nan), values)) if skip else values
+
+    def seed(self, columns: CandleColumns) -> None:
+        """Durumu kapanmış mumların kolonları üzerinden batch kernel'lerle kurar"""
+        open_times = columns["open_time"]
+        if len(open_times) == 0:
+            return
+        self._seed(columns)
+        self.last_open_time = int(open_times[-1])
+        self._pending = None
+
+    @abstractmethod
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        """Kapanmış mumu duruma işler ve değeri döner"""
+        pass
+
+    @abstractmethod
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        """Açık mum için durumu değiştirmeden geçici değeri döner"""
+        pass
+
+    @abstractmethod
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        """Boş olmayan kapanmış mum bloğunu duruma işler ve değer dizilerini döner"""
+        pass
+
+    @abstractmethod
+    def _seed(self, columns: CandleColumns) -> None:
+        pass
+
+
+class StreamingSMA(StreamingIndicator):
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.window = _RollingWindow(period)
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        value = self.window.mean_with(candle.close)
+        self.window.push(candle.close)
+        return value
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self.window.mean_with(candle.close)
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        return self.window.push_many(columns["close"])[0]
+
+    def _seed(self, columns: CandleColumns) -> None:
+        self.window.seed(columns["close"])
+        self.value = _last_valid(kernels.sma(columns["close"], self.window.period))
+
+
+class StreamingEMA(StreamingIndicator):
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.ewm = _SeededEWM(period, 2.0 / (period + 1))
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        return self.ewm.push(candle.close)
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self.ewm.next_value(candle.close)
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        return self.ewm.push_many(columns["close"])
+
+    def _seed(self, columns: CandleColumns) -> None:
+        self.ewm.seed(columns["close"])
+        self.value = self.ewm.value
+
+
+class StreamingWMA(StreamingIndicator):
+    """W' = W + period * x - S, S' = S + x - en eski (pencere doluyken)"""
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.period = period
+        self.values: Deque[float] = deque(maxlen=period)
+        self.total = 0.0
+        self.weighted = 0.0
+        self._divisor = period * (period + 1) / 2.0
+        self._pushes = 0
+
+    def _next(self, x: float) -> Tuple[float, float, Optional[float]]:
+        if len(self.values) == self.period:
+            weighted = self.weighted + self.period * x - self.total
+            total = self.total + x - self.values[0]
+            return total, weighted, weighted / self._divisor
+        if len(self.values) == self.period - 1:
+            # Pencere bu mumla doluyor; ağırlıklı toplam bir kez doğrudan hesaplanır
+            window = list(self.values) + [x]
+            weighted = sum((i + 1) * v for i, v in enumerate(window))
+            return sum(window), weighted, weighted / self._divisor
+        return self.total + x, 0.0, None
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        self.total, self.weighted, value = self._next(candle.close)
+        self.values.append(candle.close)
+        self._pushes += 1
+        if self._pushes % RECOMPUTE_EVERY == 0:
+            self._recompute()
+        return value
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self._next(candle.close)[2]
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        close = columns["close"]
+        carried = len(self.values)
+        window = np.concatenate((np.fromiter(self.values, dtype=np.float64, count=carried), close))
+        values = kernels.wma(window, self.period)[carried:]
+        self.values.extend(close[-self.period:].tolist())
+        self._pushes += len(close)
+        self._recompute()
+        return values
+
+    def _recompute(self) -> None:
+        self.total = sum(self.values)
+        self.weighted = sum((i + 1) * v for i, v in enumerate(self.values)) if len(self.values) == self.period else 0.0
+
+    def _seed(self, columns: CandleColumns) -> None:
+        self.values.clear()
+        self.values.extend(columns["close"][-self.period:].tolist())
+        self._recompute()
+        self.value = _last_valid(kernels.wma(columns["close"], self.period))
+
+
+class StreamingRSI(StreamingIndicator):
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.prev_close: Optional[float] = None
+        self.gain = _SeededEWM(period, 1.0 / period)
+        self.loss = _SeededEWM(period, 1.0 / period)
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        if self.prev_close is None:
+            self.prev_close = candle.close
+            return None
+        delta = candle.close - self.prev_close
+        self.prev_close = candle.close
+        return _rsi_value(self.gain.push(max(delta, 0.0)), self.loss.push(max(-delta, 0.0)))
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        if self.prev_close is None:
+            return None
+        delta = candle.close - self.prev_close
+        return _rsi_value(self.gain.next_value(max(delta, 0.0)), self.loss.next_value(max(-delta, 0.0)))
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        close = columns["close"]
+        values = np.full(len(close), np.nan)
+        if self.prev_close is None:
+            # İlk mumun önceki kapanışı yok; sadece sonraki farkın tabanı olur
+            start = 1
+            gains, losses = kernels.gains_losses(close)
+        else:
+            start = 0
+            gains, losses = kernels.gains_losses(np.concatenate(([self.prev_close], close)))
+        avg_gain, avg_loss = self.gain.push_many(gains), self.loss.push_many(losses)
+        values[start:] = np.where(np.isnan(avg_gain), np.nan, kernels.rsi_from_averages(avg_gain, avg_loss))
+        self.prev_close = float(close[-1])
+        return values
+
+    def _seed(self, columns: CandleColumns) -> None:
+        close = columns["close"]
+        gains, losses = kernels.gains_losses(close)
+        self.gain.seed(gains)
+        self.loss.seed(losses)
+        self.prev_close = float(close[-1])
+        self.value = _rsi_value(self.gain.value, self.loss.value)
+
+
+class StreamingMACD(StreamingIndicator):
+
+    OUTPUTS = ("macd", "signal", "hist")
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        super().__init__()
+        self.fast = _SeededEWM(fast, 2.0 / (fast + 1))
+        self.slow = _SeededEWM(slow, 2.0 / (slow + 1))
+        self.signal = _SeededEWM(signal, 2.0 / (signal + 1))
+
+    @staticmethod
+    def _result(line: Optional[float], signal: Optional[float]) -> Dict[str, Optional[float]]:
+        hist = line - signal if line is not None and signal is not None else None
+        return {"macd": line, "signal": signal, "hist": hist}
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        fast, slow = self.fast.push(candle.close), self.slow.push(candle.close)
+        if fast is None or slow is None:
+            return self._result(None, None)
+        line = fast - slow
+        return self._result(line, self.signal.push(line))
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        fast, slow = self.fast.next_value(candle.close), self.slow.next_value(candle.close)
+        if fast is None or slow is None:
+            return self._result(None, None)
+        line = fast - slow
+        return self._result(line, self.signal.next_value(line))
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        close = columns["close"]
+        line = self.fast.push_many(close) - self.slow.push_many(close)
+        # Sinyal ortalamasına sadece MACD çizgisinin tanımlı olduğu mumlar girer
+        valid = ~np.isnan(line)
+        signal = np.full(len(close), np.nan)
+        signal[valid] = self.signal.push_many(line[valid])
+        return {"macd": line, "signal": signal, "hist": line - signal}
+
+    def _seed(self, columns: CandleColumns) -> None:
+        close = columns["close"]
+        self.fast.seed(close)
+        self.slow.seed(close)
+        line = kernels.ema(close, self.fast.period) - kernels.ema(close, self.slow.period)
+        self.signal.seed(line[self.slow.period - 1:])
+        self.value = self._result(_last_valid(line), self.signal.value)
+
+
+class StreamingBollinger(StreamingIndicator):
+
+    OUTPUTS = ("upper", "middle", "lower")
+
+    def __init__(self, period: int, stddev: float):
+        super().__init__()
+        self.window = _RollingWindow(period)
+        self.stddev = stddev
+
+    def _bands(self, x: float) -> Dict[str, Optional[float]]:
+        middle, deviation = self.window.mean_with(x), self.window.std_with(x)
+        if middle is None or deviation is None:
+            return {"upper": None, "middle": None, "lower": None}
+        return {"upper": middle + self.stddev * deviation, "middle": middle, "lower": middle - self.stddev * deviation}
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        value = self._bands(candle.close)
+        self.window.push(candle.close)
+        return value
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self._bands(candle.close)
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        middle, deviation = self.window.push_many(columns["close"], with_std=True)
+        band = self.stddev * deviation
+        return {"upper": middle + band, "middle": middle, "lower": middle - band}
+
+    def _seed(self, columns: CandleColumns) -> None:
+        self.window.seed(columns["close"])
+        bands = kernels.bollinger(columns["close"], self.window.period, self.stddev)
+        self.value = {name: _last_valid(values) for name, values in bands.items()}
+
+
+class StreamingATR(StreamingIndicator):
+
+    def __init__(self, period: int):
+        super().__init__()
+        self.prev_close: Optional[float] = None
+        self.ewm = _SeededEWM(period, 1.0 / period)
+
+    def _true_range(self, candle: Candle) -> float:
+        if self.prev_close is None:
+            return candle.high - candle.low
+        return max(candle.high - candle.low, abs(candle.high - self.prev_close), abs(candle.low - self.prev_close))
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        value = self.ewm.push(self._true_range(candle))
+        self.prev_close = candle.close
+        return value
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self.ewm.next_value(self._true_range(candle))
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        high, low, close = columns["high"], columns["low"], columns["close"]
+        previous = np.concatenate(([np.nan if self.prev_close is None else self.prev_close], close[:-1]))
+        # fmax NaN'ı yok sayar; önceki kapanış yoksa gerçek aralık high - low olur
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+        self.prev_close = float(close[-1])
+        return self.ewm.push_many(true_range)
+
+    def _seed(self, columns: CandleColumns) -> None:
+        self.ewm.seed(kernels.true_range(columns["high"], columns["low"], columns["close"]))
+        self.prev_close = float(columns["close"][-1])
+        self.value = self.ewm.value
+
+
+class StreamingStochastic(StreamingIndicator):
+    """%K penceresinin en yüksek/en düşük değerleri monoton kuyruklarla amortize O(1) tutulur"""
+
+    OUTPUTS = ("k", "d")
+
+    def __init__(self, k_period: int, d_period: int):
+        super().__init__()
+        self.k_period = k_period
+        self.index = 0                                        # Sıradaki mumun indeksi
+        self.highs: Deque[Tuple[int, float]] = deque()        # Azalan yüksekler (indeks, değer)
+        self.lows: Deque[Tuple[int, float]] = deque()         # Artan düşükler (indeks, değer)
+        self.k_window = _RollingWindow(d_period)
+
+    def _extreme(self, queue: Deque[Tuple[int, float]], x: float, pick) -> float:
+        """Yeni mum eklendiğinde pencerenin uç değeri (pencere dışına düşen eleman atlanır)"""
+        oldest = self.index - self.k_period + 1
+        for i, value in queue:
+            if i >= oldest:
+                return pick(value, x)
+        return x
+
+    def _k_with(self, candle: Candle) -> Optional[float]:
+        if self.index < self.k_period - 1:
+            return None
+        highest = self._extreme(self.highs, candle.high, max)
+        lowest = self._extreme(self.lows, candle.low, min)
+        span = highest - lowest
+        return 100.0 * (candle.close - lowest) / span if span > 0 else 50.0
+
+    def _result(self, k: Optional[float], window_d: Optional[float]) -> Dict[str, Optional[float]]:
+        return {"k": k, "d": window_d}
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        k = self._k_with(candle)
+        d = None
+        if k is not None:
+            d = self.k_window.mean_with(k)
+            self.k_window.push(k)
+
+        oldest = self.index - self.k_period + 1
+        self._push_extremes(self.index, candle.high, candle.low)
+        while self.highs[0][0] < oldest:
+            self.highs.popleft()
+        while self.lows[0][0] < oldest:
+            self.lows.popleft()
+        self.index += 1
+        return self._result(k, d)
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        k = self._k_with(candle)
+        return self._result(k, self.k_window.mean_with(k) if k is not None else None)
+
+    def _push_extremes(self, index: int, high: float, low: float) -> None:
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((index, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((index, low))
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        high, low, close = columns["high"], columns["low"], columns["close"]
+        n, k_period = len(close), self.k_period
+
+        # Önceki mumlardan pencereye giren kısım kuyruklardan kurulur; kuyruktan düşmüş
+        # elemanlar daha yeni bir elemanca baskılandığı için ±inf ile temsil edilebilir
+        carried = min(k_period - 1, self.index)
+        first = self.index - carried
+        all_high = np.concatenate((np.full(carried, -np.inf), high))
+        all_low = np.concatenate((np.full(carried, np.inf), low))
+        for i, value in self.highs:
+            if i >= first:
+                all_high[i - first] = value
+        for i, value in self.lows:
+            if i >= first:
+                all_low[i - first] = value
+
+        k = np.full(n, np.nan)
+        total = carried + n
+        if total >= k_period:
+            # Pencere ilk kez 'begin' satırında dolar
+            begin = max(0, k_period - 1 - carried)
+            offset = carried + begin - k_period + 1
+            highest = kernels.rolling_max(all_high, k_period)[offset:]
+            lowest = kernels.rolling_min(all_low, k_period)[offset:]
+            span = highest - lowest
+            with np.errstate(divide="ignore", invalid="ignore"):
+                k[begin:] = np.where(span > 0, 100.0 * (close[begin:] - lowest) / span, 50.0)
+
+        d = np.full(n, np.nan)
+        valid = ~np.isnan(k)
+        d[valid] = self.k_window.push_many(k[valid])[0]
+
+        self.highs.clear()
+        self.lows.clear()
+        for position in range(max(0, total - k_period), total):
+            self._push_extremes(first + position, float(all_high[position]), float(all_low[position]))
+        self.index += n
+        return {"k": k, "d": d}
+
+    def _seed(self, columns: CandleColumns) -> None:
+        high, low = columns["high"], columns["low"]
+        n = len(high)
+        self.highs.clear()
+        self.lows.clear()
+        for i in range(max(0, n - self.k_period), n):
+            self._push_extremes(i, float(high[i]), float(low[i]))
+        self.index = n
+
+        result = kernels.stochastic(high, low, columns["close"], self.k_period, self.k_window.period)
+        valid_k = result["k"][self.k_period - 1:]
+        self.k_window.seed(valid_k)
+        self.value = self._result(_last_valid(result["k"]), _last_valid(result["d"]))
+
+
+class StreamingOBV(StreamingIndicator):
+
+    def __init__(self):
+        super().__init__()
+        self.prev_close: Optional[float] = None
+        self.total = 0.0
+
+    def _next(self, candle: Candle) -> float:
+        if self.prev_close is None or candle.close == self.prev_close:
+            return self.total
+        return self.total + (candle.volume if candle.close > self.prev_close else -candle.volume)
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        self.total = self._next(candle)
+        self.prev_close = candle.close
+        return self.total
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self._next(candle)
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        close = columns["close"]
+        previous = np.concatenate((close[:1] if self.prev_close is None else [self.prev_close], close[:-1]))
+        values = self.total + np.cumsum(np.sign(close - previous) * columns["volume"])
+        self.total = float(values[-1])
+        self.prev_close = float(close[-1])
+        return values
+
+    def _seed(self, columns: CandleColumns) -> None:
+        self.total = float(kernels.obv(columns["close"], columns["volume"])[-1])
+        self.prev_close = float(columns["close"][-1])
+        self.value = self.total
+
+
+class StreamingVWAP(StreamingIndicator):
+
+    def __init__(self, anchor: str):
+        super().__init__()
+        self.anchor = anchor
+        self.day: Optional[int] = None
+        self.pv = 0.0
+        self.volume = 0.0
+
+    def _next(self, candle: Candle) -> Tuple[int, float, float, Optional[float]]:
+        day = candle.open_time // kernels.DAY_MS
+        pv, volume = self.pv, self.volume
+        if self.anchor == "day" and day != self.day:
+            pv, volume = 0.0, 0.0
+        pv += (candle.high + candle.low + candle.close) / 3.0 * candle.volume
+        volume += candle.volume
+        return day, pv, volume, (pv / volume if volume > 0 else None)
+
+    def _commit(self, candle: Candle) -> IndicatorValue:
+        self.day, self.pv, self.volume, value = self._next(candle)
+        return value
+
+    def _peek(self, candle: Candle) -> IndicatorValue:
+        return self._next(candle)[3]
+
+    def _commit_many(self, columns: CandleColumns) -> IndicatorValues:
+        day = columns["open_time"] // kernels.DAY_MS
+        typical = (columns["high"] + columns["low"] + columns["close"]) / 3.0
+        pv = np.cumsum(typical * columns["volume"])
+        volume = np.cumsum(columns["volume"])
+        if self.anchor == "day":
+            starts = np.concatenate(([self.day is None or day[0] != self.day], day[1:] != day[:-1]))
+            start_index = np.maximum.accumulate(np.where(starts, np.arange(len(day)), 0))
+            pv = pv - np.concatenate(([0.0], pv))[start_index]
+            volume = volume - np.concatenate(([0.0], volume))[start_index]
+            # Önceki bloğun günü devam ediyorsa ilk grubun toplamlarına taşınan durum eklenir
+            if not starts[0]:
+                first_group = start_index == 0
+                pv = pv + np.where(first_group, self.pv, 0.0)
+                volume = volume + np.where(first_group, self.volume, 0.0)
+        else:
+            pv = pv + self.pv
+            volume = volume + self.volume
+
+        self.day, self.pv, self.volume = int(day[-1]), float(pv[-1]), float(volume[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(volume > 0, pv / volume, np.nan)
+
+    def _seed(self, columns: CandleColumns) -> None:
+        day = columns["open_time"] // kernels.DAY_MS
+        mask = day == day[-1] if self.anchor == "day" else np.ones(len(day), dtype=bool)
+        typical = (columns["high"][mask] + columns["low"][mask] + columns["close"][mask]) / 3.0
+        self.day = int(day[-1])
+        self.pv = float((typical * columns["volume"][mask]).sum())
+        self.volume = float(columns["volume"][mask].sum())
+        self.value = self.pv / self.volume if self.volume > 0 else None
+
+
+# İndikatör adı -> çözülmüş parametrelerden streaming nesnesi üreten fabrika
+STREAMING_INDICATORS = {
+    "sma": lambda p: StreamingSMA(p["period"]),
+    "ema": lambda p: StreamingEMA(p["period"]),
+    "wma": lambda p: StreamingWMA(p["period"]),
+    "rsi": lambda p: StreamingRSI(p["period"]),
+    "macd": lambda p: StreamingMACD(p["fast"], p["slow"], p["signal"]),
+    "bollinger": lambda p: StreamingBollinger(p["period"], p["stddev"]),
+    "atr": lambda p: StreamingATR(p["period"]),
+    "stochastic": lambda p: StreamingStochastic(p["k_period"], p["d_period"]),
+    "obv": lambda p: StreamingOBV(),
+    "vwap": lambda p: StreamingVWAP(p["anchor"]),
+}
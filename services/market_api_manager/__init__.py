@@ -3,13 +3,18 @@ Market API Manager module for DeepTradeAnalysis API.
 """
 
 from .market_api_manager import MarketAPIServiceManager
-from .market_api_interface import MarketAPIServiceInterface
-from .binance_api_service import BinanceAPIService
-from .coingecko_api_service import CoinGeckoAPIService
+from .market_api_interface import MarketAPIServiceInterface, AsyncMarketAPIServiceInterface
+from .binance_api_service import BinanceAPIService, AsyncBinanceAPIService
+from .coingecko_api_service import CoinGeckoAPIService, AsyncCoinGeckoAPIService
+from .market_provider_registry import MarketProviderRegistry
 
 __all__ = [
     'MarketAPIServiceManager',
     'MarketAPIServiceInterface',
+    'AsyncMarketAPIServiceInterface',
     'BinanceAPIService',
-    'CoinGeckoAPIService'
+    'AsyncBinanceAPIService',
+    'CoinGeckoAPIService',
+    'AsyncCoinGeckoAPIService',
+    'MarketProviderRegistry'
 ]
\ No newline at end of file
@@ -1,114 +1,258 @@
 """
-Binance API servisi - Sadece sembol listesi için basit servis
+Binance API servisi - Sembol listesi, geçmiş mumlar ve kline WebSocket stream'i
 """
-from typing import List
-from .market_api_interface import MarketAPIServiceInterface
+import json
+from typing import List, Optional, Set
+import httpx
+import numpy as np
+import websockets
+from pydantic import TypeAdapter
+from websockets.asyncio.client import ClientConnection, connect
+from .market_api_interface import (
+    MarketAPIServiceInterface, AsyncMarketAPIServiceInterface, CandleEvent, CandleStream, CandleStreamConnection
+)
+from .rate_limiter import RateLimitExceeded
 from binance.client import Client
+from requests.adapters import HTTPAdapter
+from core.config import MARKET_HTTP_POOL_SIZE
 from models.symbol_models import Symbol
 from models.market_models import Market
- 
+from models.candle_models import Candle
+from services.candle_store.columns import CANDLE_COLUMNS, CandleColumns, empty_columns
 
-class BinanceAPIService(MarketAPIServiceInterface):
-    """Binance API servisi - Sembol listesi için basit servis"""
-
-    market_info = Market(
-        id="binance",
-        name="Binance",
-        description="Dünyanın en büyük kripto para borsalarından biri.",
-        rate_limits={"requests_per_minute": 1200},
-        website="https://www.binance.com"
+
+BINANCE_MARKET_INFO = Market(
+    id="binance",
+    name="Binance",
+    description="Dünyanın en büyük kripto para borsalarından biri.",
+    rate_limits={"requests_per_minute": 1200},
+    website="https://www.binance.com"
+)
+
+
+# Binance klines isteği başına en fazla mum sayısı
+KLINES_MAX_LIMIT = 1000
+
+
+# Combined stream uç noktası; olaylar {"stream": ..., "data": ...} zarfıyla gelir
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"
+
+# Binance bağlantı başına en fazla 1024 stream'e izin verir
+BINANCE_WS_MAX_STREAMS = 1024
+
+# Bağlantı URL'sine yazılan en fazla stream; kalanlar açılıştan sonra SUBSCRIBE ile eklenir
+BINANCE_WS_URL_STREAMS = 100
+
+
+# Binance kline dizisindeki alan sırası
+KLINE_FIELDS = (
+    "open_time", "open", "high", "low", "close", "volume", "close_time",
+    "quote_asset_volume", "number_of_trades", "taker_buy_base_asset_volume",
+    "taker_buy_quote_asset_volume", "ignore",
+)
+_KLINE_INDEX = {name: i for i, name in enumerate(KLINE_FIELDS)}
+
+_candle_list_adapter = TypeAdapter(List[Candle])
+
+
+def parse_klines(klines: List[list]) -> List[Candle]:
+    """
+    Binance kline dizilerini Candle listesine çevirir
+    Tüm sayfa tek bir toplu doğrulama çağrısıyla (pydantic-core) işlenir; string fiyatlar
+    float'a orada çevrilir
+    """
+    return _candle_list_adapter.validate_python([dict(zip(KLINE_FIELDS, kline)) for kline in klines])
+
+
+def parse_klines_columns(klines: List[list]) -> CandleColumns:
+    """
+    Binance kline dizilerini Candle modeline uğramadan doğrudan kolon dizilerine çevirir
+    Alan başına tek bir numpy dönüşümü yapılır (string fiyatlar dahil)
+    """
+    if not klines:
+        return empty_columns()
+    fields = list(zip(*klines))
+    return {
+        name: np.array(fields[_KLINE_INDEX[name]], dtype=dtype)
+        for name, dtype in CANDLE_COLUMNS
+    }
+
+
+def kline_stream_name(symbol: str, interval: str) -> str:
+    """Binance kline stream adı (ör: btcusdt@kline_1m)"""
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+def parse_kline_event(payload: dict) -> Optional[CandleEvent]:
+    """
+    Binance kline WebSocket mesajını CandleEvent'e çevirir
+    Kline olmayan mesajlar (ör: SUBSCRIBE yanıtları) için None döner
+    """
+    data = payload.get("data", payload)
+    if not isinstance(data, dict) or data.get("e") != "kline":
+        return None
+    kline = data["k"]
+    candle = Candle(
+        open_time=kline["t"],
+        open=kline["o"],
+        high=kline["h"],
+        low=kline["l"],
+        close=kline["c"],
+        volume=kline["v"],
+        close_time=kline["T"],
+        quote_asset_volume=kline["q"],
+        taker_buy_base_asset_volume=kline["V"],
+        taker_buy_quote_asset_volume=kline["Q"],
+        number_of_trades=kline["n"],
     )
+    return CandleEvent(kline["s"], kline["i"], candle, bool(kline["x"]))
+
+
+class BinanceKlineConnection(CandleStreamConnection):
+    """Binance combined stream bağlantısı; stream'ler SUBSCRIBE/UNSUBSCRIBE mesajlarıyla değişir"""
+
+    def __init__(self, websocket: ClientConnection, owner: "AsyncBinanceAPIService"):
+        self.websocket = websocket
+        self._owner = owner
+        self._request_id = 0
+
+    async def _send(self, method: str, streams: List[CandleStream]) -> None:
+        if not streams:
+            return
+        self._request_id += 1
+        await self.websocket.send(json.dumps({
+            "method": method,
+            "params": [kline_stream_name(symbol, interval) for symbol, interval in streams],
+            "id": self._request_id,
+        }))
+
+    async def subscribe(self, streams: List[CandleStream]) -> None:
+        await self._send("SUBSCRIBE", streams)
+
+    async def unsubscribe(self, streams: List[CandleStream]) -> None:
+        await self._send("UNSUBSCRIBE", streams)
+
+    async def events(self):
+        try:
+            async for message in self.websocket:
+                event = parse_kline_event(json.loads(message))
+                if event is not None:
+                    yield event
+        except websockets.ConnectionClosed as e:
+            raise ConnectionError(f"Binance kline stream'i koptu: {str(e)}") from e
+        raise ConnectionError("Binance kline stream'i kapandı")
+
+    async def close(self) -> None:
+        self._owner._ws_connections.discard(self)
+        await self.websocket.close()
+
+
+def parse_exchange_info_symbols(exchange_info: dict) -> List[Symbol]:
+    """Binance exchange info yanıtından TRADING durumundaki USDT paritelerini çıkarır"""
+    filtered_symbols = []
+    for symbol in exchange_info.get("symbols", []):
+        if symbol.get("status") == "TRADING" and symbol.get("quoteAsset") == "USDT":
+            filtered_symbols.append(Symbol(
+                symbol=symbol.get("symbol"),
+                base_asset=symbol.get("baseAsset"),
+                quote_asset=symbol.get("quoteAsset")
+            ))
+    return filtered_symbols
+
+
+class AsyncBinanceAPIService(AsyncMarketAPIServiceInterface):
+    """Binance async API servisi - paylaşılan httpx.AsyncClient üzerinde"""
+
+    market_info = BINANCE_MARKET_INFO
+    base_url = "https://api.binance.com"
+    used_weight_header = "x-mbx-used-weight-1m"
+    max_streams_per_connection = BINANCE_WS_MAX_STREAMS
 
     def __init__(self):
+        super().__init__()
+        self._ws_connections: Set[BinanceKlineConnection] = set()
+
+    async def get_symbols(self) -> List[Symbol]:
+        """Binance USDT pariteli sembolleri döner"""
+        try:
+            payload = await self._get_json("/api/v3/exchangeInfo", weight=20)
+            return parse_exchange_info_symbols(payload)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            raise Exception(f"Binance exchange info hatası: {str(e)}")
+
+    async def _get_klines(self, symbol: str, interval: str, start_time: Optional[int],
+                          end_time: Optional[int], limit: int) -> List[list]:
+        """Binance /api/v3/klines ham yanıtını döner (istek başına en fazla 1000 mum)"""
+        params = {"symbol": symbol, "interval": interval, "limit": min(limit, KLINES_MAX_LIMIT)}
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        try:
+            return await self._get_json("/api/v3/klines", params=params, weight=2)
+        except RateLimitExceeded:
+            raise
+        except httpx.HTTPStatusError as e:
+            # Geçersiz sembol/interval gibi istemci hataları 400 ile döner
+            if e.response.status_code == 400:
+                raise ValueError(f"Binance klines isteği geçersiz: {e.response.text}")
+            raise Exception(f"Binance historical klines hatası: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Binance historical klines hatası: {str(e)}")
+
+    async def get_historical_candles(self, symbol: str, interval: str, start_time: Optional[int] = None,
+                                     end_time: Optional[int] = None, limit: int = 500) -> List[Candle]:
+        """Binance geçmiş mum verilerini döner (tarih aralığı destekli, istek başına en fazla 1000)"""
+        return parse_klines(await self._get_klines(symbol, interval, start_time, end_time, limit))
+
+    async def get_historical_candle_columns(self, symbol: str, interval: str, start_time: Optional[int] = None,
+                                            end_time: Optional[int] = None, limit: int = 500) -> CandleColumns:
+        """Binance geçmiş mum verilerini kolon dizileri olarak döner (depoya yazma yolu)"""
+        return parse_klines_columns(await self._get_klines(symbol, interval, start_time, end_time, limit))
+
+    def supports_candle_ws(self) -> bool:
+        return True
+
+    async def ws_candle_stream(self, streams: List[CandleStream]) -> BinanceKlineConnection:
+        """Verilen kline stream'lerine abone bir combined stream bağlantısı açar"""
+        if len(streams) > self.max_streams_per_connection:
+            raise ValueError(f"Binance bağlantı başına en fazla {self.max_streams_per_connection} stream taşır")
+        names = [kline_stream_name(symbol, interval) for symbol, interval in streams[:BINANCE_WS_URL_STREAMS]]
+        url = f"{BINANCE_WS_URL}?streams={'/'.join(names)}" if names else BINANCE_WS_URL
+        websocket = await connect(url, open_timeout=10, max_queue=1024)
+        connection = BinanceKlineConnection(websocket, self)
+        self._ws_connections.add(connection)
+        await connection.subscribe(streams[BINANCE_WS_URL_STREAMS:])
+        return connection
+
+    async def disconnect_stream(self) -> None:
+        """Açık kline stream bağlantılarını kapatır"""
+        for connection in list(self._ws_connections):
+            await connection.close()
+
+
+class BinanceAPIService(MarketAPIServiceInterface):
+    """Binance sync API servisi - async servisle aynı parse mantığını kullanan ince sarmalayıcı"""
+
+    market_info = BINANCE_MARKET_INFO
+
+    def __init__(self, pool_size: int = MARKET_HTTP_POOL_SIZE):
         # REST API için sync client - public endpoints, anahtarsız kullanım
+        # Client constructor'ı Binance'e ping atar; bu yüzden servis uzun ömürlü tutulmalı
         self.client = Client(api_key=None, api_secret=None)
-    
+        # Eşzamanlı istekler için keep-alive bağlantı havuzunu büyüt
+        self.client.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+    def close(self) -> None:
+        """HTTP session'ını kapatır"""
+        self.client.close_connection()
+
 
     def get_symbols(self) -> List[Symbol]:
         """Binance USDT pariteli sembolleri döner"""
         try:
-            exchange_info = self.client.get_exchange_info()
-            symbols = exchange_info.get("symbols", [])
-            
-            filtered_symbols = []
-            for symbol in symbols:
-                if symbol.get("status") == "TRADING" and symbol.get("quoteAsset") == "USDT":
-                    filtered_symbols.append(Symbol(
-                        symbol=symbol.get("symbol"),
-                        base_asset=symbol.get("baseAsset"),
-                        quote_asset=symbol.get("quoteAsset")
-                    ))
-            return filtered_symbols
+            return parse_exchange_info_symbols(self.client.get_exchange_info())
         except Exception as e:
             raise Exception(f"Binance exchange info hatası: {str(e)}")
-
-
-# ============================================================================
-# YORUMLANMIŞ METODLAR - Sonra aktif edilecek
-# ============================================================================
-
-# def get_candles(self, symbol: str, interval: str, limit: int = 500) -> List[dict]:
-#     """Binance mum verilerini döner (son N adet)"""
-#     try:
-#         logger.info(f"🔍 Binance'den veri çekiliyor: {symbol} {interval} limit={limit}")
-#         
-#         # Binance klines API çağrısı
-#         klines = self.client.get_klines(
-#             symbol=symbol,
-#             interval=interval,
-#             limit=limit
-#         )
-#         
-#         logger.info(f"✅ Binance'den {len(klines)} mum verisi alındı")
-#         
-#         # Binance formatını standart formata çevir
-#         candles = []
-#         for kline in klines:
-#             candles.append({
-#                 "open_time": int(kline[0]),
-#                 "open": str(kline[1]),
-#                 "high": str(kline[2]),
-#                 "low": str(kline[3]),
-#                 "close": str(kline[4]),
-#                 "volume": str(kline[5]),
-#                 "close_time": int(kline[6]),
-#                 "quote_asset_volume": str(kline[7]),
-#                 "taker_buy_base_asset_volume": str(kline[9]),
-#                 "taker_buy_quote_asset_volume": str(kline[10])
-#             })
-#         
-#         logger.info(f"📊 {len(candles)} mum formatlandı")
-#         return candles
-#     except Exception as e:
-#         print(f"❌ Binance klines hatası: {str(e)}")
-#         print(f"❌ Hata detayı: {type(e).__name__}")
-#         raise Exception(f"Binance klines hatası: {str(e)}")
- 
-# def get_historical_candles(self, symbol: str, interval: str, start_time: Optional[int] = None,
-#                             end_time: Optional[int] = None, limit: int = 500) -> List[dict]:
-#     """Binance geçmiş mum verilerini döner (tarih aralığı destekli)"""
-#     try:
-#         klines = self.client.get_klines(
-#             symbol=symbol,
-#             interval=interval,
-#             startTime=start_time,
-#             endTime=end_time,
-#             limit=limit
-#         )
-#         candles = []
-#         for kline in klines:
-#             candles.append({
-#                 "open_time": int(kline[0]),
-#                 "open": str(kline[1]),
-#                 "high": str(kline[2]),
-#                 "low": str(kline[3]),
-#                 "close": str(kline[4]),
-#                 "volume": str(kline[5]),
-#                 "close_time": int(kline[6]),
-#                 "quote_asset_volume": str(kline[7]),
-#                 "taker_buy_base_asset_volume": str(kline[9]),
-#                 "taker_buy_quote_asset_volume": str(kline[10])
-#             })
-#         return candles
-#     except Exception as e:
-#         raise Exception(f"Binance historical klines hatası: {str(e)}")
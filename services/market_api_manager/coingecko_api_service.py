@@ -3,42 +3,82 @@ CoinGecko API servisi - Basit sembol listesi çeken servis (pycoingecko kullanı
 """
 from typing import List
 from pycoingecko import CoinGeckoAPI
-from .market_api_interface import MarketAPIServiceInterface
+from requests.adapters import HTTPAdapter
+from core.config import MARKET_HTTP_POOL_SIZE
+from .market_api_interface import MarketAPIServiceInterface, AsyncMarketAPIServiceInterface
+from .rate_limiter import RateLimitExceeded
 from models.symbol_models import Symbol
 from models.market_models import Market
 
+
+COINGECKO_MARKET_INFO = Market(
+    id="coingecko",
+    name="CoinGecko",
+    description="Kripto para fiyatlarını ve piyasa verilerini sunan platform.",
+    rate_limits={"requests_per_minute": 50},
+    website="https://www.coingecko.com"
+)
+
+
+def parse_coins_list_symbols(coins: List[dict]) -> List[Symbol]:
+    """CoinGecko coin listesini sembollere dönüştürür
+
+    CoinGecko coin listesi 'id' ve 'symbol' içerir; buralardan simbolleri dönüştüreceğiz.
+    Bu metod, Binance gibi 'BTCUSDT' formatında döndürmez; bunun yerine coin'un symbol'ünü
+    uppercase + 'USDT' append ederek basit bir mapping sağlayabiliriz (örn: 'btc' -> 'BTCUSDT').
+    """
+    filtered = []
+    for c in coins:
+        sym = c.get('symbol')
+        if not sym:
+            continue
+        # Harici mapping: sadece 3-6 karakter semboller al
+        s = sym.upper()
+        if len(s) >= 2 and len(s) <= 6:
+            filtered.append(Symbol(symbol=f"{s}USDT", base_asset=s, quote_asset="USDT"))
+    return filtered
+
+
+class AsyncCoinGeckoAPIService(AsyncMarketAPIServiceInterface):
+    """CoinGecko async servisi - paylaşılan httpx.AsyncClient üzerinde"""
+
+    market_info = COINGECKO_MARKET_INFO
+    base_url = "https://api.coingecko.com"
+
+    # Ücretsiz plan dakikada 50 istekle sınırlı; geniş bir havuza gerek yok
+    max_connections = 5
+
+    async def get_symbols(self) -> List[Symbol]:
+        """CoinGecko üzerinden coin listesi getirir ve sembolleri USDT benzeri formatta döndürür"""
+        try:
+            payload = await self._get_json("/api/v3/coins/list", weight=1)
+            return parse_coins_list_symbols(payload)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            raise Exception(f"CoinGecko error: {e}")
+
+
 class CoinGeckoAPIService(MarketAPIServiceInterface):
-    """CoinGecko servisi - ücretsiz ve anahtarsız"""
+    """CoinGecko sync servisi - async servisle aynı parse mantığını kullanan ince sarmalayıcı"""
 
-    market_info = Market(
-        id="coingecko",
-        name="CoinGecko",
-        description="Kripto para fiyatlarını ve piyasa verilerini sunan platform.",
-        rate_limits={"requests_per_minute": 50},
-        website="https://www.coingecko.com"
-    )
+    market_info = COINGECKO_MARKET_INFO
 
-    def __init__(self):
+    def __init__(self, pool_size: int = MARKET_HTTP_POOL_SIZE):
         self.client = CoinGeckoAPI()
+        # pycoingecko'nun retry ayarını koruyarak keep-alive bağlantı havuzunu büyüt
+        self.client.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=self.client.session.get_adapter("https://").max_retries)
+        )
 
-    def get_symbols(self) -> List[Symbol]:
-        """CoinGecko üzerinden coin listesi getirir ve sembolleri USDT benzeri formatta döndürür
+    def close(self) -> None:
+        """HTTP session'ını kapatır"""
+        self.client.session.close()
 
-        CoinGecko coin listesi 'id' ve 'symbol' içerir; buralardan simbolleri dönüştüreceğiz.
-        Bu metod, Binance gibi 'BTCUSDT' formatında döndürmez; bunun yerine coin'un symbol'ünü
-        uppercase + 'USDT' append ederek basit bir mapping sağlayabiliriz (örn: 'btc' -> 'BTCUSDT').
-        """
+    def get_symbols(self) -> List[Symbol]:
+        """CoinGecko üzerinden coin listesi getirir ve sembolleri USDT benzeri formatta döndürür"""
         try:
-            coins = self.client.get_coins_list()
-            filtered = []
-            for c in coins:
-                sym = c.get('symbol')
-                if not sym:
-                    continue
-                # Harici mapping: sadece 3-6 karakter semboller al
-                s = sym.upper()
-                if len(s) >= 2 and len(s) <= 6:
-                    filtered.append(Symbol(symbol=f"{s}USDT", base_asset=s, quote_asset="USDT"))
-            return filtered
+            return parse_coins_list_symbols(self.client.get_coins_list())
         except Exception as e:
             raise Exception(f"CoinGecko error: {e}")
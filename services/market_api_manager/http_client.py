@@ -0,0 +1,29 @@
+"""
+Market HTTP Client - Async market servisleri için paylaşılan httpx.AsyncClient fabrikası
+"""
+import httpx
+from core.config import MARKET_HTTP_TIMEOUT_SECONDS, MARKET_HTTP2_ENABLED
+
+
+def create_market_http_client(base_url: str, max_connections: int) -> httpx.AsyncClient:
+    """
+    Market için keep-alive havuzlu, (destekleniyorsa) HTTP/2 kullanan async client oluşturur
+
+    Args:
+        base_url: Market REST API kök adresi
+        max_connections: Bu market için eşzamanlı açık bağlantı üst sınırı
+
+    Returns:
+        httpx.AsyncClient: Market servisi ömrü boyunca paylaşılan client
+    """
+    return httpx.AsyncClient(
+        base_url=base_url,
+        http2=MARKET_HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0
+        ),
+        timeout=httpx.Timeout(MARKET_HTTP_TIMEOUT_SECONDS),
+        headers={"Accept": "application/json"}
+    )
@@ -2,13 +2,55 @@
 Market API Interface - REST ve Stream arayüzü
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, AsyncGenerator
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple
 
 
+from core.config import MARKET_HTTP_POOL_SIZE, MARKET_RATE_LIMIT_MAX_WAIT_SECONDS
 from models.symbol_models import Symbol
 from models.market_models import Market
+from models.candle_models import Candle
+from services.candle_store.columns import CandleColumns, candles_to_columns
+from .http_client import create_market_http_client
+from .rate_limiter import MarketRateLimiter, RateLimitExceeded, parse_retry_after
 
 
+# Upstream mum stream'i: (symbol, interval)
+CandleStream = Tuple[str, str]
+
+
+class CandleEvent(NamedTuple):
+    """Upstream mum stream olayı (aynı mumun kapanana kadar birden fazla revizyonu gelir)"""
+    symbol: str
+    interval: str
+    candle: Candle
+    is_closed: bool
+
+
+class CandleStreamConnection(ABC):
+    """Tek bir upstream mum WebSocket bağlantısı; bağlantı açıkken stream eklenip çıkarılabilir"""
+
+    @abstractmethod
+    async def subscribe(self, streams: List[CandleStream]) -> None:
+        pass
+
+    @abstractmethod
+    async def unsubscribe(self, streams: List[CandleStream]) -> None:
+        pass
+
+    @abstractmethod
+    def events(self) -> AsyncIterator[CandleEvent]:
+        """
+        Mum olaylarını bağlantı kapanana kadar üretir
+
+        Raises:
+            ConnectionError: Bağlantı koptuğunda
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
 
 class MarketAPIServiceInterface(ABC):
     """Market API servisleri için birleşik arayüz - REST + (opsiyonel) Stream API"""
@@ -29,6 +71,13 @@ class MarketAPIServiceInterface(ABC):
         if cls.market_info is None:
             raise NotImplementedError("market_info class attribute doldurulmalı!")
         return cls.market_info
+
+    def close(self) -> None:
+        """
+        Servisin tuttuğu HTTP client/session kaynaklarını kapatır
+        Varsayılan olarak bir şey yapmaz, kaynak tutan servisler override eder
+        """
+        pass
     
     # @abstractmethod
     # def get_candles(self, symbol: str, interval: str, limit: int = 500) -> List[dict]:
@@ -41,18 +90,104 @@ class MarketAPIServiceInterface(ABC):
     #     """Geçmiş mum (candlestick) verilerini döner"""
     #     pass 
 
-    # # Stream özellikleri
-    # @abstractmethod
-    # def supports_candle_ws(self) -> bool:
-    #     """Sağlayıcı mum için native WebSocket stream destekliyor mu?"""
-    #     pass
 
-    # @abstractmethod
-    # async def ws_candle_stream(self, symbol: str, interval: str) -> AsyncGenerator[dict, None]:
-    #     """Native WebSocket kline/candle stream. Standart candle dict yield eder."""
-    #     yield  # type: ignore
+class AsyncMarketAPIServiceInterface(ABC):
+    """Async market API servisleri için arayüz - paylaşılan httpx.AsyncClient üzerinde çalışır"""
 
-    # @abstractmethod
-    # async def disconnect_stream(self) -> None:
-    #     """WebSocket bağlantılarını ve client session'ları temizle"""
-    #     pass
+    # Her child class'ta doldurulması zorunlu
+    market_info: 'Market' = None
+    base_url: str = None
+
+    # Market başına eşzamanlı HTTP bağlantı üst sınırı
+    max_connections: int = MARKET_HTTP_POOL_SIZE
+
+    # Upstream'in kullanılmış ağırlığı bildirdiği response header'ı (varsa)
+    used_weight_header: Optional[str] = None
+
+    # Tek upstream WebSocket bağlantısında taşınabilecek en fazla mum stream'i
+    max_streams_per_connection: int = 0
+
+    def __init__(self):
+        self.client = create_market_http_client(self.base_url, self.max_connections)
+        # Tüm REST çağrıları market_info.rate_limits bütçesinden geçer
+        self.rate_limiter = MarketRateLimiter(self.get_market(), MARKET_RATE_LIMIT_MAX_WAIT_SECONDS)
+
+    @abstractmethod
+    async def get_symbols(self) -> List[Symbol]:
+        """Spot trading'te olan USDT pariteli sembolleri döner"""
+        pass
+
+    async def get_historical_candles(self, symbol: str, interval: str, start_time: Optional[int] = None,
+                                     end_time: Optional[int] = None, limit: int = 500) -> List[Candle]:
+        """
+        Geçmiş mum (candlestick) verilerini döner
+        start_time verilmezse son 'limit' mum döner. Mum verisi sunmayan marketler override etmez.
+        """
+        raise NotImplementedError(f"{self.get_market().name} mum verisi desteklemiyor")
+
+    async def get_historical_candle_columns(self, symbol: str, interval: str, start_time: Optional[int] = None,
+                                            end_time: Optional[int] = None, limit: int = 500) -> CandleColumns:
+        """
+        Geçmiş mum verilerini kolon dizileri olarak döner (mum deposuna yazma yolu)
+        Varsayılan uygulama get_historical_candles sonucunu dönüştürür; ham yanıtı doğrudan
+        kolonlara çevirebilen marketler override eder.
+        """
+        return candles_to_columns(await self.get_historical_candles(symbol, interval, start_time, end_time, limit))
+
+    def supports_candle_ws(self) -> bool:
+        """Sağlayıcı mum için native WebSocket stream destekliyor mu?"""
+        return False
+
+    async def ws_candle_stream(self, streams: List[CandleStream]) -> CandleStreamConnection:
+        """
+        Verilen (symbol, interval) stream'lerine abone yeni bir upstream bağlantısı açar
+        Bağlantı açıkken subscribe/unsubscribe ile stream kümesi değiştirilebilir.
+        """
+        raise NotImplementedError(f"{self.get_market().name} mum stream'i desteklemiyor")
+
+    async def disconnect_stream(self) -> None:
+        """Servisin açtığı WebSocket bağlantılarını kapatır"""
+        pass
+
+    @classmethod
+    def get_market(cls) -> 'Market':
+        """
+        Market hakkında statik bilgileri döner (Market tipinde)
+        """
+        if cls.market_info is None:
+            raise NotImplementedError("market_info class attribute doldurulmalı!")
+        return cls.market_info
+
+    async def _get_json(self, path: str, params: Optional[dict] = None, weight: int = 1):
+        """
+        Rate limit bütçesinden weight kadar harcayarak GET isteği yapar ve JSON döner
+
+        Raises:
+            RateLimitExceeded: Bütçe aşıldıysa veya upstream 429/418 döndüyse
+        """
+        await self.rate_limiter.acquire(weight)
+        response = await self.client.get(path, params=params)
+
+        if self.used_weight_header and self.used_weight_header in response.headers:
+            self.rate_limiter.observe_used_weight(int(response.headers[self.used_weight_header]))
+
+        if response.status_code in (429, 418):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.penalize(retry_after)
+            raise RateLimitExceeded(self.get_market().id, retry_after)
+
+        response.raise_for_status()
+        return response.json()
+
+    def get_rate_limit_usage(self) -> dict:
+        """
+        Market rate limit bütçesinin anlık kullanımını döner
+        """
+        return self.rate_limiter.snapshot()
+
+    async def aclose(self) -> None:
+        """
+        Servisin tuttuğu WebSocket ve HTTP client kaynaklarını kapatır
+        """
+        await self.disconnect_stream()
+        await self.client.aclose()
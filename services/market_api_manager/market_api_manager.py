@@ -2,41 +2,130 @@
 Market API Manager servisi - REST ve WebSocket API'lerini birleşik yönetir
 """
 from typing import Optional, List
-from config import config
+from core.config import SYMBOL_CACHE_TTL_SECONDS
 from models.market_models import Market
-from models.response_models import APIResponse
-from models.symbol_models import Symbol, SymbolsResponse
+from models.symbol_models import Symbol
+from models.candle_models import Candle
+from services.candle_store.columns import CandleColumns
 
-from .market_api_interface import MarketAPIServiceInterface
-from .binance_api_service import BinanceAPIService
-from .coingecko_api_service import CoinGeckoAPIService 
+from .market_api_interface import AsyncMarketAPIServiceInterface
+from .market_provider_registry import MarketProviderRegistry
+from .single_flight import SingleFlight
+from .symbol_catalog_cache import SymbolCatalogCache, CatalogEntry
 
 class MarketAPIServiceManager:
     """Market API servisi yöneticisi - Aktif market üzerinden REST ve WebSocket API'lerini tek noktadan yönetir"""
 
-    def __init__(self):
-        self.binance_service = BinanceAPIService()
-        self.coingecko_service = CoinGeckoAPIService()
+    # Süreç genelinde paylaşılan sembol katalog önbelleği (market bazlı)
+    catalog_cache = SymbolCatalogCache(ttl_seconds=SYMBOL_CACHE_TTL_SECONDS)
+
+    def __init__(self, registry: MarketProviderRegistry):
+        # Uygulama lifespan'ında oluşturulan, market başına paylaşılan servisler
+        self.registry = registry
+        # Aynı (market, işlem) için eşzamanlı upstream çağrılarını tek çağrıda birleştirir
+        self.single_flight = SingleFlight()
 
     @staticmethod
     def get_markets() -> List[Market]: 
-        return [
-            BinanceAPIService.market_info,
-            CoinGeckoAPIService.market_info
-        ]
+        return MarketProviderRegistry.get_markets()
+
+
+    async def get_service(self, market_id: str) -> AsyncMarketAPIServiceInterface:
+        """
+        Market id'ye karşılık gelen paylaşılan API servisini döner
+        """
+        return await self.registry.get(market_id)
+
+    async def get_symbols(self, market_id: str) -> List[Symbol]:
+        """
+        Seçilen market_id'ye göre sembol listesini önbellekten döner
+        Önbellek boşsa veya TTL dolmuşsa upstream'den yenilenir
+        """
+        entry = await self.get_catalog(market_id)
+        return entry.symbols
+
+    async def get_catalog(self, market_id: str) -> CatalogEntry:
+        """
+        Market katalog kaydını (semboller + versiyon, ETag, değişiklik zamanı) döner
+        """
+        service = await self.get_service(market_id)
+        return await self.catalog_cache.get_entry(market_id, self._symbols_loader(market_id, service))
+
+    async def search_symbols(self, market_id: str, query: str, limit: int = 20) -> List[Symbol]:
+        """
+        Market kataloğunda önek/bulanık sembol araması yapar
+        İndeks katalog versiyonu başına bir kez kurulur
+        """
+        entry = self.catalog_cache.peek(market_id)
+        if entry is None:
+            await self.get_symbols(market_id)
+            entry = self.catalog_cache.peek(market_id)
+        return entry.search_index.search(query, limit)
+
+    async def refresh_symbols(self, market_id: str) -> List[Symbol]:
+        """
+        TTL'i beklemeden market kataloğunu upstream'den yeniler ve önbelleği günceller
+        """
+        service = await self.get_service(market_id)
+        entry = await self.catalog_cache.refresh(market_id, self._symbols_loader(market_id, service))
+        return entry.symbols
+
+    def seed_symbols(self, market_id: str, symbols: List[Symbol]) -> CatalogEntry:
+        """
+        Kalıcı snapshot'tan yüklenen kataloğu önbelleğe yerleştirir
+        """
+        return self.catalog_cache.seed(market_id, symbols)
+
+    def _symbols_loader(self, market_id: str, service: AsyncMarketAPIServiceInterface):
+        """Upstream sembol çağrısını single-flight üzerinden yapan loader döner"""
+        return lambda: self.single_flight.do((market_id, "get_symbols"), service.get_symbols)
+
+    @classmethod
+    def get_catalog_stats(cls) -> dict:
+        """
+        Sembol katalog önbelleğinin market bazlı sayaçlarını döner
+        """
+        return cls.catalog_cache.stats()
+
+    def get_single_flight_stats(self) -> dict:
+        """
+        Upstream çağrı birleştirme sayaçlarını döner
+        """
+        return self.single_flight.stats()
 
+    def get_rate_limit_usage(self) -> dict:
+        """
+        Market bazlı rate limit bütçe kullanımını döner
+        """
+        return self.registry.get_rate_limit_usage()
+
+    async def get_historical_candles(self, market_id: str, symbol: str, interval: str,
+                                     start_time: Optional[int] = None, end_time: Optional[int] = None,
+                                     limit: int = 500) -> List[Candle]:
+        """
+        Marketten geçmiş mum verilerini çeker (tek upstream sayfası)
+        Aynı aralık için eşzamanlı istekler single-flight ile tek çağrıda birleştirilir
+        """
+        service = await self.get_service(market_id)
+        key = (market_id, "get_historical_candles", symbol, interval, start_time, end_time, limit)
+        return await self.single_flight.do(
+            key,
+            lambda: service.get_historical_candles(symbol, interval, start_time, end_time, limit)
+        )
 
-    def get_symbols(self, market_id: str) -> List[Symbol]:
+    async def get_historical_candle_columns(self, market_id: str, symbol: str, interval: str,
+                                            start_time: Optional[int] = None, end_time: Optional[int] = None,
+                                            limit: int = 500) -> CandleColumns:
         """
-        Seçilen market_id'ye göre sembol listesini döner, her sembole market bilgisini ekler
+        Marketten geçmiş mum verilerini kolon dizileri olarak çeker (tek upstream sayfası)
+        Candle modeline uğramadan mum deposuna yazılır
         """
-        if market_id == "binance":
-            service = self.binance_service
-        elif market_id == "coingecko":
-            service = self.coingecko_service
-        else:
-            raise ValueError(f"Geçersiz market id: {market_id}")
-        return service.get_symbols()
+        service = await self.get_service(market_id)
+        key = (market_id, "get_historical_candle_columns", symbol, interval, start_time, end_time, limit)
+        return await self.single_flight.do(
+            key,
+            lambda: service.get_historical_candle_columns(symbol, interval, start_time, end_time, limit)
+        )
     
     # def post_switch(self, market_name: str) -> APIResponse:
     #     """
@@ -70,58 +159,6 @@ class MarketAPIServiceManager:
     #     )
 
 
-    # def get_candles(self, symbol: str, interval: str, limit: int = 100,
-    #                 requested_indicators: Optional[List[str]] = None,
-    #                 configs: Optional[List] = None):
-    #     """
-    #     Mum verilerini döner - Aktif market (son N adet) + İndikatörler
-    #     @endpoint: GET /candles
-    #     """
-    #     # Raw market data al (List[dict] döner)
-    #     candles_data = self.active_api.get_candles(symbol, interval, limit)
-    #     
-    #     # Indicator calculation delegated here for REST; keep using indicator_manager lazily
-    #     if requested_indicators and configs:
-    #         from services.indicators.indicator_manager import indicator_manager
-    #         processed_candles = indicator_manager.calculate_indicators_for_candles(
-    #             candles_data, configs
-    #         )
-    #         candles_data = processed_candles
-    #     
-    #     # APIResponse objesi oluştur
-    #     return APIResponse(
-    #         success=True,
-    #         data={"candles": candles_data},
-    #         api_source=self._active_market_name,
-    #         count=len(candles_data) if candles_data else 0
-    #     )
-
-    # def get_historical_candles(self, symbol: str, interval: str, start_time: Optional[int] = None,
-    #                             end_time: Optional[int] = None, limit: int = 500,
-    #                             requested_indicators: Optional[List[str]] = None,
-    #                             configs: Optional[List] = None):
-    #     """
-    #     Geçmiş mum verilerini döner - Aktif market + İndikatörler
-    #     @endpoint: GET /historical/candles
-    #     """
-    #     # Raw market data al (List[dict] döner)
-    #     candles_data = self.active_api.get_historical_candles(symbol, interval, start_time, end_time, limit)
-    #     
-    #     if requested_indicators and configs:
-    #         from services.indicators.indicator_manager import indicator_manager
-    #         processed_candles = indicator_manager.calculate_indicators_for_candles(
-    #             candles_data, configs
-    #         )
-    #         candles_data = processed_candles
-    #     
-    #     # APIResponse objesi oluştur
-    #     return APIResponse(
-    #         success=True,
-    #         data={"candles": candles_data},
-    #         api_source=self._active_market_name,
-    #         count=len(candles_data) if candles_data else 0
-    #     )
-    
     # def is_market_supported(self, market_name: str) -> bool:
     #     """Market'in desteklenip desteklenmediğini kontrol eder"""
     #     return market_name.lower() in [name.lower() for name in config.SUPPORTED_MARKETS.keys()]
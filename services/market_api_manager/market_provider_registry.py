@@ -0,0 +1,67 @@
+"""
+Market Provider Registry - Market başına tek, uzun ömürlü API servisi tutar
+
+Servisler ilk kullanımda (lazy) oluşturulur, tüm istekler arasında paylaşılır
+ve uygulama kapanırken (lifespan) temizce kapatılır.
+"""
+from typing import Callable, Dict, List
+
+from models.market_models import Market
+from .market_api_interface import AsyncMarketAPIServiceInterface
+from .binance_api_service import AsyncBinanceAPIService
+from .coingecko_api_service import AsyncCoinGeckoAPIService
+
+
+class MarketProviderRegistry:
+    """Market id -> paylaşılan AsyncMarketAPIServiceInterface örneği"""
+
+    # Desteklenen marketler ve servis sınıfları
+    providers: Dict[str, Callable[[], AsyncMarketAPIServiceInterface]] = {
+        AsyncBinanceAPIService.market_info.id: AsyncBinanceAPIService,
+        AsyncCoinGeckoAPIService.market_info.id: AsyncCoinGeckoAPIService,
+    }
+
+    def __init__(self):
+        self._services: Dict[str, AsyncMarketAPIServiceInterface] = {}
+        self._closed = False
+
+    @classmethod
+    def get_markets(cls) -> List[Market]:
+        """Desteklenen marketlerin statik bilgilerini döner"""
+        return [provider.market_info for provider in cls.providers.values()]
+
+    async def get(self, market_id: str) -> AsyncMarketAPIServiceInterface:
+        """
+        Market servisini döner, yoksa oluşturur
+        Servis oluşturma I/O yapmaz; bağlantılar ilk istekte açılır ve havuzda tutulur
+        """
+        service = self._services.get(market_id)
+        if service is not None:
+            return service
+
+        if market_id not in self.providers:
+            raise ValueError(f"Geçersiz market id: {market_id}")
+        if self._closed:
+            raise RuntimeError("Market provider registry kapatıldı")
+
+        service = self.providers[market_id]()
+        self._services[market_id] = service
+        return service
+
+    def get_rate_limit_usage(self) -> Dict[str, dict]:
+        """Oluşturulmuş servislerin rate limit bütçe kullanımını döner"""
+        return {
+            market_id: service.get_rate_limit_usage()
+            for market_id, service in self._services.items()
+        }
+
+    async def close(self) -> None:
+        """Oluşturulmuş tüm servislerin bağlantılarını kapatır"""
+        self._closed = True
+        services = list(self._services.values())
+        self._services.clear()
+        for service in services:
+            try:
+                await service.aclose()
+            except Exception as e:
+                print(f"❌ Market servisi kapatılamadı ({service.get_market().id}): {str(e)}")
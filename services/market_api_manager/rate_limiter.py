@@ -0,0 +1,137 @@
+"""
+Rate Limiter - Market.rate_limits bilgisinden türetilen market bazlı token bucket zamanlayıcı
+
+Her upstream çağrısı ağırlığı (weight) kadar token harcar. Bütçe yetmiyorsa çağrı,
+bekleme süresi üst sınırı aşmıyorsa sıraya alınır (token borçlanılarak), aşıyorsa
+RateLimitExceeded ile reddedilir (shed).
+"""
+import asyncio
+import math
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from models.market_models import Market
+
+# Retry-After başlığı yoksa veya okunamıyorsa kullanılan bekleme (saniye)
+DEFAULT_RETRY_AFTER_SECONDS = 60.0
+
+
+def parse_retry_after(value: Optional[str], default: float = DEFAULT_RETRY_AFTER_SECONDS) -> float:
+    """
+    Retry-After başlığını saniyeye çevirir
+    Saniye ("120") veya HTTP tarihi ("Wed, 21 Oct 2015 07:28:00 GMT") kabul edilir; geçersizse default
+    """
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        seconds = (moment - datetime.now(timezone.utc)).total_seconds()
+    if not math.isfinite(seconds):
+        return default
+    return max(0.0, seconds)
+
+
+class RateLimitExceeded(Exception):
+    """Market bütçesi aşıldığında fırlatılır; retry_after saniye cinsindendir"""
+
+    def __init__(self, market_id: str, retry_after: float):
+        self.market_id = market_id
+        self.retry_after = retry_after
+        super().__init__(
+            f"{market_id} rate limit bütçesi aşıldı, {retry_after:.1f} sn sonra tekrar deneyin"
+        )
+
+
+class MarketRateLimiter:
+    """Dakikalık istek/ağırlık bütçesini uygulayan token bucket"""
+
+    def __init__(self, market: Market, max_wait_seconds: float):
+        self.market_id = market.id
+        self.capacity = float(market.rate_limits.get("requests_per_minute", 60))
+        self.refill_per_second = self.capacity / 60.0
+        self.max_wait_seconds = max_wait_seconds
+
+        self._tokens = self.capacity          # Negatif olabilir: sıradaki çağrıların borcu
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0             # 429/418 sonrası upstream'in istediği bekleme
+
+        self.waiting = 0
+        self.accepted = 0
+        self.shed = 0
+        self.throttled = 0                    # Upstream'den gelen 429/418 sayısı
+        self.server_used_weight: Optional[int] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    async def acquire(self, weight: int = 1) -> None:
+        """
+        Çağrı için weight kadar token ayırır, gerekirse bekler
+
+        Raises:
+            RateLimitExceeded: Gereken bekleme max_wait_seconds'ı aşıyorsa
+        """
+        self._refill()
+        now = time.monotonic()
+        wait = max(0.0, self._blocked_until - now)
+        if self._tokens < weight:
+            wait = max(wait, (weight - self._tokens) / self.refill_per_second)
+
+        if wait > self.max_wait_seconds:
+            self.shed += 1
+            raise RateLimitExceeded(self.market_id, wait)
+
+        # Token'ı şimdiden ayır; sonraki çağrılar bu borcu görerek sıraya girer
+        self._tokens -= weight
+        self.accepted += 1
+        if wait > 0:
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.waiting -= 1
+
+    def observe_used_weight(self, used_weight: int) -> None:
+        """
+        Upstream'in bildirdiği kullanılmış ağırlığa göre yerel bütçeyi düzeltir
+        (örn. Binance X-MBX-USED-WEIGHT-1M). Aynı IP'yi kullanan diğer süreçlerin
+        tükettiği ağırlık da böylece hesaba katılır.
+        """
+        self.server_used_weight = used_weight
+        self._refill()
+        self._tokens = min(self._tokens, self.capacity - used_weight)
+
+    def penalize(self, retry_after: float) -> None:
+        """Upstream 429/418 döndüğünde retry_after süresince yeni çağrıları durdurur"""
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._tokens = min(self._tokens, 0.0)
+
+    def snapshot(self) -> dict:
+        """Anlık bütçe kullanımını döner"""
+        self._refill()
+        available = max(0.0, self._tokens)
+        return {
+            "capacity_per_minute": self.capacity,
+            "available": round(available, 2),
+            "used": round(self.capacity - available, 2),
+            "usage_ratio": round((self.capacity - available) / self.capacity, 4),
+            "server_used_weight": self.server_used_weight,
+            "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+            "waiting": self.waiting,
+            "accepted": self.accepted,
+            "shed": self.shed,
+            "throttled": self.throttled,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
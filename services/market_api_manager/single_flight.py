@@ -0,0 +1,49 @@
+"""
+Single Flight - Aynı anahtarlı eşzamanlı upstream çağrılarını tek çağrıda birleştirir
+
+Aynı (market, işlem) için uçuşta bir çağrı varsa yeni çağrı başlatılmaz; tüm bekleyenler
+aynı görevin sonucunu (veya hatasını) alır.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Anahtar -> uçuştaki upstream görevi"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0   # Gerçekten upstream'e giden çağrı sayısı
+        self.shared = 0     # Uçuştaki bir çağrıya eklemlenen bekleyen sayısı
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Anahtar için uçuşta bir çağrı varsa onun sonucunu bekler, yoksa fn'i başlatır
+
+        Görev shield ile beklenir; bekleyenlerden biri iptal edilse (örn. istemci bağlantıyı
+        kapatsa) bile upstream çağrısı diğer bekleyenler için tamamlanır.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Tüm bekleyenler iptal edilmişse hatanın "never retrieved" uyarısı üretmemesi için tüket
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Birleştirme sayaçlarını döner"""
+        return {
+            "executed": self.executed,
+            "shared": self.shared,
+            "in_flight": [list(key) if isinstance(key, tuple) else key for key in self._calls]
+        }
@@ -0,0 +1,261 @@
+"""
+Symbol Catalog Cache - Market bazlı, süreç genelinde paylaşılan sembol katalog önbelleği
+
+Stale-while-revalidate: TTL dolduğunda eski katalog hemen döner, arka planda
+tek bir görev kataloğu yeniler. Yenileme market başına tek uçuşludur (single-flight): soğuk
+önbellekte aynı anda gelen istekler ve sync job aynı görevi bekler; katalog kaydı, ETag ve
+arama indeksi yenileme başına bir kez oluşturulur.
+
+İçeriği (ETag) değişen yeni katalog versiyonları kayıtlı dinleyicilere bildirilir
+(ör: WebSocket 'catalog' kanalı).
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from core.http_cache import make_etag
+from core.precompressed import PrecompressedJSON
+from models.symbol_models import Symbol
+from .symbol_search_index import SymbolSearchIndex
+
+
+SymbolLoader = Callable[[], Awaitable[List[Symbol]]]
+CatalogListener = Callable[[str, "CatalogEntry"], None]
+
+_symbol_list_adapter = TypeAdapter(List[Symbol])
+
+
+class CatalogEntry:
+    """Bir marketin önbellekteki katalog kaydı"""
+
+    def __init__(self, market_id: str, symbols: List[Symbol], fetched_at: float, version: int,
+                 source: str = "upstream", previous: Optional["CatalogEntry"] = None):
+        self.symbols = symbols
+        self.fetched_at = fetched_at    # Upstream'den çekildiği zaman (Unix epoch, saniye)
+        self.version = version          # Her yenilemede artan katalog versiyonu
+        self.source = source            # 'upstream' veya 'snapshot' (veritabanından yüklenmiş)
+        self._search_index: Optional[SymbolSearchIndex] = None
+        self._encoded_response: Optional[PrecompressedJSON] = None
+
+        # İçerik hash'i (ETag) katalog versiyonu başına bir kez hesaplanır
+        self.etag = make_etag(
+            [market_id] + [f"{s.symbol}|{s.base_asset}|{s.quote_asset}" for s in symbols]
+        )
+        # İçerik değişmediyse Last-Modified bir önceki versiyondan taşınır
+        if previous is not None and previous.etag == self.etag:
+            self.modified_at = previous.modified_at
+        else:
+            self.modified_at = fetched_at
+
+    @property
+    def search_index(self) -> SymbolSearchIndex:
+        """Katalog versiyonu başına bir kez (ilk aramada) kurulan arama indeksi"""
+        if self._search_index is None:
+            self._search_index = SymbolSearchIndex(self.symbols)
+        return self._search_index
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        """Snapshot kayıtlar her zaman eski sayılır; ilk istekte yenileme tetiklenir"""
+        return self.source == "upstream" and self.age() < ttl_seconds
+
+    @property
+    def encoded_response(self) -> PrecompressedJSON:
+        """
+        SymbolsResponse gövdesinin timestamp hariç kısmı; katalog versiyonu başına bir kez
+        JSON'a çevrilip sıkıştırılır. Güncel timestamp her istekte sonek olarak eklenir.
+        """
+        if self._encoded_response is None:
+            body = (
+                b'{"symbols":' + _symbol_list_adapter.dump_json(self.symbols)
+                + b',"count":' + str(len(self.symbols)).encode() + b','
+            )
+            self._encoded_response = PrecompressedJSON(body)
+        return self._encoded_response
+
+    def age(self) -> float:
+        """Kaydın yaşını saniye cinsinden döner"""
+        return time.time() - self.fetched_at
+
+    def max_age(self, ttl_seconds: float) -> int:
+        """İstemcinin kaydı yeniden doğrulamadan kullanabileceği süre (Cache-Control max-age)"""
+        if self.source != "upstream":
+            return 0
+        return max(0, int(ttl_seconds - self.age()))
+
+
+class CatalogStats:
+    """Bir marketin önbellek sayaçları"""
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error: Optional[str] = None
+
+
+class SymbolCatalogCache:
+    """Market id -> sembol kataloğu önbelleği (stale-while-revalidate)"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._stats: Dict[str, CatalogStats] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: List[CatalogListener] = []
+
+    def add_listener(self, listener: CatalogListener) -> None:
+        """İçeriği değişen her katalog versiyonunda çağrılacak dinleyiciyi ekler"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: CatalogListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, market_id: str, entry: CatalogEntry, previous: Optional[CatalogEntry]) -> None:
+        if previous is not None and previous.etag == entry.etag:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(market_id, entry)
+            except Exception as e:
+                print(f"❌ Katalog dinleyicisi hatası ({market_id}): {str(e)}")
+
+    def _stats_for(self, market_id: str) -> CatalogStats:
+        if market_id not in self._stats:
+            self._stats[market_id] = CatalogStats()
+        return self._stats[market_id]
+
+    def peek(self, market_id: str) -> Optional[CatalogEntry]:
+        """Sayaçları etkilemeden önbellekteki kaydı döner"""
+        return self._entries.get(market_id)
+
+    async def get(self, market_id: str, loader: SymbolLoader) -> List[Symbol]:
+        """
+        Market kataloğundaki sembolleri döner
+        """
+        entry = await self.get_entry(market_id, loader)
+        return entry.symbols
+
+    async def get_entry(self, market_id: str, loader: SymbolLoader) -> CatalogEntry:
+        """
+        Market katalog kaydını döner
+
+        - Taze kayıt: doğrudan bellekten döner
+        - Eski (TTL dolmuş) kayıt: bellekten döner, arka planda yenileme başlatır
+        - Kayıt yok: loader ile upstream'den çeker ve önbelleğe yazar
+        """
+        stats = self._stats_for(market_id)
+        entry = self._entries.get(market_id)
+
+        if entry is None:
+            stats.misses += 1
+            # shield: bekleyen bir istemcinin iptali diğerlerinin beklediği yenilemeyi iptal etmez
+            return await asyncio.shield(self._refresh_task(market_id, loader))
+
+        if entry.is_fresh(self.ttl_seconds):
+            stats.hits += 1
+        else:
+            stats.stale_hits += 1
+            self._schedule_refresh(market_id, loader)
+        return entry
+
+    async def refresh(self, market_id: str, loader: SymbolLoader) -> CatalogEntry:
+        """
+        TTL'den bağımsız olarak kataloğu hemen yeniler (örn. sync job için)
+        Çalışan bir yenileme varsa yenisi başlatılmaz, onun sonucu döner
+        """
+        return await asyncio.shield(self._refresh_task(market_id, loader))
+
+    def seed(self, market_id: str, symbols: List[Symbol]) -> CatalogEntry:
+        """
+        Kalıcı snapshot'tan (veritabanı) yüklenen kataloğu önbelleğe yerleştirir
+        Upstream'den çekilmiş bir kayıt varsa dokunulmaz ve o kayıt döner
+        """
+        entry = self._entries.get(market_id)
+        if entry is not None and entry.source == "upstream":
+            return entry
+        self._entries[market_id] = CatalogEntry(
+            market_id=market_id,
+            symbols=symbols,
+            fetched_at=time.time(),
+            version=entry.version + 1 if entry else 1,
+            source="snapshot",
+            previous=entry
+        )
+        self._notify(market_id, self._entries[market_id], entry)
+        return self._entries[market_id]
+
+    async def _refresh(self, market_id: str, loader: SymbolLoader) -> CatalogEntry:
+        """Kataloğu upstream'den çeker ve önbelleği günceller"""
+        stats = self._stats_for(market_id)
+        try:
+            symbols = await loader()
+        except Exception as e:
+            stats.refresh_errors += 1
+            stats.last_error = str(e)
+            raise
+
+        previous = self._entries.get(market_id)
+        entry = CatalogEntry(
+            market_id=market_id,
+            symbols=symbols,
+            fetched_at=time.time(),
+            version=previous.version + 1 if previous else 1,
+            previous=previous
+        )
+        self._entries[market_id] = entry
+        stats.refreshes += 1
+        stats.last_error = None
+        self._notify(market_id, entry, previous)
+        return entry
+
+    def _refresh_task(self, market_id: str, loader: SymbolLoader) -> asyncio.Task:
+        """Market için çalışan yenileme görevini döner; yoksa başlatır (single-flight)"""
+        task = self._refresh_tasks.get(market_id)
+        if task is not None and not task.done():
+            return task
+
+        task = asyncio.create_task(self._refresh(market_id, loader))
+        self._refresh_tasks[market_id] = task
+        # Arka plan hatası eski katalogla servis vermeye devam etmeyi engellemez,
+        # hata sayaçlara yazılır; bekleyen yoksa exception'ı burada tüketiyoruz
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    def _schedule_refresh(self, market_id: str, loader: SymbolLoader) -> None:
+        """Market için çalışan bir yenileme yoksa arka plan görevi başlatır"""
+        self._refresh_task(market_id, loader)
+
+    def invalidate(self, market_id: Optional[str] = None) -> None:
+        """Belirtilen marketin (veya tüm marketlerin) kaydını siler"""
+        if market_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(market_id, None)
+
+    def stats(self) -> Dict[str, dict]:
+        """Market bazlı hit/miss/yenileme yaşı sayaçlarını döner"""
+        result = {}
+        for market_id, stats in self._stats.items():
+            entry = self._entries.get(market_id)
+            task = self._refresh_tasks.get(market_id)
+            result[market_id] = {
+                "hits": stats.hits,
+                "stale_hits": stats.stale_hits,
+                "misses": stats.misses,
+                "refreshes": stats.refreshes,
+                "refresh_errors": stats.refresh_errors,
+                "last_error": stats.last_error,
+                "refreshing": task is not None and not task.done(),
+                "version": entry.version if entry else None,
+                "etag": entry.etag if entry else None,
+                "source": entry.source if entry else None,
+                "count": len(entry.symbols) if entry else 0,
+                "age_seconds": round(entry.age(), 3) if entry else None,
+                "ttl_seconds": self.ttl_seconds,
+            }
+        return result
@@ -0,0 +1,123 @@
+"""
+Symbol Search Index - Katalog başına bir kez kurulan, bellek içi sembol arama indeksi
+
+'symbol' ve 'base_asset' üzerinde sıralı diziler tutulur; önek aramaları bisect ile
+yapılır. Önek eşleşmesi yoksa küçük bir bulanık (fuzzy) arama devreye girer.
+Ayrıca base/quote asset filtreleri için asset -> katalog pozisyonları eşlemesi tutulur.
+"""
+import difflib
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from models.symbol_models import Symbol
+
+
+# Sıralama katmanları - küçük değer daha üstte
+RANK_EXACT = 0          # Sembol veya base asset birebir eşleşme
+RANK_BASE_PREFIX = 1    # Base asset önek eşleşmesi ('BT' -> BTC)
+RANK_SYMBOL_PREFIX = 2  # Sembol önek eşleşmesi ('BTCU' -> BTCUSDT)
+RANK_FUZZY = 3          # Bulanık eşleşme ('BTX' -> BTC)
+
+# Bulanık aramada kabul edilen en düşük benzerlik oranı
+FUZZY_CUTOFF = 0.7
+
+
+class SymbolSearchIndex:
+    """Bir sembol kataloğu üzerinde önek + bulanık arama"""
+
+    def __init__(self, symbols: List[Symbol]):
+        self.symbols = symbols
+        self._symbol_keys, self._symbol_ids = self._sorted_keys(s.symbol for s in symbols)
+        self._base_keys, self._base_ids = self._sorted_keys(s.base_asset for s in symbols)
+
+        # base_asset / quote_asset filtreleri için katalog sırasını koruyan pozisyon listeleri
+        self._by_base: Dict[str, List[int]] = {}
+        self._by_quote: Dict[str, List[int]] = {}
+        for i, s in enumerate(symbols):
+            self._by_base.setdefault((s.base_asset or "").upper(), []).append(i)
+            self._by_quote.setdefault((s.quote_asset or "").upper(), []).append(i)
+
+        # Bulanık arama için ilk harf ve uzunluğa göre gruplanmış tekil base asset'ler
+        self._fuzzy_buckets: Dict[Tuple[str, int], List[str]] = {}
+        for base in sorted(set(self._base_keys)):
+            self._fuzzy_buckets.setdefault((base[0], len(base)), []).append(base)
+
+    @staticmethod
+    def _sorted_keys(values) -> Tuple[List[str], List[int]]:
+        pairs = sorted((value.upper(), i) for i, value in enumerate(values) if value)
+        return [key for key, _ in pairs], [i for _, i in pairs]
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff")
+
+    def contains(self, symbol: str) -> bool:
+        """Sembol katalogda birebir var mı"""
+        key = symbol.strip().upper()
+        pos = bisect_left(self._symbol_keys, key)
+        return pos < len(self._symbol_keys) and self._symbol_keys[pos] == key
+
+    def filter(self, base_asset: Optional[str] = None, quote_asset: Optional[str] = None) -> List[Symbol]:
+        """Katalog sırasını koruyarak base/quote asset'e göre filtrelenmiş sembolleri döner"""
+        if base_asset is None and quote_asset is None:
+            return self.symbols
+
+        positions = None
+        if base_asset is not None:
+            positions = self._by_base.get(base_asset.strip().upper(), [])
+        if quote_asset is not None:
+            quote_positions = self._by_quote.get(quote_asset.strip().upper(), [])
+            if positions is None:
+                positions = quote_positions
+            else:
+                allowed = set(quote_positions)
+                positions = [i for i in positions if i in allowed]
+        return [self.symbols[i] for i in positions]
+
+    def search(self, query: str, limit: int = 20) -> List[Symbol]:
+        """
+        Sorguya en uygun ilk 'limit' sembolü sıralı döner
+
+        Sıralama: birebir eşleşme > base asset öneki > sembol öneki > bulanık eşleşme;
+        aynı katmanda kısa semboller önce gelir.
+        """
+        q = query.strip().upper()
+        if not q or limit <= 0:
+            return []
+
+        best: Dict[int, Tuple[int, int, str]] = {}
+
+        def consider(idx: int, rank: int) -> None:
+            symbol = self.symbols[idx].symbol
+            key = (rank, len(symbol), symbol)
+            if idx not in best or key < best[idx]:
+                best[idx] = key
+
+        lo, hi = self._prefix_range(self._base_keys, q)
+        for pos in range(lo, hi):
+            consider(self._base_ids[pos], RANK_EXACT if self._base_keys[pos] == q else RANK_BASE_PREFIX)
+
+        lo, hi = self._prefix_range(self._symbol_keys, q)
+        for pos in range(lo, hi):
+            consider(self._symbol_ids[pos], RANK_EXACT if self._symbol_keys[pos] == q else RANK_SYMBOL_PREFIX)
+
+        if len(best) < limit and len(q) >= 2:
+            for base in self._fuzzy_bases(q, limit):
+                lo, hi = self._prefix_range(self._base_keys, base)
+                for pos in range(lo, hi):
+                    if self._base_keys[pos] == base:
+                        consider(self._base_ids[pos], RANK_FUZZY)
+
+        top = heapq.nsmallest(limit, best.items(), key=lambda item: item[1])
+        return [self.symbols[idx] for idx, _ in top]
+
+    def _fuzzy_bases(self, q: str, limit: int) -> List[str]:
+        """
+        Aynı harfle başlayan ve uzunluğu sorguya yakın base asset'ler arasında bulanık eşleşme arar
+        (yazım hataları nadiren ilk harfte olur; aday kümesi böylece küçük tutulur)
+        """
+        candidates = []
+        for length in range(max(1, len(q) - 1), len(q) + 2):
+            candidates.extend(self._fuzzy_buckets.get((q[0], length), []))
+        return difflib.get_close_matches(q, candidates, n=limit, cutoff=FUZZY_CUTOFF)
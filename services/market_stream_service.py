@@ -0,0 +1,343 @@
+"""
+Market Stream Service - /ws/market (WebSocket) ve SSE istemcileri için abonelik aracısı
+
+Tek bir istemci bağlantısı birden fazla (market, symbol, channel) stream'ine abone olabilir:
+
+- kline_<interval>  Mum güncellemeleri (ör: kline_1m); CandleStreamHub üzerinden paylaşılır
+- catalog           Marketin sembol kataloğu değiştiğinde versiyon/ETag bildirimi (symbol boş)
+
+Her upstream olayı bir kez JSON'a çevrilir (StreamMessage) ve aynı nesne tüm abonelerin
+kuyruğuna konur. İstemci başına gönderim kuyruğu sınırlıdır; yavaş istemcide en eski mesaj
+düşer ve istemciye sonraki mesajdan önce bir 'dropped' bildirimi gider.
+
+İstemci bağlantı boyunca kimlik bilgisini ve doğrulanmış kimliğini (principal) taşır; route
+katmanı kimliği periyodik olarak yeniden doğrular ve geçersizleşince istemciyi close() ile kapatır.
+"""
+import asyncio
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional, Set, Union
+
+import pydantic_core
+
+from core.config import MARKET_STREAM_QUEUE_SIZE, MARKET_STREAM_MAX_SUBSCRIPTIONS
+from models.auth_models import AuthPrincipal
+from services.candle_store.candle_store import CandleKey
+from services.candle_store.intervals import SUPPORTED_INTERVALS
+from services.candle_stream_hub import CandleStreamHub
+from services.market_api_manager.market_api_interface import CandleEvent
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.rate_limiter import RateLimitExceeded
+from services.market_api_manager.symbol_catalog_cache import CatalogEntry
+
+KLINE_CHANNEL_PREFIX = "kline_"
+CATALOG_CHANNEL = "catalog"
+
+
+class StreamTopic(NamedTuple):
+    """İstemcinin abone olabildiği stream"""
+    market: str     # 'binance'
+    symbol: str     # 'BTCUSDT' ('catalog' kanalında boş)
+    channel: str    # 'kline_1m' veya 'catalog'
+
+    def describe(self) -> dict:
+        return {"market": self.market, "symbol": self.symbol, "channel": self.channel}
+
+
+def parse_stream_topic(spec: Union[str, dict]) -> StreamTopic:
+    """
+    Stream tanımını doğrulayıp StreamTopic'e çevirir
+    Kabul edilen biçimler: {"market", "symbol", "channel"} veya "market:symbol:channel"
+
+    Raises:
+        ValueError: Eksik alan veya bilinmeyen kanal
+    """
+    if isinstance(spec, str):
+        parts = spec.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Geçersiz stream: '{spec}' (beklenen: market:symbol:channel)")
+        market, symbol, channel = parts
+    elif isinstance(spec, dict):
+        market, symbol, channel = spec.get("market"), spec.get("symbol") or "", spec.get("channel")
+    else:
+        raise ValueError("Stream, nesne veya 'market:symbol:channel' metni olmalı")
+
+    if not isinstance(market, str) or not market or not isinstance(channel, str) or not isinstance(symbol, str):
+        raise ValueError("Stream için market ve channel gerekli")
+    market, symbol, channel = market.strip().lower(), symbol.strip().upper(), channel.strip()
+
+    if channel == CATALOG_CHANNEL:
+        return StreamTopic(market, "", channel)
+    if channel.startswith(KLINE_CHANNEL_PREFIX):
+        interval = channel[len(KLINE_CHANNEL_PREFIX):]
+        if interval not in SUPPORTED_INTERVALS:
+            raise ValueError(f"Desteklenmeyen interval: {interval}. Desteklenen: {', '.join(SUPPORTED_INTERVALS)}")
+        if not symbol or len(symbol) > 20:
+            raise ValueError("kline kanalı için sembol gerekli")
+        return StreamTopic(market, symbol, channel)
+    raise ValueError(f"Bilinmeyen kanal: {channel} (desteklenen: kline_<interval>, {CATALOG_CHANNEL})")
+
+
+class StreamMessage:
+    """Bir kez JSON'a çevrilip tüm abonelere aynen gönderilen mesaj"""
+
+    __slots__ = ("event", "text", "_sse")
+
+    def __init__(self, payload: dict):
+        self.event = payload["type"]
+        self.text = pydantic_core.to_json(payload).decode()
+        self._sse: Optional[bytes] = None
+
+    @property
+    def sse(self) -> bytes:
+        """Server-Sent Events çerçevesi (ilk SSE abonesinde bir kez oluşturulur)"""
+        if self._sse is None:
+            self._sse = f"event: {self.event}\ndata: {self.text}\n\n".encode()
+        return self._sse
+
+
+class StreamClientClosed(Exception):
+    """İstemci kapatıldı (ör: kimlik bilgisi geçersizleşti veya oturum süresi doldu)"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class StreamClient:
+    """Tek bir istemci bağlantısının kimliği, abonelikleri ve sınırlı (drop-oldest) gönderim kuyruğu"""
+
+    def __init__(self, principal: AuthPrincipal, api_key: Optional[str] = None,
+                 session_token: Optional[str] = None, queue_size: int = MARKET_STREAM_QUEUE_SIZE):
+        self.principal = principal
+        # Bağlantının açıldığı kimlik bilgisi; yeniden doğrulamada kullanılır
+        self.api_key = api_key
+        self.session_token = session_token
+        self.topics: Set[StreamTopic] = set()
+        self.queue: Deque[StreamMessage] = deque(maxlen=queue_size)
+        self.sent = 0
+        self.dropped = 0
+        self.closed_reason: Optional[str] = None
+        self._unreported_drops = 0
+        self._ready = asyncio.Event()
+
+    @property
+    def user_id(self) -> int:
+        return self.principal.id
+
+    def close(self, reason: str) -> None:
+        """İstemciyi kapatır; bekleyen next_message() StreamClientClosed fırlatır"""
+        if self.closed_reason is None:
+            self.closed_reason = reason
+            self._ready.set()
+
+    def push(self, message: StreamMessage) -> None:
+        """Mesajı kuyruğa koyar; kuyruk doluysa en eski mesaj düşer (bloklamaz)"""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+            self._unreported_drops += 1
+        self.queue.append(message)
+        self._ready.set()
+
+    async def next_message(self) -> StreamMessage:
+        """
+        Gönderilecek sıradaki mesajı bekler; mesaj düştüyse önce 'dropped' bildirimi döner
+
+        Raises:
+            StreamClientClosed: İstemci kapatıldı (kuyrukta kalan mesajlar gönderilmez)
+        """
+        while not self.queue and self.closed_reason is None:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.closed_reason is not None:
+            raise StreamClientClosed(self.closed_reason)
+        if self._unreported_drops:
+            notice = StreamMessage({"type": "dropped", "count": self._unreported_drops})
+            self._unreported_drops = 0
+            return notice
+        self.sent += 1
+        return self.queue.popleft()
+
+
+class MarketStreamBroker:
+    """Stream -> abone istemciler; upstream kaynaklarına stream başına tek dinleyici bağlar"""
+
+    def __init__(self, candle_hub: CandleStreamHub, market_manager: MarketAPIServiceManager,
+                 queue_size: int = MARKET_STREAM_QUEUE_SIZE,
+                 max_subscriptions: int = MARKET_STREAM_MAX_SUBSCRIPTIONS):
+        self.candle_hub = candle_hub
+        self.market_manager = market_manager
+        self.queue_size = queue_size
+        self.max_subscriptions = max_subscriptions
+        self._subscribers: Dict[StreamTopic, Set[StreamClient]] = {}
+        # Stream'in son mesajı; sonradan abone olan istemciye hemen gönderilir
+        self._last_messages: Dict[StreamTopic, StreamMessage] = {}
+        self._clients: Set[StreamClient] = set()
+        self.market_manager.catalog_cache.add_listener(self._on_catalog)
+
+    def connect(self, principal: AuthPrincipal, api_key: Optional[str] = None,
+                session_token: Optional[str] = None) -> StreamClient:
+        client = StreamClient(principal, api_key, session_token, self.queue_size)
+        self._clients.add(client)
+        return client
+
+    async def disconnect(self, client: StreamClient) -> None:
+        """İstemcinin tüm aboneliklerini bırakır"""
+        self._clients.discard(client)
+        for topic in list(client.topics):
+            await self.unsubscribe(client, topic)
+
+    async def subscribe(self, client: StreamClient, topic: StreamTopic) -> None:
+        """
+        İstemciyi stream'e abone eder; stream'in ilk abonesiyse upstream kaynağına bağlanır
+
+        Raises:
+            ValueError: Abonelik sınırı aşıldı, geçersiz market/sembol
+            NotImplementedError: Market stream'i desteklemiyor
+        """
+        if topic in client.topics:
+            return
+        if len(client.topics) >= self.max_subscriptions:
+            raise ValueError(f"Bağlantı başına en fazla {self.max_subscriptions} abonelik açılabilir")
+
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            await self._validate(topic)
+            subscribers = self._subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.add(client)
+            client.topics.add(topic)
+            message = self._last_messages.get(topic)
+            if message is not None:
+                client.push(message)
+            return
+
+        # Stream'in ilk abonesi: istemci önce eklenir ki upstream'in son olayı ona da ulaşsın
+        self._subscribers[topic] = {client}
+        client.topics.add(topic)
+        try:
+            if topic.channel == CATALOG_CHANNEL:
+                # Soğuk önbellekte ilk yükleme dinleyiciyi zaten tetikler; aksi halde mevcut versiyon gönderilir
+                entry = await self.market_manager.get_catalog(topic.market)
+                if topic not in self._last_messages:
+                    self._on_catalog(topic.market, entry)
+            else:
+                await self.candle_hub.subscribe(topic.market, topic.symbol, self._interval(topic), self._on_candle)
+        except Exception:
+            for subscriber in self._subscribers.pop(topic, set()):
+                subscriber.topics.discard(topic)
+            raise
+
+    async def unsubscribe(self, client: StreamClient, topic: StreamTopic) -> None:
+        """İstemcinin aboneliğini bırakır; stream'in son abonesiyse upstream dinleyicisi kaldırılır"""
+        client.topics.discard(topic)
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(client)
+        if subscribers:
+            return
+        del self._subscribers[topic]
+        self._last_messages.pop(topic, None)
+        if topic.channel != CATALOG_CHANNEL:
+            await self.candle_hub.unsubscribe(
+                CandleKey(topic.market, topic.symbol, self._interval(topic)), self._on_candle
+            )
+
+    async def handle(self, client: StreamClient, request: dict) -> dict:
+        """
+        İstemci mesajını işler ve yanıtını döner
+
+        {"op": "subscribe" | "unsubscribe", "streams": [...], "id": ...}
+        {"op": "list"} / {"op": "ping"}
+
+        Hatalar (rate limit, upstream hatası dahil) 'error' yanıtı olarak döner; bağlantı ve
+        diğer abonelikler etkilenmez
+        """
+        request_id = request.get("id")
+        op = request.get("op")
+        try:
+            if op in ("subscribe", "unsubscribe"):
+                streams = request.get("streams")
+                if not isinstance(streams, list) or not streams:
+                    raise ValueError("'streams' boş olmayan bir liste olmalı")
+                topics = [parse_stream_topic(spec) for spec in streams]
+                for topic in topics:
+                    if op == "subscribe":
+                        await self.subscribe(client, topic)
+                    else:
+                        await self.unsubscribe(client, topic)
+                return {"type": f"{op}d", "id": request_id, "streams": [t.describe() for t in topics]}
+            if op == "list":
+                return {"type": "subscriptions", "id": request_id,
+                        "streams": [t.describe() for t in sorted(client.topics)]}
+            if op == "ping":
+                return {"type": "pong", "id": request_id}
+            raise ValueError(f"Bilinmeyen op: {op} (desteklenen: subscribe, unsubscribe, list, ping)")
+        except (ValueError, NotImplementedError) as e:
+            return {"type": "error", "id": request_id, "detail": str(e)}
+        except RateLimitExceeded as e:
+            return {"type": "error", "id": request_id, "detail": str(e), "retry_after": int(e.retry_after) + 1}
+        except Exception as e:
+            return {"type": "error", "id": request_id, "detail": f"Sunucu hatası: {str(e)}"}
+
+    async def _validate(self, topic: StreamTopic) -> None:
+        """Market'i ve (kline için) sembolün katalogda olduğunu doğrular"""
+        if topic.market not in {market.id for market in self.market_manager.get_markets()}:
+            raise ValueError(f"Geçersiz market id: {topic.market}")
+        if topic.channel == CATALOG_CHANNEL:
+            return
+        service = await self.market_manager.get_service(topic.market)
+        if not service.supports_candle_ws():
+            raise NotImplementedError(f"{service.get_market().name} mum stream'i desteklemiyor")
+        catalog = await self.market_manager.get_catalog(topic.market)
+        if not catalog.search_index.contains(topic.symbol):
+            raise ValueError(f"Bilinmeyen sembol: {topic.symbol}")
+
+    @staticmethod
+    def _interval(topic: StreamTopic) -> str:
+        return topic.channel[len(KLINE_CHANNEL_PREFIX):]
+
+    def _broadcast(self, topic: StreamTopic, payload: dict) -> None:
+        message = StreamMessage(payload)
+        self._last_messages[topic] = message
+        for client in self._subscribers.get(topic, ()):
+            client.push(message)
+
+    def _on_candle(self, key: CandleKey, event: CandleEvent) -> None:
+        topic = StreamTopic(key.market, key.symbol, KLINE_CHANNEL_PREFIX + key.interval)
+        if topic not in self._subscribers:
+            return
+        self._broadcast(topic, {
+            "type": "kline",
+            "market": key.market,
+            "symbol": key.symbol,
+            "interval": key.interval,
+            "closed": event.is_closed,
+            "candle": event.candle.model_dump(),
+        })
+
+    def _on_catalog(self, market_id: str, entry: CatalogEntry) -> None:
+        topic = StreamTopic(market_id, "", CATALOG_CHANNEL)
+        if topic not in self._subscribers:
+            return
+        self._broadcast(topic, {
+            "type": "catalog",
+            "market": market_id,
+            "version": entry.version,
+            "etag": entry.etag,
+            "count": len(entry.symbols),
+            "modified_at": entry.modified_at,
+        })
+
+    def stats(self) -> dict:
+        """Bağlantı, stream ve kuyruk sayaçlarını döner"""
+        return {
+            "clients": len(self._clients),
+            "streams": len(self._subscribers),
+            "subscriptions": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "queued": sum(len(client.queue) for client in self._clients),
+            "dropped": sum(client.dropped for client in self._clients),
+        }
+
+    def close(self) -> None:
+        self.market_manager.catalog_cache.remove_listener(self._on_catalog)
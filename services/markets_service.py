@@ -1,16 +1,32 @@
 
 
 # Market Service - Desteklenen spot marketleri dönen servis
+import time
 from typing import List
+from core.http_cache import make_etag
 from services.market_api_manager.market_api_manager import MarketAPIServiceManager
 from models.market_models import Market
 
+# Market listesi statiktir; ETag ve değişiklik zamanı süreç başında bir kez hesaplanır
+MARKETS_ETAG = make_etag(market.model_dump_json() for market in MarketAPIServiceManager.get_markets())
+MARKETS_MODIFIED_AT = time.time()
+MARKETS_MAX_AGE_SECONDS = 3600
+
 class MarketsService:
 	"""Market servisleri - spot marketleri döner"""
 
+	def __init__(self, market_manager: MarketAPIServiceManager):
+		self.market_manager = market_manager
+
 	def get_markets(self) -> List[Market]:
 		"""
 		Desteklenen spot marketleri Market modeline uygun şekilde döndürür
 		"""
 		return MarketAPIServiceManager.get_markets()
 
+	def get_rate_limit_usage(self) -> dict:
+		"""
+		Market bazlı upstream rate limit bütçe kullanımını döndürür
+		"""
+		return self.market_manager.get_rate_limit_usage()
+
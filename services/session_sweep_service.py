@@ -0,0 +1,95 @@
+"""
+Session Sweep Service - Süresi dolan oturumları 'sessions' tablosundan toplu siler
+
+Her login bir satır eklediği ve satırlar sadece tembel olarak pasifleştiği için tablo sınırsız
+büyür. Sweeper süresi dolmuş (aktif veya pasif) satırları ix_sessions_expires_at üzerinden
+sınırlı gruplar halinde, her grup ayrı kısa bir transaction'da siler; yazma kilidi uzun tutulmaz.
+
+Logout ile pasifleşmiş ama süresi dolmamış satırlar silinmez: imzalı session modunda iptal
+listesi bu satırlardan senkronize edilir. Bu satırlar en geç SESSION_EXPIRY_HOURS sonra silinir.
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.auth_models import SessionDB
+
+
+class SessionSweepService:
+    """Süresi dolan oturumları gruplar halinde silen servis"""
+
+    @staticmethod
+    def delete_expired_batch(db: Session, batch_size: int, now: Optional[datetime] = None) -> int:
+        """
+        Süresi dolmuş en fazla 'batch_size' oturumu siler (en eski bitişten başlayarak)
+
+        Args:
+            db: Database session
+            batch_size: Tek transaction'da silinecek en fazla satır
+            now: Kesim zamanı (varsayılan: şimdi, UTC)
+
+        Returns:
+            int: Silinen satır sayısı
+        """
+        cutoff = now or datetime.utcnow()
+        expired_ids = select(SessionDB.id).where(
+            SessionDB.expires_at < cutoff
+        ).order_by(SessionDB.expires_at).limit(batch_size)
+
+        result = db.execute(
+            delete(SessionDB).where(SessionDB.id.in_(expired_ids)),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        return result.rowcount or 0
+
+    @staticmethod
+    def delete_expired_batch_snapshot(batch_size: int, now: datetime) -> int:
+        """Kendi session'ını açarak bir grup siler (thread içinde çağrılır)"""
+        db = SessionLocal()
+        try:
+            return SessionSweepService.delete_expired_batch(db, batch_size, now)
+        finally:
+            db.close()
+
+
+class SessionSweepJob:
+    """Periyodik olarak süresi dolan oturumları silen arka plan job'ı"""
+
+    def __init__(self, interval_seconds: float, batch_size: int, max_batches: int = 1000):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        # Tek turda silinecek en fazla grup; kalan satırlar sonraki tura kalır
+        self.max_batches = max_batches
+        self.last_result: Dict[str, float] = {}
+
+    async def sweep(self) -> int:
+        """
+        Süresi dolan tüm satırları (en fazla max_batches grup) siler
+        Gruplar arasında event loop'a ve diğer yazarlara sıra verilir
+        """
+        now = datetime.utcnow()
+        deleted = 0
+        batches = 0
+        while batches < self.max_batches:
+            count = await asyncio.to_thread(SessionSweepService.delete_expired_batch_snapshot, self.batch_size, now)
+            deleted += count
+            batches += 1
+            if count < self.batch_size:
+                break
+            await asyncio.sleep(0)
+        self.last_result = {"deleted": deleted, "batches": batches, "swept_at": now.timestamp()}
+        return deleted
+
+    async def run(self) -> None:
+        """Uygulama kapanana kadar tabloyu periyodik olarak temizler"""
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"❌ Süresi dolan session'lar silinemedi: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,169 @@
+"""
+Session Tokens - HMAC imzalı, durumsuz (stateless) session token'ları ve iptal listesi
+
+SESSION_TOKEN_MODE=signed iken login'de üretilen token session id, kullanıcı id, kullanıcı adı
+ve bitiş zamanını taşır; geçerlilik imza + süre + iptal listesi ile hiç I/O yapmadan kontrol edilir.
+Token biçimi: v1.<base64url(JSON claims)>.<base64url(HMAC-SHA256)>
+
+Logout / kullanıcı devre dışı bırakma session id'lerini yerel iptal listesine hemen ekler; diğer
+worker'lar listeyi 'sessions' tablosundan periyodik olarak senkronize eder (en fazla
+SESSION_REVOCATION_SYNC_SECONDS gecikme). Veritabanı sadece login ve logout'ta kullanılır.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from core.config import SECRET_KEY, SESSION_TOKEN_MODE
+from core.database import SessionLocal
+from models.auth_models import SessionDB
+
+TOKEN_VERSION = "v1"
+
+
+def signed_sessions_enabled() -> bool:
+    return SESSION_TOKEN_MODE == "signed"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signature(message: str) -> bytes:
+    if not SECRET_KEY:
+        raise RuntimeError("SESSION_TOKEN_MODE=signed için SECRET_KEY tanımlanmalı")
+    return hmac.new(SECRET_KEY.encode(), message.encode(), hashlib.sha256).digest()
+
+
+def to_epoch(moment: datetime) -> int:
+    """Naive UTC datetime'ı (veritabanındaki biçim) epoch saniyesine çevirir"""
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+class SessionClaims(NamedTuple):
+    """İmzalı token'ın taşıdığı bilgiler"""
+    session_id: int
+    user_id: int
+    username: str
+    expires_at: int  # epoch saniye (UTC)
+
+    @property
+    def expires_at_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.expires_at, tz=timezone.utc).replace(tzinfo=None)
+
+
+def is_signed_token(token: str) -> bool:
+    return token.startswith(TOKEN_VERSION + ".")
+
+
+def sign_session_token(claims: SessionClaims) -> str:
+    """Claims'i imzalı token'a çevirir"""
+    payload = _b64encode(json.dumps({
+        "sid": claims.session_id,
+        "uid": claims.user_id,
+        "usr": claims.username,
+        "exp": claims.expires_at,
+    }, separators=(",", ":")).encode())
+    message = f"{TOKEN_VERSION}.{payload}"
+    return f"{message}.{_b64encode(_signature(message))}"
+
+
+def decode_session_token(token: str) -> Optional[SessionClaims]:
+    """
+    İmzayı doğrulayıp claims'i döner (süre ve iptal kontrolü yapılmaz)
+    Biçim veya imza geçersizse None
+    """
+    parts = token.split(".")
+    if len(parts) != 3 or parts[0] != TOKEN_VERSION:
+        return None
+    try:
+        signature = _b64decode(parts[2])
+        if not hmac.compare_digest(signature, _signature(f"{parts[0]}.{parts[1]}")):
+            return None
+        data = json.loads(_b64decode(parts[1]))
+        return SessionClaims(int(data["sid"]), int(data["uid"]), str(data["usr"]), int(data["exp"]))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def verify_session_token(token: str) -> Optional[SessionClaims]:
+    """İmzalı token'ı I/O yapmadan doğrular: imza, bitiş zamanı ve iptal listesi"""
+    claims = decode_session_token(token)
+    if claims is None or claims.expires_at <= time.time():
+        return None
+    if session_revocations.is_revoked(claims.session_id):
+        return None
+    return claims
+
+
+class SessionRevocationList:
+    """
+    İptal edilmiş ama süresi henüz dolmamış session id'leri (session id -> bitiş epoch'u)
+
+    Bir session bir kez iptal edildikten sonra tekrar etkinleşmez; bu yüzden senkronizasyon
+    sadece ekleme yapar ve süresi dolan kayıtları budar (yerel iptaller kaybolmaz).
+    """
+
+    def __init__(self):
+        self._revoked: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.last_sync: Optional[float] = None
+
+    def is_revoked(self, session_id: int) -> bool:
+        return session_id in self._revoked
+
+    def revoke(self, session_id: int, expires_at: int) -> None:
+        with self._lock:
+            self._revoked[session_id] = expires_at
+
+    def revoke_many(self, sessions: Iterable[SessionDB]) -> None:
+        with self._lock:
+            for session in sessions:
+                self._revoked[session.id] = to_epoch(session.expires_at)
+
+    def sync_from_db(self) -> int:
+        """
+        Süresi dolmamış iptal edilmiş session'ları tablodan yükler, süresi dolanları budar
+        Kendi session'ını açar (thread içinde çağrılır). Listedeki kayıt sayısını döner.
+        """
+        db = SessionLocal()
+        try:
+            rows = db.query(SessionDB.id, SessionDB.expires_at).filter(
+                SessionDB.is_active == False,
+                SessionDB.expires_at > datetime.utcnow()
+            ).all()
+        finally:
+            db.close()
+
+        now = time.time()
+        with self._lock:
+            for row in rows:
+                self._revoked[row.id] = to_epoch(row.expires_at)
+            self._revoked = {sid: exp for sid, exp in self._revoked.items() if exp > now}
+            self.last_sync = now
+            return len(self._revoked)
+
+    async def run(self, interval_seconds: float) -> None:
+        """Uygulama kapanana kadar iptal listesini periyodik olarak senkronize eder"""
+        while True:
+            try:
+                await asyncio.to_thread(self.sync_from_db)
+            except Exception as e:
+                print(f"❌ Session iptal listesi senkronizasyonu başarısız: {str(e)}")
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._revoked), "last_sync": self.last_sync}
+
+
+# Süreç genelinde paylaşılan iptal listesi (AuthService statik metodları tarafından kullanılır)
+session_revocations = SessionRevocationList()
@@ -1,18 +1,96 @@
 """
 Symbols Service - Sembol listesini market servisinden çeker
 """
-from typing import List
+import asyncio
+from typing import List, Optional
 from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+from services.market_api_manager.symbol_catalog_cache import CatalogEntry
+from services.symbols_sync_service import SymbolsSyncService
 from models.symbol_models import Symbol
 
+# Projection ile seçilebilecek alanlar
+SYMBOL_FIELDS = tuple(Symbol.model_fields.keys())
+
 class SymbolsService:
     """Sembol servisleri - market aracılığıyla sembolleri döner"""
 
-    def __init__(self):
-        self.market_manager = MarketAPIServiceManager()
+    def __init__(self, market_manager: MarketAPIServiceManager):
+        self.market_manager = market_manager
+
+    async def get_symbols(self, market_id: str) -> List[Symbol]:
+        """
+        Market id'ye göre sembol listesini döndürür (önbellekli)
+        """
+        catalog = await self.get_catalog(market_id)
+        return catalog.symbols
+
+    async def get_catalog(self, market_id: str) -> CatalogEntry:
+        """
+        Market katalog kaydını (semboller, ETag, değişiklik zamanı) döndürür
+        Önbellek boşken upstream erişilemezse veritabanındaki snapshot'a düşer
+        """
+        try:
+            return await self.market_manager.get_catalog(market_id)
+        except ValueError:
+            raise
+        except Exception:
+            symbols = await asyncio.to_thread(SymbolsSyncService.load_catalog_snapshot, market_id)
+            if not symbols:
+                raise
+            return self.market_manager.seed_symbols(market_id, symbols)
+
+    async def get_symbols_page(
+        self,
+        market_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        base_asset: Optional[str] = None,
+        quote_asset: Optional[str] = None,
+        catalog: Optional[CatalogEntry] = None
+    ) -> dict:
+        """
+        Önbellekteki katalogdan filtrelenmiş, sayfalanmış ve alan seçimli sembol sayfası döndürür
+        catalog verilirse (ör. ETag'i hesaplanmış kayıt) sayfa o kayıttan üretilir; katalog tekrar çekilmez
+
+        Returns:
+            dict: symbols, count, total, offset, next_offset
+        """
+        fields = list(fields) if fields else list(SYMBOL_FIELDS)
+        invalid = [f for f in fields if f not in SYMBOL_FIELDS]
+        if invalid:
+            raise ValueError(f"Geçersiz alan(lar): {', '.join(invalid)}. Desteklenen: {', '.join(SYMBOL_FIELDS)}")
+
+        if catalog is None:
+            catalog = await self.get_catalog(market_id)
+        matches = catalog.search_index.filter(base_asset=base_asset, quote_asset=quote_asset)
+
+        end = len(matches) if limit is None else min(len(matches), offset + limit)
+        page = matches[offset:end]
+        return {
+            "symbols": [{f: getattr(s, f) for f in fields} for s in page],
+            "count": len(page),
+            "total": len(matches),
+            "offset": offset,
+            "next_offset": end if end < len(matches) else None,
+        }
+
+    async def search_symbols(self, market_id: str, query: str, limit: int = 20) -> List[Symbol]:
+        """
+        Market kataloğunda sıralı sembol araması yapar (autocomplete için)
+        """
+        await self.get_symbols(market_id)
+        return await self.market_manager.search_symbols(market_id, query, limit)
+
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """
+        Sembol katalog önbelleği sayaçlarını döndürür
+        """
+        return MarketAPIServiceManager.get_catalog_stats()
 
-    def get_symbols(self) -> List[Symbol]:
+    def get_single_flight_stats(self) -> dict:
         """
-        Market id'ye göre sembol listesini döndürür
+        Upstream çağrı birleştirme (single-flight) sayaçlarını döndürür
         """
-        return self.market_manager.get_symbols()
+        return self.market_manager.get_single_flight_stats()
@@ -0,0 +1,157 @@
+"""
+Symbols Sync Service - Market kataloglarını 'symbols' tablosunda kalıcı tutar
+
+Upstream kataloğu saklı kümeyle karşılaştırılır; sadece eklenen, silinen ve
+değişen semboller yazılır. Uygulama açılışında tablo, önbelleği doldurmak için
+snapshot olarak kullanılır.
+"""
+import asyncio
+from typing import Dict, List
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.symbol_models import Symbol, SymbolSchema
+from services.market_api_manager.market_api_manager import MarketAPIServiceManager
+
+
+class SymbolsSyncService:
+    """Sembol kataloğunu veritabanına diff ile yazan / okuyan servis"""
+
+    # Tek ifadede gönderilecek en fazla satır (SQLite parametre limiti için)
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def load_catalog(db: Session, market_id: str) -> List[Symbol]:
+        """
+        Marketin veritabanındaki kataloğunu döner
+
+        Args:
+            db: Database session
+            market_id: Market ID (ör: binance)
+
+        Returns:
+            List[Symbol]: Saklı semboller (sembol adına göre sıralı)
+        """
+        rows = db.query(
+            SymbolSchema.symbol, SymbolSchema.base_asset, SymbolSchema.quote_asset
+        ).filter(
+            SymbolSchema.market == market_id
+        ).order_by(SymbolSchema.symbol).all()
+
+        return [
+            Symbol(symbol=row.symbol, base_asset=row.base_asset, quote_asset=row.quote_asset)
+            for row in rows
+        ]
+
+    @staticmethod
+    def sync_catalog(db: Session, market_id: str, symbols: List[Symbol]) -> Dict[str, int]:
+        """
+        Upstream kataloğunu saklı kümeyle karşılaştırıp sadece farkları uygular
+
+        Args:
+            db: Database session
+            market_id: Market ID
+            symbols: Upstream'den gelen güncel katalog
+
+        Returns:
+            Dict[str, int]: inserted / deleted / updated / unchanged sayıları
+        """
+        stored = {
+            row.symbol: row
+            for row in db.query(
+                SymbolSchema.id, SymbolSchema.symbol, SymbolSchema.base_asset, SymbolSchema.quote_asset
+            ).filter(SymbolSchema.market == market_id)
+        }
+        upstream = {s.symbol: s for s in symbols}
+
+        inserts = [
+            {"market": market_id, "symbol": s.symbol, "base_asset": s.base_asset, "quote_asset": s.quote_asset}
+            for name, s in upstream.items() if name not in stored
+        ]
+        deletes = [name for name in stored if name not in upstream]
+        updates = [
+            {"id": stored[name].id, "base_asset": s.base_asset, "quote_asset": s.quote_asset}
+            for name, s in upstream.items()
+            if name in stored and (stored[name].base_asset, stored[name].quote_asset) != (s.base_asset, s.quote_asset)
+        ]
+
+        batch = SymbolsSyncService.BATCH_SIZE
+        for i in range(0, len(inserts), batch):
+            db.execute(insert(SymbolSchema), inserts[i:i + batch])
+        for i in range(0, len(deletes), batch):
+            db.execute(
+                delete(SymbolSchema).where(
+                    SymbolSchema.market == market_id,
+                    SymbolSchema.symbol.in_(deletes[i:i + batch])
+                )
+            )
+        for i in range(0, len(updates), batch):
+            db.execute(update(SymbolSchema), updates[i:i + batch])
+
+        if inserts or deletes or updates:
+            db.commit()
+
+        return {
+            "inserted": len(inserts),
+            "deleted": len(deletes),
+            "updated": len(updates),
+            "unchanged": len(upstream) - len(inserts) - len(updates),
+        }
+
+    @staticmethod
+    def load_catalog_snapshot(market_id: str) -> List[Symbol]:
+        """Kendi session'ını açarak marketin saklı kataloğunu döner (thread içinde çağrılır)"""
+        db = SessionLocal()
+        try:
+            return SymbolsSyncService.load_catalog(db, market_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def sync_catalog_snapshot(market_id: str, symbols: List[Symbol]) -> Dict[str, int]:
+        """Kendi session'ını açarak kataloğu senkronize eder (thread içinde çağrılır)"""
+        db = SessionLocal()
+        try:
+            return SymbolsSyncService.sync_catalog(db, market_id, symbols)
+        finally:
+            db.close()
+
+
+class SymbolCatalogSyncJob:
+    """Periyodik olarak market kataloglarını yenileyip veritabanına işleyen arka plan job'ı"""
+
+    def __init__(self, market_manager: MarketAPIServiceManager, interval_seconds: float):
+        self.market_manager = market_manager
+        self.interval_seconds = interval_seconds
+        self.last_results: Dict[str, dict] = {}
+
+    async def seed_cache(self) -> None:
+        """Saklı katalogları önbelleğe yükler; soğuk açılışta /symbols hemen veri döner"""
+        for market in MarketAPIServiceManager.get_markets():
+            try:
+                symbols = await asyncio.to_thread(SymbolsSyncService.load_catalog_snapshot, market.id)
+            except Exception as e:
+                print(f"❌ {market.id} sembol snapshot'ı yüklenemedi: {str(e)}")
+                continue
+            if symbols:
+                self.market_manager.seed_symbols(market.id, symbols)
+
+    async def sync_market(self, market_id: str) -> Dict[str, int]:
+        """Tek marketin kataloğunu upstream'den yenileyip veritabanına işler"""
+        symbols = await self.market_manager.refresh_symbols(market_id)
+        result = await asyncio.to_thread(SymbolsSyncService.sync_catalog_snapshot, market_id, symbols)
+        self.last_results[market_id] = result
+        return result
+
+    async def run(self) -> None:
+        """Uygulama kapanana kadar tüm marketleri periyodik olarak senkronize eder"""
+        await self.seed_cache()
+        while True:
+            for market in MarketAPIServiceManager.get_markets():
+                try:
+                    await self.sync_market(market.id)
+                except Exception as e:
+                    print(f"❌ {market.id} sembol senkronizasyonu başarısız: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
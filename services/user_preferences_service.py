@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from datetime import datetime
 from models.user_preferences_models import (
@@ -13,7 +14,7 @@ class UserPreferencesService:
     """Kullanıcı tercihleri yönetim servisi"""
     
     @staticmethod
-    def create_default_preferences(user_id: int, db: Session) -> UserPreferencesDB:
+    async def create_default_preferences(user_id: int, db: AsyncSession) -> UserPreferencesDB:
         """
         Yeni kullanıcı için varsayılan tercihler oluştur
         
@@ -31,12 +32,12 @@ class UserPreferencesService:
             theme="dark"
         )
         db.add(preferences)
-        db.commit()
-        db.refresh(preferences)
+        await db.commit()
+        await db.refresh(preferences)
         return preferences
     
     @staticmethod
-    def get_user_preferences(user_id: int, db: Session) -> UserPreferencesDB:
+    async def get_user_preferences(user_id: int, db: AsyncSession) -> UserPreferencesDB:
         """
         Kullanıcının tercihlerini getir
         
@@ -50,9 +51,9 @@ class UserPreferencesService:
         Raises:
             HTTPException: Tercihler bulunamazsa 404
         """
-        preferences = db.query(UserPreferencesDB).filter(
-            UserPreferencesDB.user_id == user_id
-        ).first()
+        preferences = (await db.execute(
+            select(UserPreferencesDB).where(UserPreferencesDB.user_id == user_id)
+        )).scalars().first()
         
         if not preferences:
             raise HTTPException(
@@ -63,10 +64,10 @@ class UserPreferencesService:
         return preferences
     
     @staticmethod
-    def update_preferences(
+    async def update_preferences(
         user_id: int, 
         preferences_data: UserPreferencesUpdate, 
-        db: Session
+        db: AsyncSession
     ) -> UserPreferencesDB:
         """
         Kullanıcı tercihlerini güncelle
@@ -82,9 +83,9 @@ class UserPreferencesService:
         Raises:
             HTTPException: Tercihler bulunamazsa 404, geçersiz veri ise 400
         """
-        preferences = db.query(UserPreferencesDB).filter(
-            UserPreferencesDB.user_id == user_id
-        ).first()
+        preferences = (await db.execute(
+            select(UserPreferencesDB).where(UserPreferencesDB.user_id == user_id)
+        )).scalars().first()
         
         if not preferences:
             raise HTTPException(
@@ -126,12 +127,12 @@ class UserPreferencesService:
         # updated_at otomatik güncellenir
         preferences.updated_at = datetime.utcnow()
         
-        db.commit()
-        db.refresh(preferences)
+        await db.commit()
+        await db.refresh(preferences)
         return preferences
     
     @staticmethod
-    def delete_preferences(user_id: int, db: Session) -> bool:
+    async def delete_preferences(user_id: int, db: AsyncSession) -> bool:
         """
         Kullanıcı tercihlerini sil
         
@@ -142,18 +143,18 @@ class UserPreferencesService:
         Returns:
             bool: Silme başarılı ise True
         """
-        preferences = db.query(UserPreferencesDB).filter(
-            UserPreferencesDB.user_id == user_id
-        ).first()
+        preferences = (await db.execute(
+            select(UserPreferencesDB).where(UserPreferencesDB.user_id == user_id)
+        )).scalars().first()
         
         if preferences:
-            db.delete(preferences)
-            db.commit()
+            await db.delete(preferences)
+            await db.commit()
             return True
         return False
     
     @staticmethod
-    def get_or_create_preferences(user_id: int, db: Session) -> UserPreferencesDB:
+    async def get_or_create_preferences(user_id: int, db: AsyncSession) -> UserPreferencesDB:
         """
         Kullanıcı tercihlerini getir, yoksa oluştur
         
@@ -164,11 +165,11 @@ class UserPreferencesService:
         Returns:
             UserPreferencesDB: Kullanıcı tercihleri
         """
-        preferences = db.query(UserPreferencesDB).filter(
-            UserPreferencesDB.user_id == user_id
-        ).first()
+        preferences = (await db.execute(
+            select(UserPreferencesDB).where(UserPreferencesDB.user_id == user_id)
+        )).scalars().first()
         
         if not preferences:
-            preferences = UserPreferencesService.create_default_preferences(user_id, db)
+            preferences = await UserPreferencesService.create_default_preferences(user_id, db)
         
         return preferences
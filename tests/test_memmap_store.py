@@ -0,0 +1,139 @@
+"""MemmapCandleStore: okunan görünümlerin değişmezliği, eşzamanlı okuma/yazma ve sıra dışı yazma maliyeti"""
+import threading
+
+import numpy as np
+
+from services.candle_store.candle_store import CandleKey
+from services.candle_store.columns import CANDLE_COLUMNS
+from services.candle_store import memmap_store
+from services.candle_store.memmap_store import MemmapCandleStore
+
+KEY = CandleKey("spot", "BTCUSDT", "1m")
+MINUTE = 60_000
+
+
+def make_columns(start: int, count: int, price: float = 1.0):
+    open_time = start + np.arange(count, dtype=np.int64) * MINUTE
+    columns = {name: np.full(count, price, dtype=dtype) for name, dtype in CANDLE_COLUMNS}
+    columns["open_time"] = open_time
+    columns["close_time"] = open_time + MINUTE - 1
+    return columns
+
+
+def test_view_is_not_mutated_by_later_writes(tmp_path):
+    store = MemmapCandleStore(str(tmp_path))
+    store.write_columns(KEY, make_columns(100 * MINUTE, 50, price=1.0))
+
+    held = store.read_columns(KEY, 0, 10_000 * MINUTE)
+    expected = {name: np.array(column) for name, column in held.items()}
+
+    # Öne ekleme ve çakışan üzerine yazma
+    store.write_columns(KEY, make_columns(0, 100, price=2.0))
+    store.write_columns(KEY, make_columns(120 * MINUTE, 10, price=3.0))
+    store.write_columns(KEY, make_columns(150 * MINUTE, 10, price=4.0))
+
+    for name, column in held.items():
+        np.testing.assert_array_equal(column, expected[name])
+
+    result = store.read_columns(KEY, 0, 10_000 * MINUTE)
+    np.testing.assert_array_equal(result["open_time"], np.arange(160, dtype=np.int64) * MINUTE)
+    assert (result["open"][:100] == 2.0).all()
+    assert (result["open"][100:120] == 1.0).all()
+    assert (result["open"][120:130] == 3.0).all()
+    assert (result["open"][150:] == 4.0).all()
+    store.close()
+
+
+def test_prepend_batches_do_not_rewrite_whole_series(tmp_path, monkeypatch):
+    rows_written = []
+    original_append = memmap_store._Run.append
+
+    def counting_append(self, columns, exact=False):
+        rows_written.append(len(columns["open_time"]))
+        return original_append(self, columns, exact)
+
+    monkeypatch.setattr(memmap_store._Run, "append", counting_append)
+
+    store = MemmapCandleStore(str(tmp_path))
+    batch, batches = 100, 200
+    # En yeni veriden geriye doğru backfill: her batch mevcut serinin önüne eklenir
+    for i in reversed(range(batches)):
+        store.write_columns(KEY, make_columns(i * batch * MINUTE, batch))
+
+    total = batch * batches
+    # Her batch'te tüm seri yeniden yazılsaydı ~ total * batches / 2 satır yazılırdı
+    assert sum(rows_written) < total * 12
+    assert len(store._series[KEY].runs) <= 12
+
+    result = store.read_columns(KEY, 0, total * MINUTE)
+    np.testing.assert_array_equal(result["open_time"], np.arange(total, dtype=np.int64) * MINUTE)
+    store.close()
+
+    # Yeniden açılan depo aynı veriyi meta.json'dan okur
+    reopened = MemmapCandleStore(str(tmp_path))
+    result = reopened.read_columns(KEY, 0, total * MINUTE)
+    np.testing.assert_array_equal(result["open_time"], np.arange(total, dtype=np.int64) * MINUTE)
+    reopened.close()
+
+
+def test_old_runs_stay_readable_after_compaction(tmp_path):
+    store = MemmapCandleStore(str(tmp_path))
+    store.write_columns(KEY, make_columns(100 * MINUTE, 50, price=1.0))
+    store.write_columns(KEY, make_columns(0, 50, price=2.0))
+    old_runs = list(store._series[KEY].runs)
+    expected = [np.array(run.slice(0, 10_000 * MINUTE)["open_time"]) for run in old_runs]
+
+    # Sıra dışı yazma eski run'ları birleştirip dosyalarını siler
+    store.write_columns(KEY, make_columns(50 * MINUTE, 50, price=3.0))
+    assert all(run not in store._series[KEY].runs for run in old_runs)
+
+    for run, open_times in zip(old_runs, expected):
+        np.testing.assert_array_equal(run.slice(0, 10_000 * MINUTE)["open_time"], open_times)
+    store.close()
+
+
+def test_reads_during_concurrent_compaction_and_eviction(tmp_path):
+    store = MemmapCandleStore(str(tmp_path), max_open_series=1)
+    other = CandleKey("spot", "ETHUSDT", "1m")
+    store.write_columns(other, make_columns(0, 10))
+    batches = 200
+    errors = []
+
+    def writer():
+        try:
+            for i in reversed(range(batches)):
+                store.write_columns(KEY, make_columns(i * 10 * MINUTE, 10))
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        try:
+            result = store.read_columns(KEY, 0, batches * 10 * MINUTE)
+            assert np.all(np.diff(result["open_time"]) > 0)
+            # Diğer seriyi okumak KEY'i bellekten düşürür (max_open_series=1)
+            store.read_columns(other, 0, 10 * MINUTE)
+        except Exception as e:
+            errors.append(e)
+            break
+    thread.join()
+
+    assert not errors
+    result = store.read_columns(KEY, 0, batches * 10 * MINUTE)
+    np.testing.assert_array_equal(result["open_time"], np.arange(batches * 10, dtype=np.int64) * MINUTE)
+    store.close()
+
+
+def test_idle_series_are_evicted(tmp_path):
+    store = MemmapCandleStore(str(tmp_path), max_open_series=4)
+    for i in range(20):
+        store.write_columns(CandleKey("spot", f"SYM{i}USDT", "1m"), make_columns(0, 5))
+        store.add_coverage(CandleKey("spot", f"SYM{i}USDT", "1m"), 0, 5 * MINUTE - 1)
+    assert len(store._series) <= 4
+
+    # Düşen seri meta.json'dan yeniden yüklenir
+    key = CandleKey("spot", "SYM0USDT", "1m")
+    assert len(store.read_columns(key, 0, 10 * MINUTE)["open_time"]) == 5
+    assert store.get_coverage(key) == [(0, 5 * MINUTE - 1)]
+    store.close()